@@ -31,6 +31,7 @@ CONTAINER_STARTUP_TIMEOUT="${CONTAINER_STARTUP_TIMEOUT:-600}"
 # vLLM 설정
 # GitHub 리포지토리 방식: INSTANCE_TYPE으로 자동 GPU 수 계산
 MODEL_ID="${MODEL_ID:-Qwen/Qwen3-4B-Instruct-2507}"
+ENABLE_PREFIX_CACHING="${ENABLE_PREFIX_CACHING:-true}"
 # INSTANCE_TYPE은 아래에서 설정됨
 
 if [[ "${#}" -ge 1 && -n "${1:-}" ]]; then
@@ -76,6 +77,7 @@ cat > "${TMP_CONTAINER_JSON}" << EOF
   "Environment": {
     "MODEL_ID": "${MODEL_ID}",
     "INSTANCE_TYPE": "${INSTANCE_TYPE}",
+    "ENABLE_PREFIX_CACHING": "${ENABLE_PREFIX_CACHING}",
     "API_HOST": "0.0.0.0",
     "API_PORT": "8080",
     "PYTORCH_CUDA_ALLOC_CONF": "expandable_segments:True",
@@ -100,11 +100,14 @@ def start_api_server():
     host = os.getenv("API_HOST", "0.0.0.0")
     port = int(os.getenv("API_PORT", 8080))
     uvicorn_log_level = os.getenv("UVICORN_LOG_LEVEL", "info")
+    # 모든 요청이 같은 system prompt 로 시작하므로 KV cache 를 prefix 단위로 재사용한다
+    enable_prefix_caching = os.getenv("ENABLE_PREFIX_CACHING", "true").lower() == "true"
 
     logger.info("Starting SageMaker vLLM server")
     logger.info(f"  Model: {model_id}")
     logger.info(f"  Instance Type: {instance_type}")
     logger.info(f"  Tensor Parallel Size: {tensor_parallel_size}")
+    logger.info(f"  Prefix Caching: {enable_prefix_caching}")
 
     # Create engine args manually
     engine_args = AsyncEngineArgs(
@@ -115,6 +118,7 @@ def start_api_server():
         max_model_len=16384,  # RAG를 위해 16384로 증가
         gpu_memory_utilization=0.45,
         enforce_eager=True,  # Disable CUDA graph for stability
+        enable_prefix_caching=enable_prefix_caching,
     )
 
     # Initialize engine
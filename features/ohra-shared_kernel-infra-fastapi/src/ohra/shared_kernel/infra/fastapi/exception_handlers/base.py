@@ -8,6 +8,7 @@ from ohra.shared_kernel.infra.fastapi.dtos.response import ResponseDto
 async def custom_exception_handler(request: Request, exe: BaseMsgException):
     return JSONResponse(
         status_code=exe.code,
+        headers=exe.headers,
         content=ResponseDto(
             status=exe.code,
             message=exe.message,
@@ -19,5 +20,5 @@ async def custom_exception_handler(request: Request, exe: BaseMsgException):
                 "error": exe.error,
                 "status_code": exe.code,
             },
-        ),
+        ).model_dump(),
     )
@@ -1,7 +1,8 @@
-from ohra.shared_kernel.infra.qdrant.adapter import QdrantAdapter
+from ohra.shared_kernel.infra.qdrant.adapter import SYNC_GENERATION_KEY, QdrantAdapter
 from ohra.shared_kernel.infra.qdrant.settings import QdrantSettings
 
 __all__ = [
     "QdrantAdapter",
     "QdrantSettings",
+    "SYNC_GENERATION_KEY",
 ]
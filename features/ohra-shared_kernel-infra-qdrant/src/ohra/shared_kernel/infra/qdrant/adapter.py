@@ -1,5 +1,5 @@
 from collections import defaultdict
-from qdrant_client import QdrantClient
+from qdrant_client import AsyncQdrantClient, QdrantClient
 from qdrant_client.models import (
     Distance,
     VectorParams,
@@ -9,25 +9,43 @@ from qdrant_client.models import (
     SparseVector,
     FieldCondition,
     MatchValue,
+    Modifier,
+    DatetimeRange,
+    PayloadSchemaType,
+    PointVectors,
 )
+from datetime import datetime
 from typing import List, Dict, Any, Optional, Union
+import asyncio
+import copy
 import logging
 
 from ohra.shared_kernel.infra.vector_store.exceptions import VectorStoreException
 
 logger = logging.getLogger(__name__)
 
+# sync worker 가 동기화를 마칠 때마다 올리는 collection metadata key (backend 검색 결과 cache 무효화에 쓴다)
+SYNC_GENERATION_KEY = "sync_generation"
+
 
 class QdrantAdapter:
     def __init__(self, host: str, port: int, collection_name: str):
         self.client = QdrantClient(host=host, port=port)
+        # 검색 경로는 이벤트 루프를 막지 않고 deadline 초과 시 취소할 수 있도록 async client 를 쓴다
+        self.async_client = AsyncQdrantClient(host=host, port=port)
         self.collection_name = collection_name
 
+    def with_collection(self, collection_name: str) -> "QdrantAdapter":
+        """같은 client(connection) 를 공유하고 collection 만 다른 adapter 를 만든다."""
+        adapter = copy.copy(self)
+        adapter.collection_name = collection_name
+        return adapter
+
     async def create_collection(self, collection_name: str, vector_size: int, enable_sparse: bool = True) -> None:
         try:
             vectors_config = {"dense": VectorParams(size=vector_size, distance=Distance.COSINE)}
 
-            sparse_vectors_config = {"sparse": SparseVectorParams()} if enable_sparse else None
+            sparse_vectors_config = {"sparse": SparseVectorParams(modifier=Modifier.IDF)} if enable_sparse else None
 
             self.client.create_collection(
                 collection_name=collection_name,
@@ -44,11 +62,43 @@ class QdrantAdapter:
 
             if self.collection_name not in collection_names:
                 await self.create_collection(self.collection_name, vector_size, enable_sparse)
+            elif enable_sparse:
+                await self._ensure_sparse_idf_modifier()
+
+            self.client.create_payload_index(
+                collection_name=self.collection_name,
+                field_name="indexed_at",
+                field_schema=PayloadSchemaType.DATETIME,
+            )
         except Exception as e:
             if "already exists" in str(e).lower() or "duplicate" in str(e).lower():
                 return
             raise VectorStoreException(f"Failed to ensure collection exists: {e}") from e
 
+    async def get_collection_metadata(self) -> Dict[str, Any]:
+        try:
+            info = await self.async_client.get_collection(self.collection_name)
+            return dict(info.config.metadata or {})
+        except Exception as e:
+            raise VectorStoreException(f"Failed to get collection metadata: {e}") from e
+
+    async def update_collection_metadata(self, metadata: Dict[str, Any]) -> None:
+        """주어진 key 만 기존 collection metadata 에 병합한다."""
+        try:
+            await self.async_client.update_collection(collection_name=self.collection_name, metadata=metadata)
+        except Exception as e:
+            raise VectorStoreException(f"Failed to update collection metadata: {e}") from e
+
+    async def _ensure_sparse_idf_modifier(self) -> None:
+        sparse_vectors = self.client.get_collection(self.collection_name).config.params.sparse_vectors or {}
+        sparse_params = sparse_vectors.get("sparse")
+        if sparse_params is not None and sparse_params.modifier != Modifier.IDF:
+            logger.info(f"Enabling IDF modifier on sparse vectors of {self.collection_name}")
+            self.client.update_collection(
+                collection_name=self.collection_name,
+                sparse_vectors_config={"sparse": SparseVectorParams(modifier=Modifier.IDF)},
+            )
+
     async def upsert(
         self,
         id: Union[str, int],
@@ -97,6 +147,33 @@ class QdrantAdapter:
         except Exception as e:
             raise VectorStoreException(f"Failed to batch upsert vectors: {e}") from e
 
+    async def update_sparse_vectors(
+        self, vectors: List[Dict[str, Any]], payload: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """dense 벡터는 그대로 두고 sparse 벡터만 바꾼다. ``payload`` 가 있으면 같은 point 들에 병합한다."""
+        if not vectors:
+            return
+
+        try:
+            points = [
+                PointVectors(
+                    id=vec["id"],
+                    vector={
+                        "sparse": SparseVector(
+                            indices=vec["sparse_vector"]["indices"], values=vec["sparse_vector"]["values"]
+                        )
+                    },
+                )
+                for vec in vectors
+            ]
+            self.client.update_vectors(collection_name=self.collection_name, points=points)
+            if payload:
+                self.client.set_payload(
+                    collection_name=self.collection_name, payload=payload, points=[vec["id"] for vec in vectors]
+                )
+        except Exception as e:
+            raise VectorStoreException(f"Failed to update sparse vectors: {e}") from e
+
     def _build_filter(self, filter: Optional[Dict[str, Any]]) -> Optional[Filter]:
         if not filter:
             return None
@@ -145,38 +222,41 @@ class QdrantAdapter:
             if query_sparse_vector:
                 logger.info(f"Hybrid search: top_k={top_k}, sparse_indices={len(query_sparse_vector['indices'])}")
 
-                dense_results = self.client.query_points(
-                    collection_name=self.collection_name,
-                    query=query_vector,
-                    using="dense",
-                    limit=top_k * 2,
-                    query_filter=search_filter,
-                ).points
-                logger.info(f"Dense search returned {len(dense_results)} results")
-
-                sparse_results = self.client.query_points(
-                    collection_name=self.collection_name,
-                    query=SparseVector(
-                        indices=query_sparse_vector["indices"],
-                        values=query_sparse_vector["values"],
+                dense_response, sparse_response = await asyncio.gather(
+                    self.async_client.query_points(
+                        collection_name=self.collection_name,
+                        query=query_vector,
+                        using="dense",
+                        limit=top_k * 2,
+                        query_filter=search_filter,
                     ),
-                    using="sparse",
-                    limit=top_k * 2,
-                    query_filter=search_filter,
-                ).points
+                    self.async_client.query_points(
+                        collection_name=self.collection_name,
+                        query=SparseVector(
+                            indices=query_sparse_vector["indices"],
+                            values=query_sparse_vector["values"],
+                        ),
+                        using="sparse",
+                        limit=top_k * 2,
+                        query_filter=search_filter,
+                    ),
+                )
+                dense_results, sparse_results = dense_response.points, sparse_response.points
+                logger.info(f"Dense search returned {len(dense_results)} results")
                 logger.info(f"Sparse search returned {len(sparse_results)} results")
 
                 results = self._apply_rrf(dense_results, sparse_results, top_k, k=rrf_k)
                 logger.info(f"RRF returned {len(results)} results")
             else:
                 logger.info(f"Dense-only search: top_k={top_k}")
-                results = self.client.query_points(
+                response = await self.async_client.query_points(
                     collection_name=self.collection_name,
                     query=query_vector,
                     using="dense",
                     limit=top_k,
                     query_filter=search_filter,
-                ).points
+                )
+                results = response.points
                 logger.info(f"Dense search returned {len(results)} results")
 
             return [{"id": hit.id, "score": hit.score, "metadata": hit.payload} for hit in results]
@@ -184,6 +264,51 @@ class QdrantAdapter:
             logger.error(f"Search failed: {e}", exc_info=True)
             raise VectorStoreException(f"Failed to search vectors: {e}") from e
 
+    async def search_sparse(
+        self,
+        query_sparse_vector: Dict[str, List],
+        top_k: int = 5,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        if not query_sparse_vector["indices"]:
+            return []
+
+        try:
+            response = await self.async_client.query_points(
+                collection_name=self.collection_name,
+                query=SparseVector(
+                    indices=query_sparse_vector["indices"],
+                    values=query_sparse_vector["values"],
+                ),
+                using="sparse",
+                limit=top_k,
+                query_filter=self._build_filter(filter),
+            )
+            results = response.points
+            logger.info(f"Sparse-only search returned {len(results)} results")
+
+            return [{"id": hit.id, "score": hit.score, "metadata": hit.payload} for hit in results]
+        except Exception as e:
+            logger.error(f"Sparse search failed: {e}", exc_info=True)
+            raise VectorStoreException(f"Failed to search sparse vectors: {e}") from e
+
+    async def retrieve(
+        self, ids: List[Union[str, int]], with_payload: Union[bool, List[str]] = True
+    ) -> List[Dict[str, Any]]:
+        if not ids:
+            return []
+
+        try:
+            points = await self.async_client.retrieve(
+                collection_name=self.collection_name,
+                ids=ids,
+                with_payload=with_payload,
+                with_vectors=False,
+            )
+            return [{"id": point.id, "metadata": point.payload} for point in points]
+        except Exception as e:
+            raise VectorStoreException(f"Failed to retrieve points: {e}") from e
+
     async def delete(self, ids: List[str]) -> None:
         try:
             self.client.delete(collection_name=self.collection_name, points_selector=ids)
@@ -207,7 +332,7 @@ class QdrantAdapter:
 
     async def get_by_filter(self, filter: Dict[str, Any], limit: int = 10) -> List[Dict[str, Any]]:
         try:
-            result = self.client.scroll(
+            result = await self.async_client.scroll(
                 collection_name=self.collection_name,
                 scroll_filter=self._build_filter(filter),
                 limit=limit,
@@ -219,31 +344,52 @@ class QdrantAdapter:
         except Exception as e:
             raise VectorStoreException(f"Failed to get by filter: {e}") from e
 
-    async def get_all_by_filter(self, filter: Dict[str, Any], batch_size: int = 1000) -> List[Dict[str, Any]]:
+    async def get_all_by_filter(
+        self, filter: Dict[str, Any], batch_size: int = 1000, with_payload: Union[bool, List[str]] = True
+    ) -> List[Dict[str, Any]]:
         try:
-            all_points = []
-            offset = None
+            return await self._scroll_all(self._build_filter(filter), batch_size, with_payload)
+        except Exception as e:
+            raise VectorStoreException(f"Failed to get all by filter: {e}") from e
 
-            while True:
-                result = self.client.scroll(
-                    collection_name=self.collection_name,
-                    scroll_filter=self._build_filter(filter),
-                    limit=batch_size,
-                    offset=offset,
-                    with_payload=True,
-                    with_vectors=False,
-                )
-                points, next_offset = result
-                all_points.extend([{"id": point.id, "metadata": point.payload} for point in points])
+    async def get_all_modified_since(
+        self,
+        since: Union[datetime, str],
+        field: str = "indexed_at",
+        batch_size: int = 1000,
+        with_payload: Union[bool, List[str]] = True,
+    ) -> List[Dict[str, Any]]:
+        try:
+            scroll_filter = Filter(must=[FieldCondition(key=field, range=DatetimeRange(gte=since))])
+            return await self._scroll_all(scroll_filter, batch_size, with_payload)
+        except Exception as e:
+            raise VectorStoreException(f"Failed to get modified points: {e}") from e
 
-                if next_offset is None or len(points) == 0:
-                    break
+    async def _scroll_all(
+        self, scroll_filter: Optional[Filter], batch_size: int, with_payload: Union[bool, List[str]] = True
+    ) -> List[Dict[str, Any]]:
+        all_points = []
+        offset = None
+
+        while True:
+            # backend 의 BM25 refresh 가 검색 요청과 같은 이벤트 루프에서 돌므로 async client 로 scroll 한다
+            result = await self.async_client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=scroll_filter,
+                limit=batch_size,
+                offset=offset,
+                with_payload=with_payload,
+                with_vectors=False,
+            )
+            points, next_offset = result
+            all_points.extend([{"id": point.id, "metadata": point.payload} for point in points])
 
-                offset = next_offset
+            if next_offset is None or len(points) == 0:
+                break
 
-            return all_points
-        except Exception as e:
-            raise VectorStoreException(f"Failed to get all by filter: {e}") from e
+            offset = next_offset
+
+        return all_points
 
     async def delete_by_filter(self, filter: Dict[str, Any]) -> None:
         try:
@@ -5,3 +5,4 @@ class QdrantSettings(BaseModel):
     host: str = Field(default="localhost")
     port: int = Field(default=6333)
     collection_name: str = Field(default="ohra_documents")
+    sparse_tokenizer: str = Field(default="ngram")  # "ngram" | "kiwi"
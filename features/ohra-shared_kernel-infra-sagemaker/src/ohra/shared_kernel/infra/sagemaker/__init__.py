@@ -1,7 +1,12 @@
 from ohra.shared_kernel.infra.sagemaker.embedding_adapter import SageMakerEmbeddingAdapter
+from ohra.shared_kernel.infra.sagemaker.llm_adapter import SageMakerLLMAdapter
 from ohra.shared_kernel.infra.sagemaker.settings import SageMakerSettings
+from ohra.shared_kernel.infra.sagemaker.stream import iterate_in_thread, stream_invocation
 
 __all__ = [
     "SageMakerEmbeddingAdapter",
+    "SageMakerLLMAdapter",
     "SageMakerSettings",
+    "iterate_in_thread",
+    "stream_invocation",
 ]
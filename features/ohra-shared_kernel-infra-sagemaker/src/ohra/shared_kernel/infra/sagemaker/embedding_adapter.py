@@ -1,7 +1,8 @@
+import asyncio
 import logging
 import boto3
 import json
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from ohra.shared_kernel.infra.embedding.exceptions import EmbeddingException
 
 logger = logging.getLogger(__name__)
@@ -19,15 +20,18 @@ class SageMakerEmbeddingAdapter:
     def dimension(self) -> int:
         return self._actual_dimension if self._actual_dimension else self._expected_dimension
 
+    def _invoke(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        response = self.client.invoke_endpoint(
+            EndpointName=self.endpoint_name, ContentType="application/json", Body=json.dumps(payload)
+        )
+        return json.loads(response["Body"].read())
+
     async def embed_text(self, text: str) -> List[float]:
         payload = {"inputs": [text]}
 
         try:
-            response = self.client.invoke_endpoint(
-                EndpointName=self.endpoint_name, ContentType="application/json", Body=json.dumps(payload)
-            )
-
-            result = json.loads(response["Body"].read())
+            # boto3 호출은 blocking 이므로 thread 에서 실행해 이벤트 루프와 검색 deadline 이 멈추지 않게 한다
+            result = await asyncio.to_thread(self._invoke, payload)
 
             if "data" in result:
                 # inference.py format: {"data": [{"embedding": [...]}, ...]}
@@ -53,11 +57,7 @@ class SageMakerEmbeddingAdapter:
             payload = {"inputs": batch}
 
             try:
-                response = self.client.invoke_endpoint(
-                    EndpointName=self.endpoint_name, ContentType="application/json", Body=json.dumps(payload)
-                )
-
-                result = json.loads(response["Body"].read())
+                result = await asyncio.to_thread(self._invoke, payload)
 
                 if "data" in result:
                     embeddings = [item["embedding"] for item in result["data"]]
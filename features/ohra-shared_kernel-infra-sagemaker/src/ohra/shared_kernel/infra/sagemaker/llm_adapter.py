@@ -0,0 +1,61 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+import boto3
+from botocore.config import Config
+
+from ohra.shared_kernel.infra.sagemaker.stream import stream_invocation
+from ohra.shared_kernel.infra.timing import record_stage
+
+
+class SageMakerLLMAdapter:
+    """LLM endpoint 호출을 이벤트 루프 밖의 전용 thread pool 에서 실행한다.
+
+    boto3 호출은 blocking 이므로 thread 수를 HTTP connection pool 크기(``max_connections``)와 맞춰
+    생성 중인 요청이 많아도 루프는 막히지 않고 endpoint 로 나가는 connection 수는 제한된다.
+    pool 이 가득 차면 나머지 요청은 thread pool 대기열에서 기다린다.
+    """
+
+    def __init__(
+        self,
+        endpoint_name: str,
+        region: str = "us-west-2",
+        max_connections: int = 32,
+        endpoint_url: Optional[str] = None,
+    ):
+        self.endpoint_name = endpoint_name
+        self.region = region
+        self.max_connections = max_connections
+        self.client = boto3.client(
+            "sagemaker-runtime",
+            region_name=region,
+            endpoint_url=endpoint_url,
+            config=Config(max_pool_connections=max_connections),
+        )
+        self._pool = ThreadPoolExecutor(max_workers=max_connections, thread_name_prefix="sagemaker-llm")
+
+    def _invoke(self, payload: Dict[str, Any]) -> Tuple[Dict[str, Any], float]:
+        # invoke_endpoint 는 응답 헤더를 받으면 돌아오고 본문은 read() 에서 읽는다
+        start = time.perf_counter()
+        response = self.client.invoke_endpoint(
+            EndpointName=self.endpoint_name, ContentType="application/json", Body=json.dumps(payload)
+        )
+        first_byte = time.perf_counter() - start
+        return json.loads(response["Body"].read()), first_byte
+
+    async def invoke(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """요청을 보낸 뒤 응답 헤더까지의 시간을 ``llm_ttfb`` 단계로 기록한다 (thread pool 대기 시간 제외)."""
+        loop = asyncio.get_running_loop()
+        result, first_byte = await loop.run_in_executor(self._pool, self._invoke, payload)
+        record_stage("llm_ttfb", first_byte * 1000)
+        return result
+
+    def stream(self, payload: Dict[str, Any]) -> AsyncIterator[str]:
+        """응답 스트림의 SSE ``data:`` 값을 돌려준다. 스트림이 끝날 때까지 pool 의 thread 하나를 쓴다."""
+        return stream_invocation(self.client, self.endpoint_name, payload, executor=self._pool)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
@@ -0,0 +1,83 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+_DONE = object()
+
+
+async def iterate_in_thread(iterable: Iterable[Any], executor: Optional[Executor] = None) -> AsyncIterator[Any]:
+    """blocking iterable 을 thread 에서 돌리고 항목을 queue 로 이벤트 루프에 넘긴다.
+
+    소비자가 중간에 멈추면(클라이언트 연결 종료 등) 다음 항목에서 thread 도 멈춘다.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    stop = threading.Event()
+
+    def produce() -> None:
+        try:
+            for item in iterable:
+                if stop.is_set():
+                    break
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            loop.call_soon_threadsafe(queue.put_nowait, _DONE)
+        except BaseException as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+
+    loop.run_in_executor(executor, produce)
+    try:
+        while (item := await queue.get()) is not _DONE:
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+async def stream_invocation(
+    client: Any, endpoint_name: str, payload: Dict[str, Any], executor: Optional[Executor] = None
+) -> AsyncIterator[str]:
+    """``invoke_endpoint_with_response_stream`` 응답의 SSE ``data:`` 값을 순서대로 돌려준다.
+
+    PayloadPart 경계는 SSE 이벤트 경계와 무관하므로 줄 단위로 다시 자른다. ``[DONE]`` 에서 끝난다.
+    소비자가 먼저 끝나면(클라이언트 연결 종료 등) 응답 ``Body`` (EventStream)를 닫아 연결을 정리한다.
+    """
+    closed = threading.Event()
+    bodies: List[Any] = []
+
+    def invoke():
+        response = client.invoke_endpoint_with_response_stream(
+            EndpointName=endpoint_name, ContentType="application/json", Body=json.dumps(payload)
+        )
+        body = response["Body"]
+        bodies.append(body)
+        if closed.is_set():
+            # 응답 헤더를 기다리는 사이 소비자가 떠났다
+            body.close()
+            return
+        for event in body:
+            if part := event.get("PayloadPart"):
+                yield part["Bytes"]
+
+    buffer = b""
+    parts = iterate_in_thread(invoke(), executor=executor)
+    try:
+        async for part in parts:
+            buffer += part
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                line = line.strip()
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[len(b"data:") :].strip().decode("utf-8")
+                if data == "[DONE]":
+                    return
+                yield data
+    finally:
+        closed.set()
+        await parts.aclose()
+        # thread 가 다음 event 를 기다리며 socket read 에 막혀 있을 수 있으므로 연결을 닫아 깨운다
+        for body in bodies:
+            body.close()
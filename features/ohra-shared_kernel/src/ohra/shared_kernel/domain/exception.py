@@ -1,3 +1,6 @@
+from typing import Dict, Optional
+
+
 class DomainException(Exception):
     """Base domain exception"""
 
@@ -35,6 +38,7 @@ class BaseMsgException(Exception):
     error: str = ""
     message: str = ""
     code: int = 500
+    headers: Optional[Dict[str, str]] = None  # 응답에 함께 보낼 헤더 (Retry-After 등)
 
     def __str__(self):
         return self.message
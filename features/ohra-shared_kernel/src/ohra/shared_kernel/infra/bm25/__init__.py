@@ -0,0 +1,47 @@
+import importlib
+from typing import TYPE_CHECKING, Any
+
+from ohra.shared_kernel.infra.bm25.fields import KEYWORD_FILTER_FIELDS
+from ohra.shared_kernel.infra.bm25.lock import SnapshotLock
+
+if TYPE_CHECKING:
+    from ohra.shared_kernel.infra.bm25.index import BM25Index
+    from ohra.shared_kernel.infra.bm25.segmented import SegmentedBM25Index
+    from ohra.shared_kernel.infra.bm25.snapshot import (
+        BM25Snapshot,
+        load_snapshot,
+        publish_snapshot,
+        read_manifest,
+        write_snapshot,
+    )
+
+# numpy 를 쓰는 모듈은 처음 접근할 때 불러온다. DTO 처럼 필드 상수만 필요한 곳에서 numpy 를 올리지 않기 위함
+_LAZY = {
+    "BM25Index": "index",
+    "BM25Snapshot": "snapshot",
+    "SegmentedBM25Index": "segmented",
+    "load_snapshot": "snapshot",
+    "publish_snapshot": "snapshot",
+    "read_manifest": "snapshot",
+    "write_snapshot": "snapshot",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f"{__name__}.{module}"), name)
+
+
+__all__ = [
+    "KEYWORD_FILTER_FIELDS",
+    "BM25Index",
+    "BM25Snapshot",
+    "SegmentedBM25Index",
+    "SnapshotLock",
+    "load_snapshot",
+    "publish_snapshot",
+    "read_manifest",
+    "write_snapshot",
+]
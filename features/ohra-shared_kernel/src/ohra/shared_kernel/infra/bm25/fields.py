@@ -0,0 +1,12 @@
+# backend keyword 검색에서 필터로 쓰는 payload 필드. 인덱스와 snapshot 에 사전 인코딩해 저장하며
+# 이 외의 키로는 keyword 필터를 걸 수 없다
+KEYWORD_FILTER_FIELDS = (
+    "source_type",
+    "source_document_id",
+    "version_key",
+    "page_id",
+    "space_key",
+    "issue_key",
+    "project_key",
+    "author",
+)
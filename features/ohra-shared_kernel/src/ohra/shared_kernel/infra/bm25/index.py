@@ -0,0 +1,268 @@
+import math
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+PointId = Hashable
+
+_TF_MAX = 0xFFFF
+
+
+def accumulate(
+    scores: np.ndarray,
+    slots: np.ndarray,
+    tfs: np.ndarray,
+    doc_len: np.ndarray,
+    allowed: np.ndarray,
+    weight: float,
+    k1: float,
+    b: float,
+    avgdl: float,
+) -> None:
+    """한 term 의 posting 을 허용된 slot 에 대해서만 ``scores`` 에 누적한다."""
+    keep = allowed[slots]
+    slots = slots[keep]
+    if not len(slots):
+        return
+    tfs = tfs[keep].astype(np.float32)
+    norm = k1 * (1 - b) + (k1 * b / avgdl) * doc_len[slots]
+    # 한 posting 안의 slot 은 중복되지 않으므로 fancy-index 누적이 안전하다
+    scores[slots] += weight * tfs * (k1 + 1) / (tfs + norm)
+
+
+def encode_term_ids(term_ids: Sequence[int]) -> bytes:
+    """term id 를 정렬해 첫 id(uint32) 뒤에 차이값만 담을 수 있는 가장 작은 unsigned dtype 으로 붙인다."""
+    if not term_ids:
+        return b""
+    ids = np.sort(np.asarray(term_ids, dtype=np.uint32))
+    gaps = np.diff(ids)
+    itemsize = 1 if not len(gaps) or gaps.max() <= 0xFF else 2 if gaps.max() <= 0xFFFF else 4
+    return bytes([itemsize]) + ids[:1].astype("<u4").tobytes() + gaps.astype(f"<u{itemsize}").tobytes()
+
+
+def decode_term_ids(data: bytes) -> np.ndarray:
+    if not data:
+        return np.empty(0, dtype=np.int64)
+    first = np.frombuffer(data, dtype="<u4", count=1, offset=1)
+    gaps = np.frombuffer(data, dtype=f"<u{data[0]}", offset=5)
+    return np.cumsum(np.concatenate([first, gaps]), dtype=np.int64)
+
+
+def top_k_slots(scores: np.ndarray, top_k: Optional[int]) -> np.ndarray:
+    candidates = np.flatnonzero(scores)
+    if top_k is not None and top_k < len(candidates):
+        candidates = candidates[np.argpartition(scores[candidates], -top_k)[-top_k:]]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+@dataclass
+class BM25Index:
+    """문서 단위 추가/삭제를 지원하는 inverted-index BM25.
+
+    문서는 정수 slot 으로 관리하고 term 별 posting list 를 ``array`` (slot: uint32, tf: uint16) 로 저장한다.
+    검색 시에는 질의 term 의 posting 만 numpy 로 읽어 점수를 누적하므로 전체 문서를 점수화하지 않는다.
+    payload 는 보관하지 않고 ``fields`` 로 지정한 필터 필드만 사전 인코딩된 int32 code 로 저장한다.
+    문서별 term id 목록(forward index)을 차이값 인코딩한 ``bytes`` 로 두어 삭제 시 df 를 바로 줄인다.
+    posting 에서는 slot 을 비활성화(tombstone)만 하고, 삭제된 slot 비율이 ``compact_ratio`` 를 넘으면 재구성한다.
+    IDF 는 음수가 나오지 않는 ``log(1 + (N - df + 0.5) / (df + 0.5))`` 를 사용한다.
+    """
+
+    k1: float = 1.5
+    b: float = 0.75
+    compact_ratio: float = 0.5
+    fields: Sequence[str] = ()
+    _slots: Dict[PointId, int] = field(default_factory=dict, init=False, repr=False)
+    _point_ids: List[Optional[PointId]] = field(default_factory=list, init=False, repr=False)
+    _term_ids: Dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    _doc_len: array = field(default_factory=lambda: array("I"), init=False, repr=False)
+    _alive: bytearray = field(default_factory=bytearray, init=False, repr=False)
+    _post_slots: List[array] = field(default_factory=list, init=False, repr=False)
+    _post_tfs: List[array] = field(default_factory=list, init=False, repr=False)
+    _df: array = field(default_factory=lambda: array("I"), init=False, repr=False)
+    _doc_terms: List[Optional[bytes]] = field(default_factory=list, init=False, repr=False)
+    _columns: Dict[str, array] = field(default_factory=dict, init=False, repr=False)
+    _codebooks: Dict[str, Dict[Any, int]] = field(default_factory=dict, init=False, repr=False)
+    _total_len: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self):
+        self.fields = tuple(self.fields)
+        for name in self.fields:
+            self._columns[name] = array("i")
+            self._codebooks[name] = {}
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, point_id: PointId) -> bool:
+        return point_id in self._slots
+
+    @property
+    def avgdl(self) -> float:
+        return self._total_len / len(self._slots) if self._slots else 0.0
+
+    @property
+    def total_len(self) -> int:
+        return self._total_len
+
+    def doc_freq(self, term: str) -> int:
+        term_id = self._term_ids.get(term)
+        return 0 if term_id is None else self._df[term_id]
+
+    def idf(self, term: str) -> float:
+        n = len(self._slots)
+        df = min(self.doc_freq(term), n)
+        return math.log1p((n - df + 0.5) / (df + 0.5))
+
+    def _term_id(self, term: str) -> int:
+        term_id = self._term_ids.get(term)
+        if term_id is None:
+            term_id = self._term_ids[term] = len(self._post_slots)
+            self._post_slots.append(array("I"))
+            self._post_tfs.append(array("H"))
+            self._df.append(0)
+        return term_id
+
+    def add(self, point_id: PointId, tokens: Iterable[str], payload: Optional[Mapping[str, Any]] = None) -> None:
+        if point_id in self._slots:
+            self.remove(point_id)
+
+        counts = Counter(tokens)
+        length = sum(counts.values())
+        slot = len(self._point_ids)
+        term_ids = []
+        for term, tf in counts.items():
+            term_id = self._term_id(term)
+            self._post_slots[term_id].append(slot)
+            self._post_tfs[term_id].append(min(tf, _TF_MAX))
+            self._df[term_id] += 1
+            term_ids.append(term_id)
+
+        payload = payload or {}
+        for name, column in self._columns.items():
+            value = payload.get(name)
+            codebook = self._codebooks[name]
+            column.append(-1 if value is None else codebook.setdefault(value, len(codebook)))
+
+        self._slots[point_id] = slot
+        self._point_ids.append(point_id)
+        self._doc_terms.append(encode_term_ids(term_ids))
+        self._doc_len.append(length)
+        self._alive.append(1)
+        self._total_len += length
+
+    def remove(self, point_id: PointId) -> bool:
+        slot = self._slots.pop(point_id, None)
+        if slot is None:
+            return False
+
+        self._total_len -= self._doc_len[slot]
+        self._alive[slot] = 0
+        self._point_ids[slot] = None
+        df = np.frombuffer(self._df, dtype=np.uint32)
+        df[decode_term_ids(self._doc_terms[slot])] -= 1
+        del df
+        self._doc_terms[slot] = None
+
+        if len(self._point_ids) - len(self._slots) > self.compact_ratio * len(self._point_ids):
+            self.compact()
+        return True
+
+    def compact(self) -> None:
+        """삭제된 slot 을 제거하고 남은 문서의 slot 을 0 부터 다시 매긴다."""
+        alive = np.frombuffer(self._alive, dtype=np.bool_)
+        remap = np.cumsum(alive, dtype=np.int64) - 1
+
+        for term_id, slots in enumerate(self._post_slots):
+            old = np.frombuffer(slots, dtype=np.uint32)
+            keep = alive[old]
+            tfs = np.frombuffer(self._post_tfs[term_id], dtype=np.uint16)[keep]
+            self._post_slots[term_id] = array("I", remap[old[keep]].astype(np.uint32).tobytes())
+            self._post_tfs[term_id] = array("H", tfs.tobytes())
+
+        for name, column in self._columns.items():
+            self._columns[name] = array("i", np.frombuffer(column, dtype=np.int32)[alive].tobytes())
+        self._doc_len = array("I", np.frombuffer(self._doc_len, dtype=np.uint32)[alive].tobytes())
+        self._point_ids = [pid for pid in self._point_ids if pid is not None]
+        self._doc_terms = [terms for terms in self._doc_terms if terms is not None]
+        self._alive = bytearray(b"\x01" * len(self._point_ids))
+        self._slots = {pid: slot for slot, pid in enumerate(self._point_ids)}
+
+    @property
+    def num_slots(self) -> int:
+        return len(self._point_ids)
+
+    def alive(self) -> np.ndarray:
+        return np.frombuffer(self._alive, dtype=np.bool_)
+
+    def doc_lengths(self) -> np.ndarray:
+        return np.frombuffer(self._doc_len, dtype=np.uint32)
+
+    def terms(self) -> Iterable[str]:
+        return (term for term, term_id in self._term_ids.items() if self._df[term_id])
+
+    def postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        term_id = self._term_ids.get(term)
+        if term_id is None:
+            return np.empty(0, dtype=np.uint32), np.empty(0, dtype=np.uint16)
+        slots, tfs = self._post_slots[term_id], self._post_tfs[term_id]
+        return np.frombuffer(slots, dtype=np.uint32), np.frombuffer(tfs, dtype=np.uint16)
+
+    def point_id(self, slot: int) -> Optional[PointId]:
+        return self._point_ids[slot]
+
+    def field_codes(self, name: str) -> Tuple[np.ndarray, List[Any]]:
+        """필드의 slot 별 code 배열(없으면 -1)과 code -> 값 목록."""
+        return np.frombuffer(self._columns[name], dtype=np.int32), list(self._codebooks[name])
+
+    def field_mask(self, name: str, value: Any) -> np.ndarray:
+        """``payload[name] == value`` 인 slot mask. ``fields`` 에 없는 필드면 ``ValueError``."""
+        if name not in self._columns:
+            raise ValueError(f"Unsupported filter field: {name} (indexed fields: {self.fields})")
+        code = self._codebooks[name].get(value)
+        if code is None:
+            return np.zeros(len(self._point_ids), dtype=np.bool_)
+        return np.frombuffer(self._columns[name], dtype=np.int32) == code
+
+    def filter_mask(self, filter: Mapping[str, Any]) -> np.ndarray:
+        mask = np.ones(len(self._point_ids), dtype=np.bool_)
+        for name, value in filter.items():
+            mask &= self.field_mask(name, value)
+        return mask
+
+    def mask(self, point_ids: Iterable[PointId]) -> np.ndarray:
+        """주어진 point 만 True 인 slot mask. ``search(mask=...)`` 에 넘겨 필터를 점수 누적 단계에서 적용한다.
+
+        slot 은 compact 시 다시 매겨지므로 mask 는 다음 add/remove 전까지만 유효하다.
+        """
+        mask = np.zeros(len(self._point_ids), dtype=np.bool_)
+        slots = [self._slots[pid] for pid in point_ids if pid in self._slots]
+        if slots:
+            mask[np.fromiter(slots, dtype=np.int64, count=len(slots))] = True
+        return mask
+
+    def search(
+        self,
+        query_tokens: Iterable[str],
+        top_k: Optional[int] = None,
+        mask: Optional[np.ndarray] = None,
+    ) -> List[Tuple[PointId, float]]:
+        if not self._slots:
+            return []
+
+        allowed = self.alive()
+        if mask is not None:
+            if len(mask) != len(allowed):
+                raise ValueError("mask was built before the index changed; call mask() again")
+            allowed = allowed & mask
+
+        doc_len, avgdl = self.doc_lengths(), self.avgdl
+        scores = np.zeros(len(self._point_ids), dtype=np.float32)
+        for term, qtf in Counter(query_tokens).items():
+            slots, tfs = self.postings(term)
+            accumulate(scores, slots, tfs, doc_len, allowed, self.idf(term) * qtf, self.k1, self.b, avgdl)
+
+        point_ids = self._point_ids
+        return [(point_ids[slot], float(scores[slot])) for slot in top_k_slots(scores, top_k)]
@@ -0,0 +1,55 @@
+import asyncio
+import fcntl
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Optional, Union
+
+LOCK_FILE = ".lock"
+
+
+@dataclass
+class SnapshotLock:
+    """index 디렉터리 단위 ``fcntl.flock``.
+
+    같은 호스트의 여러 process(uvicorn worker, sync worker) 중 하나만 snapshot 을 빌드/게시하게 한다.
+    ``with`` 는 lock 이 풀릴 때까지 블록하고,
+    ``async with`` 는 이벤트 루프를 막지 않도록 ``poll_interval`` 마다 재시도한다.
+    """
+
+    index_dir: Union[str, Path]
+    poll_interval: float = 0.2
+    _file: Optional[IO] = field(default=None, init=False, repr=False)
+
+    def _open(self) -> IO:
+        index_dir = Path(self.index_dir)
+        index_dir.mkdir(parents=True, exist_ok=True)
+        return open(index_dir / LOCK_FILE, "a+")
+
+    def __enter__(self) -> "SnapshotLock":
+        self._file = self._open()
+        fcntl.flock(self._file, fcntl.LOCK_EX)
+        return self
+
+    async def __aenter__(self) -> "SnapshotLock":
+        self._file = self._open()
+        while True:
+            try:
+                fcntl.flock(self._file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return self
+            except BlockingIOError:
+                await asyncio.sleep(self.poll_interval)
+            except BaseException:
+                self._release()
+                raise
+
+    def _release(self) -> None:
+        if self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+    def __exit__(self, *exc_info) -> None:
+        self._release()
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._release()
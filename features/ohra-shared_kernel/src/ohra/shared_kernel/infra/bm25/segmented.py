@@ -0,0 +1,142 @@
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from ohra.shared_kernel.infra.bm25.index import BM25Index, PointId, accumulate, top_k_slots
+from ohra.shared_kernel.infra.bm25.snapshot import BM25Snapshot
+
+
+@dataclass
+class SegmentedBM25Index:
+    """mmap 된 snapshot(base) 위에 메모리 delta 와 tombstone 을 얹은 BM25 인덱스.
+
+    slot 은 base 가 ``[0, len(base))``, delta 가 그 뒤를 사용한다.
+    base 문서가 바뀌거나 지워지면 tombstone 으로 가리고 새 버전은 delta 에 넣는다.
+    tombstone 된 base 문서의 df 는 다음 snapshot 전까지 남는다 (Lucene 의 삭제 문서와 같은 근사).
+    """
+
+    base: BM25Snapshot
+    delta: Optional[BM25Index] = None
+    _tombstones: np.ndarray = field(init=False, repr=False)
+    _removed: int = field(default=0, init=False, repr=False)
+    _removed_len: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.delta is None:
+            self.delta = BM25Index(k1=self.base.k1, b=self.base.b, fields=self.base.fields)
+        self._tombstones = np.zeros(len(self.base), dtype=np.bool_)
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        return self.base.fields
+
+    @property
+    def k1(self) -> float:
+        return self.base.k1
+
+    @property
+    def b(self) -> float:
+        return self.base.b
+
+    def __len__(self) -> int:
+        return len(self.base) - self._removed + len(self.delta)
+
+    def __contains__(self, point_id: PointId) -> bool:
+        return point_id in self.delta or self._base_slot(point_id) is not None
+
+    @property
+    def num_slots(self) -> int:
+        return len(self.base) + self.delta.num_slots
+
+    @property
+    def avgdl(self) -> float:
+        total = self.base.total_len - self._removed_len + self.delta.total_len
+        return total / len(self) if len(self) else 0.0
+
+    def doc_freq(self, term: str) -> int:
+        return self.base.doc_freq(term) + self.delta.doc_freq(term)
+
+    def idf(self, term: str) -> float:
+        n = len(self)
+        df = min(self.doc_freq(term), n)
+        return math.log1p((n - df + 0.5) / (df + 0.5))
+
+    def _base_slot(self, point_id: PointId) -> Optional[int]:
+        slot = self.base.slot_of(point_id)
+        if slot is None or self._tombstones[slot]:
+            return None
+        return slot
+
+    def add(self, point_id: PointId, tokens: Iterable[str], payload: Optional[Mapping[str, Any]] = None) -> None:
+        self._remove_base(point_id)
+        self.delta.add(point_id, tokens, payload)
+
+    def remove(self, point_id: PointId) -> bool:
+        return self.delta.remove(point_id) or self._remove_base(point_id)
+
+    def _remove_base(self, point_id: PointId) -> bool:
+        slot = self._base_slot(point_id)
+        if slot is None:
+            return False
+        self._tombstones[slot] = True
+        self._removed += 1
+        self._removed_len += int(self.base.doc_len[slot])
+        return True
+
+    def point_id(self, slot: int) -> Optional[PointId]:
+        base_size = len(self.base)
+        if slot < base_size:
+            return None if self._tombstones[slot] else int(self.base.point_ids[slot])
+        return self.delta.point_id(slot - base_size)
+
+    def field_mask(self, name: str, value: Any) -> np.ndarray:
+        return np.concatenate([self.base.field_mask(name, value), self.delta.field_mask(name, value)])
+
+    def filter_mask(self, filter: Mapping[str, Any]) -> np.ndarray:
+        mask = np.ones(self.num_slots, dtype=np.bool_)
+        for name, value in filter.items():
+            mask &= self.field_mask(name, value)
+        return mask
+
+    def mask(self, point_ids: Iterable[PointId]) -> np.ndarray:
+        """point id 집합으로 전체 slot mask 를 만든다. 다음 add/remove 전까지만 유효하다."""
+        point_ids = list(point_ids)
+        base = np.zeros(len(self.base), dtype=np.bool_)
+        for point_id in point_ids:
+            slot = self.base.slot_of(point_id)
+            if slot is not None:
+                base[slot] = True
+        return np.concatenate([base, self.delta.mask(point_ids)])
+
+    def search(
+        self,
+        query_tokens: Iterable[str],
+        top_k: Optional[int] = None,
+        mask: Optional[np.ndarray] = None,
+    ) -> List[Tuple[PointId, float]]:
+        if not len(self):
+            return []
+
+        base_size = len(self.base)
+        allowed = np.concatenate([~self._tombstones, self.delta.alive()])
+        if mask is not None:
+            if len(mask) != len(allowed):
+                raise ValueError("mask was built before the index changed; call mask() again")
+            allowed &= mask
+
+        k1, b, avgdl = self.k1, self.b, self.avgdl
+        delta_len = self.delta.doc_lengths()
+        scores = np.zeros(len(allowed), dtype=np.float32)
+        base_scores, delta_scores = scores[:base_size], scores[base_size:]
+        base_allowed, delta_allowed = allowed[:base_size], allowed[base_size:]
+        for term, qtf in Counter(query_tokens).items():
+            weight = self.idf(term) * qtf
+            slots, tfs = self.base.postings(term)
+            accumulate(base_scores, slots, tfs, self.base.doc_len, base_allowed, weight, k1, b, avgdl)
+            slots, tfs = self.delta.postings(term)
+            accumulate(delta_scores, slots, tfs, delta_len, delta_allowed, weight, k1, b, avgdl)
+
+        return [(self.point_id(int(slot)), float(scores[slot])) for slot in top_k_slots(scores, top_k)]
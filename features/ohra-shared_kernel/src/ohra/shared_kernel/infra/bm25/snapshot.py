@@ -0,0 +1,218 @@
+import hashlib
+import json
+import os
+import shutil
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ohra.shared_kernel.infra.bm25.index import BM25Index, PointId
+
+SNAPSHOT_FORMAT = 1
+MANIFEST_FILE = "manifest.json"
+_ARRAYS = ("term_hashes", "term_offsets", "post_slots", "post_tfs", "doc_len", "point_ids", "point_order")
+
+
+def term_hash(term: str) -> int:
+    # 문자열 사전 대신 정렬된 64-bit hash 배열을 두어 term 사전까지 mmap 으로 공유한다
+    return int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+@dataclass(frozen=True)
+class BM25Snapshot:
+    """디스크에 저장된 읽기 전용 BM25 segment.
+
+    term 사전(정렬된 term hash + CSR offset), posting(slot, tf), 문서 길이, point id 와
+    필터용 payload 필드(사전 인코딩된 int32 code)를 ``.npy`` 로 저장하고 ``mmap_mode="r"`` 로 읽는다.
+    여러 uvicorn worker 가 같은 파일을 mmap 하므로 OS page cache 를 공유한다.
+    """
+
+    directory: Path
+    k1: float
+    b: float
+    tokenizer: str
+    generation: int
+    indexed_at: Optional[str]
+    total_len: int
+    term_hashes: np.ndarray
+    term_offsets: np.ndarray
+    post_slots: np.ndarray
+    post_tfs: np.ndarray
+    doc_len: np.ndarray
+    point_ids: np.ndarray
+    point_order: np.ndarray
+    columns: Dict[str, np.ndarray] = field(default_factory=dict)
+    values: Dict[str, List[Any]] = field(default_factory=dict)
+    _codes: Dict[str, Dict[Any, int]] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        codes = {name: {value: code for code, value in enumerate(values)} for name, values in self.values.items()}
+        object.__setattr__(self, "_codes", codes)
+
+    def __len__(self) -> int:
+        return len(self.doc_len)
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        return tuple(self.columns)
+
+    def _term_index(self, term: str) -> Optional[int]:
+        key = np.uint64(term_hash(term))
+        i = int(np.searchsorted(self.term_hashes, key))
+        if i < len(self.term_hashes) and self.term_hashes[i] == key:
+            return i
+        return None
+
+    def doc_freq(self, term: str) -> int:
+        i = self._term_index(term)
+        return 0 if i is None else int(self.term_offsets[i + 1] - self.term_offsets[i])
+
+    def postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        i = self._term_index(term)
+        if i is None:
+            return np.empty(0, dtype=np.uint32), np.empty(0, dtype=np.uint16)
+        start, end = self.term_offsets[i], self.term_offsets[i + 1]
+        return self.post_slots[start:end], self.post_tfs[start:end]
+
+    def slot_of(self, point_id: PointId) -> Optional[int]:
+        if not isinstance(point_id, (int, np.integer)):
+            return None
+        i = int(np.searchsorted(self.point_ids, point_id, sorter=self.point_order))
+        if i < len(self.point_order) and self.point_ids[self.point_order[i]] == point_id:
+            return int(self.point_order[i])
+        return None
+
+    def field_mask(self, name: str, value: Any) -> np.ndarray:
+        """``payload[name] == value`` 인 slot mask. snapshot 에 없는 필드면 ``ValueError``."""
+        if name not in self.columns:
+            raise ValueError(f"Unsupported filter field: {name} (indexed fields: {self.fields})")
+        code = self._codes[name].get(value)
+        if code is None:
+            return np.zeros(len(self), dtype=np.bool_)
+        return self.columns[name] == code
+
+    def field_value(self, name: str, slot: int) -> Any:
+        code = int(self.columns[name][slot])
+        return None if code < 0 else self.values[name][code]
+
+    @classmethod
+    def load(cls, directory: Union[str, Path], mmap: bool = True) -> "BM25Snapshot":
+        directory = Path(directory)
+        meta = json.loads((directory / "meta.json").read_text())
+        if meta["format"] != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported BM25 snapshot format: {meta['format']}")
+
+        mmap_mode = "r" if mmap else None
+        arrays = {name: np.load(directory / f"{name}.npy", mmap_mode=mmap_mode) for name in _ARRAYS}
+        columns = {name: np.load(directory / f"field_{name}.npy", mmap_mode=mmap_mode) for name in meta["fields"]}
+        return cls(
+            directory=directory,
+            k1=meta["k1"],
+            b=meta["b"],
+            tokenizer=meta["tokenizer"],
+            generation=meta["generation"],
+            indexed_at=meta.get("indexed_at"),
+            total_len=meta["total_len"],
+            columns=columns,
+            values=meta["fields"],
+            **arrays,
+        )
+
+
+def write_snapshot(
+    directory: Union[str, Path],
+    index: BM25Index,
+    tokenizer: str = "ngram",
+    generation: int = 0,
+    indexed_at: Optional[str] = None,
+) -> Path:
+    """``BM25Index`` (posting 과 필터 필드) 로 snapshot 디렉터리를 만든다. point id 는 정수여야 한다."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    index.compact()
+
+    point_ids = np.array([index.point_id(slot) for slot in range(index.num_slots)], dtype=np.int64)
+    terms = sorted(index.terms(), key=term_hash)
+    postings = [index.postings(term) for term in terms]
+    offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+    np.cumsum([len(slots) for slots, _ in postings], out=offsets[1:])
+
+    arrays = {
+        "term_hashes": np.array([term_hash(term) for term in terms], dtype=np.uint64),
+        "term_offsets": offsets,
+        "post_slots": np.concatenate([slots for slots, _ in postings] or [np.empty(0, dtype=np.uint32)]),
+        "post_tfs": np.concatenate([tfs for _, tfs in postings] or [np.empty(0, dtype=np.uint16)]),
+        "doc_len": index.doc_lengths().copy(),
+        "point_ids": point_ids,
+        "point_order": np.argsort(point_ids, kind="stable").astype(np.int64),
+    }
+    for name, array in arrays.items():
+        np.save(directory / f"{name}.npy", array)
+
+    values: Dict[str, List[Any]] = {}
+    for name in index.fields:
+        codes, values[name] = index.field_codes(name)
+        np.save(directory / f"field_{name}.npy", codes)
+
+    meta = {
+        "format": SNAPSHOT_FORMAT,
+        "k1": index.k1,
+        "b": index.b,
+        "tokenizer": tokenizer,
+        "generation": generation,
+        "indexed_at": indexed_at,
+        "total_len": int(arrays["doc_len"].sum()),
+        "fields": values,
+    }
+    (directory / "meta.json").write_text(json.dumps(meta, ensure_ascii=False))
+    return directory
+
+
+def read_manifest(index_dir: Union[str, Path]) -> Optional[Dict[str, Any]]:
+    path = Path(index_dir) / MANIFEST_FILE
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def publish_snapshot(
+    index_dir: Union[str, Path],
+    index: BM25Index,
+    tokenizer: str = "ngram",
+    indexed_at: Optional[str] = None,
+    keep: int = 2,
+) -> int:
+    """새 generation 디렉터리에 snapshot 을 쓰고 manifest 를 원자적으로 교체한다.
+
+    이전 generation 은 ``keep`` 개까지 남겨 두어 아직 mmap 중인 reader 가 바로 끊기지 않게 한다.
+    게시하는 process 가 여럿이면 ``SnapshotLock`` 을 잡은 채로 호출해야 generation 이 겹치지 않는다.
+    """
+    index_dir = Path(index_dir)
+    index_dir.mkdir(parents=True, exist_ok=True)
+    manifest = read_manifest(index_dir) or {}
+    generation = manifest.get("generation", 0) + 1
+    name = f"{generation:08d}"
+
+    tmp_dir = index_dir / f".{name}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    write_snapshot(tmp_dir, index, tokenizer, generation, indexed_at)
+    shutil.rmtree(index_dir / name, ignore_errors=True)
+    os.replace(tmp_dir, index_dir / name)
+
+    tmp_manifest = index_dir / f".{MANIFEST_FILE}.tmp"
+    tmp_manifest.write_text(json.dumps({"generation": generation, "snapshot": name, "indexed_at": indexed_at}))
+    os.replace(tmp_manifest, index_dir / MANIFEST_FILE)
+
+    generations = sorted(p for p in index_dir.iterdir() if p.is_dir() and p.name.isdigit())
+    for old in generations[:-keep]:
+        shutil.rmtree(old, ignore_errors=True)
+    return generation
+
+
+def load_snapshot(index_dir: Union[str, Path], mmap: bool = True) -> Optional[BM25Snapshot]:
+    manifest = read_manifest(index_dir)
+    if manifest is None:
+        return None
+    return BM25Snapshot.load(Path(index_dir) / manifest["snapshot"], mmap=mmap)
@@ -3,23 +3,28 @@ from typing import TYPE_CHECKING
 
 from fastapi import FastAPI
 from fastapi_cache import FastAPICache
-from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.backends import Backend
 from fastapi_cache.backends.redis import RedisBackend
 from redis import asyncio as aioredis
 
 from . import key_builders
+from .backends import LRUMemoryBackend
 
 if TYPE_CHECKING:
     from ohra.shared_kernel.infra.settings.model import CacheSettings
 logger = logging.getLogger("uvicorn.access")
 
 
-def setting_cache(app: FastAPI, setting: "CacheSettings"):
-    backend = InMemoryBackend()
+def build_cache_backend(setting: "CacheSettings") -> Backend:
+    """``backend_url`` 이 있으면 Redis, 없으면 process 내 메모리 (``max_entries`` 개까지 LRU)"""
     if setting.backend_url:
         logger.info("*** Using Redis cache backend ***")
-        redis = aioredis.from_url(setting.backend_url)
-        backend = RedisBackend(redis)
+        return RedisBackend(aioredis.from_url(setting.backend_url))
+    return LRUMemoryBackend(max_entries=setting.max_entries)
+
+
+def setting_cache(app: FastAPI, setting: "CacheSettings"):
+    backend = build_cache_backend(setting)
     logger.info(f"*** Key prefix: {setting.prefix} ***")
     logger.info(f"*** Expire: {setting.expire} ***")
     logger.info(f"*** Enable: {setting.enable} ***")
@@ -34,4 +39,4 @@ def setting_cache(app: FastAPI, setting: "CacheSettings"):
     return app
 
 
-__all__ = ["setting_cache"]
+__all__ = ["LRUMemoryBackend", "build_cache_backend", "setting_cache"]
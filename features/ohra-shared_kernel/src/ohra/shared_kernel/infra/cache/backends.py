@@ -0,0 +1,56 @@
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from fastapi_cache.backends import Backend
+
+
+class LRUMemoryBackend(Backend):
+    """항목 수 상한(LRU)과 TTL 이 있는 process 메모리 cache backend.
+
+    fastapi-cache2 의 ``InMemoryBackend`` 는 class 수준 dict 를 모든 인스턴스가 공유하고, 지우지 않으며,
+    만료 항목도 다시 읽을 때만 지운다. 여기서는 인스턴스마다 저장소를 따로 두고 ``max_entries`` 를 넘으면
+    가장 오래 쓰지 않은 항목부터 버린다.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[bytes, Optional[float]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: str) -> Optional[Tuple[bytes, Optional[float]]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    async def get_with_ttl(self, key: str) -> Tuple[int, Optional[bytes]]:
+        entry = self._lookup(key)
+        if entry is None:
+            return 0, None
+        value, expires_at = entry
+        return (-1 if expires_at is None else int(expires_at - time.monotonic())), value
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._lookup(key)
+        return entry[0] if entry else None
+
+    async def set(self, key: str, value: bytes, expire: Optional[int] = None) -> None:
+        self._entries[key] = (value, time.monotonic() + expire if expire else None)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def clear(self, namespace: Optional[str] = None, key: Optional[str] = None) -> int:
+        if key is not None:
+            return 1 if self._entries.pop(key, None) is not None else 0
+        keys = [k for k in self._entries if namespace is None or k.startswith(namespace)]
+        for k in keys:
+            del self._entries[k]
+        return len(keys)
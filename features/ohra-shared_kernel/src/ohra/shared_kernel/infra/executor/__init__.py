@@ -0,0 +1,5 @@
+from ohra.shared_kernel.infra.executor.lag import EventLoopLagMonitor
+from ohra.shared_kernel.infra.executor.pool import CPUExecutor
+from ohra.shared_kernel.infra.executor.single_flight import SingleFlight
+
+__all__ = ["CPUExecutor", "EventLoopLagMonitor", "SingleFlight"]
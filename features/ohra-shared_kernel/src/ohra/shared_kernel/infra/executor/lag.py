@@ -0,0 +1,67 @@
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class EventLoopLagMonitor:
+    """``interval`` 마다 sleep 에서 깨어난 시각이 예정보다 얼마나 늦었는지로 이벤트 루프 지연을 측정한다.
+
+    동기 CPU 작업이 루프를 막으면 그만큼 lag 가 커진다. ``warn_threshold`` 를 넘으면 경고 로그를 남긴다.
+    """
+
+    interval: float = 0.05
+    warn_threshold: Optional[float] = 0.1
+    window: int = 1200
+    _samples: Deque[float] = field(init=False, repr=False)
+    _task: Optional[asyncio.Task] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        self._samples = deque(maxlen=self.window)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - expected, 0.0)
+            self._samples.append(lag)
+            if self.warn_threshold is not None and lag > self.warn_threshold:
+                logger.warning(f"Event loop blocked for {lag * 1000:.0f}ms")
+
+    def reset(self) -> None:
+        self._samples.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """최근 ``window`` 개 샘플의 lag 통계 (ms)."""
+        if not self._samples:
+            return {"samples": 0, "p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        ordered = sorted(self._samples)
+
+        def percentile(p: float) -> float:
+            return ordered[min(int(p * len(ordered)), len(ordered) - 1)] * 1000
+
+        return {
+            "samples": len(ordered),
+            "p50_ms": percentile(0.5),
+            "p99_ms": percentile(0.99),
+            "max_ms": ordered[-1] * 1000,
+        }
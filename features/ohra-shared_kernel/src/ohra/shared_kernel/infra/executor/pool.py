@@ -0,0 +1,38 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class CPUExecutor:
+    """토큰화, BM25 점수 계산, sparse 벡터 생성 같은 CPU 작업을 이벤트 루프 밖의 제한된 thread pool 에서 실행한다.
+
+    동시에 pool 에 들어가는 작업은 ``max_pending`` 개로 제한해 요청이 몰려도 대기열이 무한히 늘지 않는다.
+    ``max_workers`` 가 0 이면 호출한 코루틴에서 바로 실행한다.
+    """
+
+    max_workers: int = 4
+    max_pending: int = 64
+    thread_name_prefix: str = "ohra-cpu"
+    _pool: Optional[ThreadPoolExecutor] = field(default=None, init=False, repr=False)
+    _semaphore: asyncio.Semaphore = field(init=False, repr=False)
+
+    def __post_init__(self):
+        if self.max_workers > 0:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.thread_name_prefix)
+        self._semaphore = asyncio.Semaphore(max(self.max_pending, self.max_workers, 1))
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        if self._pool is None:
+            return fn(*args, **kwargs)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, functools.partial(fn, *args, **kwargs))
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
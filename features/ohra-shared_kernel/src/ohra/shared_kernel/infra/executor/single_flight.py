@@ -0,0 +1,34 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlight:
+    """같은 key 의 작업이 실행 중이면 새로 실행하지 않고 그 결과를 함께 기다린다.
+
+    작업은 별도 task 로 실행하므로 먼저 호출한 쪽이 취소되어도 함께 기다리던 호출은 결과를 받는다.
+    예외도 기다리던 모든 호출에 그대로 전달된다. 끝난 작업의 결과는 보관하지 않는다 (cache 가 아님).
+    """
+
+    _flights: Dict[Hashable, "asyncio.Task[Any]"] = field(default_factory=dict, init=False, repr=False)
+    executions: int = field(default=0, init=False)
+    shared: int = field(default=0, init=False)  # 실행 중인 작업에 합류한 호출 수
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """``(결과, 다른 호출의 실행 결과를 받았는지)``"""
+        task = self._flights.get(key)
+        joined = task is not None
+        if joined:
+            self.shared += 1
+        else:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._flights[key] = task
+            task.add_done_callback(lambda done: self._flights.pop(key) if self._flights.get(key) is done else None)
+        return await asyncio.shield(task), joined
+
+    def stats(self) -> Dict[str, int]:
+        return {"in_flight": len(self._flights), "executions": self.executions, "shared": self.shared}
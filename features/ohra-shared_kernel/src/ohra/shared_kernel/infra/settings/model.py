@@ -42,6 +42,7 @@ class CacheSettings(BaseModel):
     expire: int = 30
     prefix: str = ""
     enable: bool = True
+    max_entries: int = 1024  # backend_url 이 없을 때 process 메모리에 두는 최대 항목 수
 
 
 class JWTSettings(BaseModel):
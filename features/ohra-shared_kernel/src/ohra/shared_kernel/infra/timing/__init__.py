@@ -0,0 +1,3 @@
+from ohra.shared_kernel.infra.timing.stages import StageTimings, current_timings, record_stage, stage, start_timings
+
+__all__ = ["StageTimings", "current_timings", "record_stage", "stage", "start_timings"]
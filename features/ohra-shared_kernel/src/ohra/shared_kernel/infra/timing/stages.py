@@ -0,0 +1,56 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Optional
+
+_current: ContextVar[Optional["StageTimings"]] = ContextVar("ohra_stage_timings", default=None)
+
+
+@dataclass
+class StageTimings:
+    """한 요청의 단계별 소요 시간 (ms). 같은 단계가 여러 번 실행되면 합산한다.
+
+    동시에 실행되는 단계(hybrid 검색의 dense / sparse 분기 등)는 시간이 겹칠 수 있다.
+    ``total`` 은 측정을 시작한 뒤 지금까지의 시간이다.
+    """
+
+    stages: Dict[str, float] = field(default_factory=dict)
+    started: float = field(default_factory=time.perf_counter, repr=False)
+
+    def add(self, name: str, ms: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + ms
+
+    def as_dict(self) -> Dict[str, float]:
+        total = (time.perf_counter() - self.started) * 1000
+        return {**{name: round(ms, 1) for name, ms in self.stages.items()}, "total": round(total, 1)}
+
+    def server_timing(self) -> str:
+        """``Server-Timing`` 헤더 값 (``embedding;dur=12.3, dense_search;dur=8.1, total;dur=950.2``)"""
+        return ", ".join(f"{name};dur={ms}" for name, ms in self.as_dict().items())
+
+
+def start_timings() -> StageTimings:
+    """현재 context(요청 task)에서 단계별 시간 측정을 시작한다. 이후 만든 task 들도 같은 기록을 공유한다."""
+    timings = StageTimings()
+    _current.set(timings)
+    return timings
+
+
+def current_timings() -> Optional[StageTimings]:
+    return _current.get()
+
+
+def record_stage(name: str, ms: float) -> None:
+    """측정 중인 요청이 아니면 무시한다."""
+    if (timings := _current.get()) is not None:
+        timings.add(name, ms)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, (time.perf_counter() - start) * 1000)
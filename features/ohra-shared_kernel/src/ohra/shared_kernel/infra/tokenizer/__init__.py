@@ -0,0 +1,14 @@
+from ohra.shared_kernel.infra.tokenizer.base import Tokenizer
+from ohra.shared_kernel.infra.tokenizer.factory import get_tokenizer
+from ohra.shared_kernel.infra.tokenizer.ngram import NGramTokenizer, tokenize, tokenize_batch
+from ohra.shared_kernel.infra.tokenizer.sparse import BM25SparseEncoder, token_id
+
+__all__ = [
+    "BM25SparseEncoder",
+    "NGramTokenizer",
+    "Tokenizer",
+    "get_tokenizer",
+    "token_id",
+    "tokenize",
+    "tokenize_batch",
+]
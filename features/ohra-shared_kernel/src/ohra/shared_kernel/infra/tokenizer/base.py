@@ -0,0 +1,31 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Iterable, List, Tuple
+
+
+@dataclass(frozen=True)
+class Tokenizer(ABC):
+    """토크나이저 공통 인터페이스. 질의 문자열 분석 결과는 인스턴스별 LRU 캐시에 보관한다."""
+
+    query_cache_size: int = 4096
+    _tokenize_query: Callable[[str], Tuple[str, ...]] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(
+            self, "_tokenize_query", lru_cache(maxsize=self.query_cache_size)(lambda text: tuple(self.tokenize(text)))
+        )
+
+    @property
+    @abstractmethod
+    def name(self) -> str: ...
+
+    @abstractmethod
+    def tokenize(self, text: str) -> List[str]: ...
+
+    def tokenize_batch(self, texts: Iterable[str]) -> List[List[str]]:
+        tokenize = self.tokenize
+        return [tokenize(text) for text in texts]
+
+    def tokenize_query(self, text: str) -> Tuple[str, ...]:
+        return self._tokenize_query(text)
@@ -0,0 +1,16 @@
+from functools import lru_cache
+
+from ohra.shared_kernel.infra.tokenizer.base import Tokenizer
+from ohra.shared_kernel.infra.tokenizer.ngram import NGramTokenizer
+
+
+@lru_cache(maxsize=None)
+def get_tokenizer(name: str = "ngram") -> Tokenizer:
+    # 형태소 분석기 모델 로딩이 무거우므로 이름별로 한 번만 생성한다
+    if name == "ngram":
+        return NGramTokenizer()
+    if name == "kiwi":
+        from ohra.shared_kernel.infra.tokenizer.morph import KiwiTokenizer
+
+        return KiwiTokenizer()
+    raise ValueError(f"Unknown tokenizer: {name}. Must be 'ngram' or 'kiwi'")
@@ -0,0 +1,44 @@
+from dataclasses import dataclass, field
+from typing import Any, FrozenSet, Iterable, List
+
+from ohra.shared_kernel.infra.tokenizer.base import Tokenizer
+
+# 체언/용언 어간/외국어/숫자/한자/어근만 색인한다. 조사, 어미, 의존명사 등은 제외.
+_CONTENT_TAGS = frozenset({"NNG", "NNP", "VV", "VA", "XR", "SL", "SN", "SH"})
+
+
+@dataclass(frozen=True)
+class KiwiTokenizer(Tokenizer):
+    """kiwipiepy 형태소 분석 기반 토크나이저 (오프라인 동작, optional dependency).
+
+    n-gram 방식보다 토큰 수가 훨씬 적어 sparse vector / BM25 posting 크기가 줄어든다.
+    """
+
+    tags: FrozenSet[str] = _CONTENT_TAGS
+    num_workers: int = 0
+    _kiwi: Any = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        super().__post_init__()
+        try:
+            from kiwipiepy import Kiwi
+        except ImportError as e:
+            raise ImportError(
+                "KiwiTokenizer requires kiwipiepy. Install with `pip install ohra-shared-kernel[morph]`."
+            ) from e
+        object.__setattr__(self, "_kiwi", Kiwi(num_workers=self.num_workers))
+
+    @property
+    def name(self) -> str:
+        return "kiwi"
+
+    def _forms(self, analyzed) -> List[str]:
+        tags = self.tags
+        return [token.form.lower() for token in analyzed if token.tag in tags]
+
+    def tokenize(self, text: str) -> List[str]:
+        return self._forms(self._kiwi.tokenize(text))
+
+    def tokenize_batch(self, texts: Iterable[str]) -> List[List[str]]:
+        # 리스트 입력 시 kiwipiepy 가 num_workers 만큼 병렬로 분석한다
+        return [self._forms(analyzed) for analyzed in self._kiwi.tokenize(list(texts))]
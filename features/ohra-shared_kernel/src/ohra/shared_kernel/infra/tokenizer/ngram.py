@@ -0,0 +1,56 @@
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Iterable, List, Tuple
+
+from ohra.shared_kernel.infra.tokenizer.base import Tokenizer
+
+
+def _expand_word(word: str) -> Tuple[str, ...]:
+    # 단어 + 2-gram + 3-gram
+    n = len(word)
+    if n < 2:
+        return (word,)
+    return (
+        word,
+        *[word[i : i + 2] for i in range(n - 1)],
+        *[word[i : i + 3] for i in range(n - 2)],
+    )
+
+
+@dataclass(frozen=True)
+class NGramTokenizer(Tokenizer):
+    """한국어/영어 혼합 텍스트용 문자 n-gram 토크나이저.
+
+    문서에는 같은 단어가 반복해서 등장하므로 단어 단위 확장 결과를 C 구현의 ``lru_cache`` 로
+    메모이즈해 반복 단어는 슬라이싱 없이 처리한다.
+    """
+
+    word_cache_size: int = 65536
+    _expand: Callable[[str], Tuple[str, ...]] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        super().__post_init__()
+        object.__setattr__(self, "_expand", lru_cache(maxsize=self.word_cache_size)(_expand_word))
+
+    @property
+    def name(self) -> str:
+        return "ngram"
+
+    def tokenize(self, text: str) -> List[str]:
+        tokens: List[str] = []
+        extend = tokens.extend
+        expand = self._expand
+        for word in text.lower().split():
+            extend(expand(word))
+        return tokens
+
+
+_default_tokenizer = NGramTokenizer()
+
+
+def tokenize(text: str) -> List[str]:
+    return _default_tokenizer.tokenize(text)
+
+
+def tokenize_batch(texts: Iterable[str]) -> List[List[str]]:
+    return _default_tokenizer.tokenize_batch(texts)
@@ -0,0 +1,72 @@
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from typing import Dict, Iterable, List
+
+from ohra.shared_kernel.infra.tokenizer.base import Tokenizer
+from ohra.shared_kernel.infra.tokenizer.ngram import NGramTokenizer
+
+
+def token_id(token: str) -> int:
+    # 내장 hash() 는 프로세스마다 seed 가 달라 worker 와 backend 의 index 가 어긋나므로 crc32 사용
+    return zlib.crc32(token.encode("utf-8")) & 0x7FFFFFFF
+
+
+def _to_sparse(weights: Dict[int, float]) -> Dict[str, List]:
+    return {"indices": list(weights.keys()), "values": list(weights.values())}
+
+
+@dataclass(frozen=True)
+class BM25SparseEncoder:
+    """Qdrant ``Modifier.IDF`` 와 함께 쓰는 BM25 sparse vector encoder.
+
+    문서 쪽은 BM25 TF 항(k1 포화 + 문서 길이 정규화)만 저장하고 IDF 는 Qdrant 가 질의 시점에 곱한다.
+    질의 쪽은 토큰 등장 횟수를 가중치로 사용한다.
+    """
+
+    tokenizer: Tokenizer = field(default_factory=NGramTokenizer)
+    k1: float = 1.2
+    b: float = 0.75
+    # 문서 하나의 평균 토큰 수 (글자 수가 아님). 색인 시점에 ``calibrate`` 로 실제 corpus 에 맞춘다
+    avg_doc_length: float = 2000.0
+
+    @property
+    def version(self) -> str:
+        return f"bm25:{self.tokenizer.name}:k1={self.k1}:b={self.b}:avgdl={self.avg_doc_length}"
+
+    def calibrate(self, texts: Iterable[str]) -> "BM25SparseEncoder":
+        """``texts`` 의 평균 토큰 수를 ``avg_doc_length`` 로 쓰는 encoder (비어 있으면 그대로).
+
+        유효숫자 두 자리로 반올림해 corpus 가 조금 바뀌어도 ``version`` 이 달라져 전체를 다시 색인하지 않게 한다.
+        """
+        lengths = [len(tokens) for tokens in self.tokenizer.tokenize_batch(texts) if tokens]
+        if not lengths:
+            return self
+        return replace(self, avg_doc_length=float(f"{sum(lengths) / len(lengths):.2g}"))
+
+    def encode_document_tokens(self, tokens: List[str]) -> Dict[str, List]:
+        if not tokens:
+            return {"indices": [], "values": []}
+
+        length_norm = self.k1 * (1 - self.b + self.b * len(tokens) / self.avg_doc_length)
+        weights: Dict[int, float] = {}
+        for token, tf in Counter(tokens).items():
+            idx = token_id(token)
+            weights[idx] = weights.get(idx, 0.0) + tf * (self.k1 + 1) / (tf + length_norm)
+        return _to_sparse(weights)
+
+    def encode_document(self, text: str) -> Dict[str, List]:
+        return self.encode_document_tokens(self.tokenizer.tokenize(text))
+
+    def encode_documents(self, texts: Iterable[str]) -> List[Dict[str, List]]:
+        return [self.encode_document_tokens(tokens) for tokens in self.tokenizer.tokenize_batch(texts)]
+
+    def encode_query(self, text: str) -> Dict[str, List]:
+        return self.encode_query_tokens(self.tokenizer.tokenize_query(text))
+
+    def encode_query_tokens(self, tokens: Iterable[str]) -> Dict[str, List]:
+        weights: Dict[int, float] = {}
+        for token, count in Counter(tokens).items():
+            idx = token_id(token)
+            weights[idx] = weights.get(idx, 0.0) + float(count)
+        return _to_sparse(weights)
@@ -8,4 +8,7 @@ def setup_routes(app):
 
     @app.get("/health")
     async def health_check():
-        return {"status": "healthy"}
+        lag_monitor = getattr(app.state, "lag_monitor", None)
+        if lag_monitor is None:
+            return {"status": "healthy"}
+        return {"status": "healthy", "event_loop_lag": lag_monitor.stats()}
@@ -1,12 +1,20 @@
 from contextlib import asynccontextmanager
 from fastapi.applications import FastAPI
 
+from ohra.shared_kernel.infra.executor import EventLoopLagMonitor
+
 
 @asynccontextmanager
 async def lifespan(app: "FastAPI"):
+    # CPU 작업이 이벤트 루프를 막는지 확인할 수 있도록 lag 를 계속 측정한다
+    lag_monitor = EventLoopLagMonitor(warn_threshold=app.settings.event_loop_lag_warn_ms / 1000)
+    app.state.lag_monitor = lag_monitor
+    lag_monitor.start()
     try:
         yield
     except Exception as e:
         raise e
     finally:
-        ...
+        await lag_monitor.stop()
+        app.container.rag.cpu_executor().shutdown(wait=False)
+        app.container.rag.llm().shutdown(wait=False)
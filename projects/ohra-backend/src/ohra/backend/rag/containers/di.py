@@ -1,6 +1,15 @@
 from dependency_injector import containers, providers
 
+from ohra.shared_kernel.infra.executor import CPUExecutor
+from ohra.shared_kernel.infra.sagemaker import SageMakerLLMAdapter
 from ohra.backend.settings import Settings
+from ohra.backend.rag.retrieval.hybrid.service import build_search_service
+from ohra.backend.rag.retrieval.rerank.reranker import build_reranker
+from ohra.backend.rag.retrieval.router import build_query_router
+from ohra.backend.rag.service.v1.admission import build_admission_controller
+from ohra.backend.rag.service.v1.answer_cache import build_answer_cache
+from ohra.backend.rag.service.v1.response_cache import build_response_cache
+from ohra.backend.rag.service.v1.context import build_context_packer
 from ohra.backend.rag.service.v1.pipeline import LangchainRAGAnalyzer
 from ohra.backend.rag.use_case.chat_use_case import ChatCompletionUseCase
 from ohra.backend.rag.use_case.feedback_use_case import FeedbackUseCase
@@ -12,13 +21,67 @@ class RAGContainer(containers.DeclarativeContainer):
     embedding = providers.Dependency()
     vector_store = providers.Dependency()
 
-    analyzer = providers.Factory(
+    cpu_executor = providers.Singleton(
+        CPUExecutor,
+        max_workers=settings.provided.rag_analyzer.cpu_workers,
+        max_pending=settings.provided.rag_analyzer.cpu_max_pending,
+    )
+
+    search_service = providers.Singleton(
+        build_search_service,
+        config=settings.provided.rag_analyzer,
+        embedding=embedding,
+        vector_store=vector_store,
+        executor=cpu_executor,
+    )
+
+    reranker = providers.Singleton(build_reranker, config=settings.provided.rag_analyzer, executor=cpu_executor)
+
+    answer_cache = providers.Singleton(
+        build_answer_cache, config=settings.provided.rag_analyzer, vector_store=vector_store
+    )
+
+    # in-memory backend 도 worker process 안의 모든 요청이 공유한다
+    response_cache = providers.Singleton(build_response_cache, config=settings.provided.rag_analyzer)
+
+    router = providers.Singleton(build_query_router, config=settings.provided.rag_analyzer)
+
+    # tokenizer 는 process 당 한 번만 읽는다
+    context_packer = providers.Singleton(build_context_packer, config=settings.provided.rag_analyzer)
+
+    llm = providers.Singleton(
+        SageMakerLLMAdapter,
+        endpoint_name=settings.provided.rag_analyzer.endpoint_name,
+        region=settings.provided.rag_analyzer.region,
+        max_connections=settings.provided.rag_analyzer.llm_max_connections,
+    )
+
+    # LLM endpoint 앞의 동시 생성 수 / 대기열은 process 단위로 하나
+    admission = providers.Singleton(build_admission_controller, config=settings.provided.rag_analyzer)
+
+    # analyzer / use case 는 요청 상태를 갖지 않으므로 process 당 하나만 만든다
+    analyzer = providers.Singleton(
         LangchainRAGAnalyzer,
         config=settings.provided.rag_analyzer,
         embedding=embedding,
         vector_store=vector_store,
+        cpu_executor=cpu_executor,
+        search_service=search_service,
+        reranker=reranker,
+        answer_cache=answer_cache,
+        response_cache=response_cache,
+        router=router,
+        context_packer=context_packer,
+        llm=llm,
+        admission=admission,
     )
 
-    chat_completion_use_case = providers.Factory(ChatCompletionUseCase, analyzer=analyzer)
+    # 실행 중인 요청 목록(single-flight)을 모든 요청이 공유한다
+    chat_completion_use_case = providers.Singleton(
+        ChatCompletionUseCase,
+        analyzer=analyzer,
+        coalesce_enabled=settings.provided.rag_coalesce_enabled,
+        coalesce_max_temperature=settings.provided.rag_coalesce_max_temperature,
+    )
 
     feedback_use_case = providers.Singleton(FeedbackUseCase)
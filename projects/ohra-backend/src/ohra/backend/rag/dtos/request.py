@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional, Union
 
-from .schemas import ChatMessage
+from .schemas import ChatMessage, RetrievalOptions
 
 
 class ChatCompletionRequest(BaseModel):
@@ -11,6 +11,12 @@ class ChatCompletionRequest(BaseModel):
     max_tokens: Optional[int] = Field(default=2000, gt=0)
     stream: Optional[bool] = False
     user: Optional[str] = None
+    retrieval: Optional[RetrievalOptions] = None
+    # answer / response cache 사용 여부 (서버에서 켜져 있을 때만 적용, false 면 항상 새로 생성)
+    # true 면 temperature 가 0 이 아니어도 같은 프롬프트의 LLM 응답을 재사용한다 (내부 bot 등)
+    cache: Optional[bool] = None
+    # 동시에 들어온 같은 요청과 생성 결과를 공유할지 여부 (기본은 낮은 temperature 일 때만, false 면 항상 따로 생성)
+    coalesce: Optional[bool] = None
 
 
 class EmbeddingRequest(BaseModel):
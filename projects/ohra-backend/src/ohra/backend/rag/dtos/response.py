@@ -10,6 +10,17 @@ class ChatCompletionChoice(BaseModel):
     finish_reason: Optional[str] = None
 
 
+class RetrievalInfo(BaseModel):
+    search_mode: str
+    documents: int
+    dropped_branches: List[str] = []  # latency budget 초과로 결과 없이 취소된 검색 분기
+    reranked: bool = False
+    cached: bool = False  # answer cache / response cache 에서 가져온 응답
+    coalesced: bool = False  # 동시에 들어온 같은 요청의 생성 결과를 공유한 응답
+    context_tokens: Optional[int] = None  # 프롬프트에 넣은 검색 문서의 토큰 수
+    skipped: Optional[str] = None  # router 가 검색을 생략한 이유 (규칙 이름 / classifier)
+
+
 class ChatCompletionResponse(BaseModel):
     id: str
     object: str = "chat.completion"
@@ -17,6 +28,29 @@ class ChatCompletionResponse(BaseModel):
     model: str
     choices: List[ChatCompletionChoice]
     usage: Optional[Dict[str, Any]] = None
+    retrieval: Optional[RetrievalInfo] = None
+    timings: Optional[Dict[str, float]] = None  # 단계별 소요 시간 (ms, Server-Timing 헤더와 같은 값)
+
+
+class ChatCompletionDelta(BaseModel):
+    role: Optional[str] = None
+    content: Optional[str] = None
+
+
+class ChatCompletionChunkChoice(BaseModel):
+    index: int
+    delta: ChatCompletionDelta
+    finish_reason: Optional[str] = None
+
+
+class ChatCompletionChunk(BaseModel):
+    id: str
+    object: str = "chat.completion.chunk"
+    created: int
+    model: str
+    choices: List[ChatCompletionChunkChoice]
+    usage: Optional[Dict[str, Any]] = None  # 마지막 chunk 에만 있음
+    retrieval: Optional[RetrievalInfo] = None  # 첫 chunk 에만 있음
 
 
 class EmbeddingData(BaseModel):
@@ -1,5 +1,7 @@
-from pydantic import BaseModel
-from typing import Literal
+from pydantic import BaseModel, Field, field_validator
+from typing import Dict, Literal, Optional, Union
+
+from ohra.shared_kernel.infra.bm25 import KEYWORD_FILTER_FIELDS
 
 
 class ChatMessage(BaseModel):
@@ -7,6 +9,29 @@ class ChatMessage(BaseModel):
     content: str
 
 
+class RetrievalOptions(BaseModel):
+    """요청 단위 검색 옵션. 지정하지 않은 값은 서버 설정을 따른다.
+
+    옵션을 지정한 요청은 query router 를 거치지 않고 항상 검색한다.
+    """
+
+    search_mode: Optional[Literal["vector", "keyword", "hybrid"]] = None
+    top_k: Optional[int] = Field(default=None, ge=1, le=50)
+    # 검색 분기별 latency budget(ms). 넘긴 분기는 버리고 도착한 결과만 사용한다
+    budget_ms: Optional[float] = Field(default=None, gt=0, le=30000)
+    # cross-encoder rerank 사용 여부 (서버에 reranker 가 설정된 경우에만 적용, 기본은 사용)
+    rerank: Optional[bool] = None
+    # payload 필드 일치 조건 (예: {"space_key": "DEV"}). keyword 인덱스가 인코딩하는 필드만 허용한다
+    filter: Dict[str, Union[str, int, bool]] = Field(default_factory=dict)
+
+    @field_validator("filter")
+    def filter_validator(cls, v: Dict[str, Union[str, int, bool]]) -> Dict[str, Union[str, int, bool]]:
+        unknown = sorted(set(v) - set(KEYWORD_FILTER_FIELDS))
+        if unknown:
+            raise ValueError(f"Unsupported filter fields: {unknown} (allowed: {list(KEYWORD_FILTER_FIELDS)})")
+        return v
+
+
 class ModelInfo(BaseModel):
     id: str
     object: str = "model"
@@ -25,6 +25,16 @@ class InvalidMessageRoleException(RAGException):
     code: int = 400
 
 
+class TooManyRequestsException(RAGException):
+    error: str = "TooManyRequests"
+    message: str = "LLM endpoint is busy. Retry later."
+    code: int = 429
+
+    def __init__(self, retry_after: int):
+        super().__init__(self.message)
+        self.headers = {"Retry-After": str(retry_after)}
+
+
 class EmbeddingException(BaseMsgException):
     error: str = "EmbeddingError"
     message: str = "Embedding processing failed."
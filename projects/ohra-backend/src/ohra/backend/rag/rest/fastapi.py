@@ -1,15 +1,26 @@
+import json
+import logging
+from typing import AsyncGenerator, AsyncIterator, Optional, Union
+
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends, Body, status
+from fastapi import APIRouter, Depends, Body, Response, status
+from fastapi.responses import StreamingResponse
 
 from ohra.backend.container import OhraContainer
 from ohra.backend.rag.use_case.chat_use_case import ChatCompletionUseCase
 from ohra.backend.rag.use_case.feedback_use_case import FeedbackUseCase
+from ohra.backend.rag.retrieval.hybrid.service import HybridSearchService
+from ohra.backend.rag.retrieval.router import QueryRouter
+from ohra.backend.rag.service.v1.admission import AdmissionController
+from ohra.backend.rag.service.v1.answer_cache import SemanticAnswerCache
+from ohra.backend.rag.service.v1.response_cache import LLMResponseCache
 from ohra.backend.rag.dtos.request import (
     ChatCompletionRequest,
     EmbeddingRequest,
     FeedbackRequest,
 )
 from ohra.backend.rag.dtos.response import (
+    ChatCompletionChunk,
     ChatCompletionResponse,
     EmbeddingResponse,
     EmbeddingData,
@@ -18,13 +29,21 @@ from ohra.backend.rag.dtos.response import (
 from ohra.backend.rag.dtos.schemas import ModelInfo
 from ohra.backend.auth.dependencies import get_current_user_id
 from ohra.shared_kernel.infra.sagemaker import SageMakerEmbeddingAdapter
+from ohra.shared_kernel.infra.timing import start_timings
 from ohra.backend.rag import exceptions
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/v1", tags=["rag"])
 
 get_chat_use_case = Provide[OhraContainer.rag.chat_completion_use_case]
 get_feedback_use_case = Provide[OhraContainer.rag.feedback_use_case]
 get_embedding = Provide[OhraContainer.embedding]
+get_search_service = Provide[OhraContainer.rag.search_service]
+get_answer_cache = Provide[OhraContainer.rag.answer_cache]
+get_response_cache = Provide[OhraContainer.rag.response_cache]
+get_query_router = Provide[OhraContainer.rag.router]
+get_admission = Provide[OhraContainer.rag.admission]
 
 
 @router.get("/models", response_model=ModelsResponse)
@@ -38,6 +57,29 @@ async def list_models() -> ModelsResponse:
     )
 
 
+@router.get("/stats")
+@inject
+async def get_stats(
+    *,
+    search_service: HybridSearchService = Depends(get_search_service),
+    answer_cache: Optional[SemanticAnswerCache] = Depends(get_answer_cache),
+    response_cache: Optional[LLMResponseCache] = Depends(get_response_cache),
+    query_router: Optional[QueryRouter] = Depends(get_query_router),
+    admission: Optional[AdmissionController] = Depends(get_admission),
+    chat_use_case: ChatCompletionUseCase = Depends(get_chat_use_case),
+    user_id: str = Depends(get_current_user_id),
+):
+    # process(uvicorn worker) 단위 통계. 꺼져 있는 cache 는 None
+    return {
+        "retrieval_cache": search_service.cache.stats() if search_service.cache else None,
+        "answer_cache": answer_cache.stats() if answer_cache else None,
+        "response_cache": response_cache.stats() if response_cache else None,
+        "router": query_router.stats() if query_router else None,
+        "single_flight": chat_use_case.single_flight.stats(),
+        "admission": admission.stats() if admission else None,
+    }
+
+
 @router.post("/chat/completions", response_model=ChatCompletionResponse)
 @inject
 async def chat_completion(
@@ -45,8 +87,43 @@ async def chat_completion(
     use_case: ChatCompletionUseCase = Depends(get_chat_use_case),
     user_id: str = Depends(get_current_user_id),
     payload: ChatCompletionRequest = Body(),
-) -> ChatCompletionResponse:
-    return await use_case.execute(user_id=user_id, request=payload)
+    response: Response,
+) -> Union[ChatCompletionResponse, StreamingResponse]:
+    timings = start_timings()
+    if not (payload.stream and use_case.analyzer.config.stream):
+        result = await use_case.execute(user_id=user_id, request=payload)
+        response.headers["Server-Timing"] = timings.server_timing()
+        return result
+
+    chunks = use_case.stream(user_id=user_id, request=payload)
+    # 검색/endpoint 호출 오류는 첫 chunk 전에 나므로 SSE 를 열기 전에 일반 오류 응답으로 돌려준다
+    first = await anext(chunks, None)
+    if first is None:
+        raise exceptions.EmptyResponseException()
+    # 헤더는 첫 chunk 와 함께 나가므로 첫 토큰까지의 단계만 담긴다
+    return StreamingResponse(
+        _server_sent_events(first, chunks),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "Server-Timing": timings.server_timing()},
+    )
+
+
+async def _server_sent_events(
+    first: ChatCompletionChunk, chunks: AsyncGenerator[ChatCompletionChunk, None]
+) -> AsyncIterator[str]:
+    try:
+        yield f"data: {first.model_dump_json(exclude_none=True)}\n\n"
+        try:
+            async for chunk in chunks:
+                yield f"data: {chunk.model_dump_json(exclude_none=True)}\n\n"
+        except Exception as e:
+            # 이미 200 으로 스트림을 열었으므로 OpenAI 스트림과 같은 error 이벤트로 알린다
+            logger.error(f"Chat completion stream failed: {e}")
+            yield f"data: {json.dumps({'error': {'message': str(e), 'type': type(e).__name__}})}\n\n"
+        yield "data: [DONE]\n\n"
+    finally:
+        # 클라이언트가 끊겨 이 generator 가 버려져도 admission slot, endpoint 스트림을 GC 전에 바로 정리한다
+        await chunks.aclose()
 
 
 @router.post("/feedback", status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,98 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+import logging
+import time
+import unicodedata
+
+from ohra.shared_kernel.infra.executor import SingleFlight
+from ohra.shared_kernel.infra.qdrant import SYNC_GENERATION_KEY, QdrantAdapter
+from ohra.backend.rag.service.v1.schema import RetrievedDocument
+
+logger = logging.getLogger(__name__)
+
+
+def collection_generation(
+    vector_store: QdrantAdapter, refresh_seconds: float = 5.0
+) -> Callable[[], Awaitable[Optional[int]]]:
+    """sync worker 가 동기화를 마칠 때마다 collection metadata 에 올리는 generation 을 읽는다.
+
+    검색마다 Qdrant 를 부르지 않도록 ``refresh_seconds`` 동안은 마지막 값을 쓰고, 만료 뒤 동시에 들어온 요청은
+    조회 하나를 함께 기다린다. 조회에 실패하면 generation 을 모르는 것으로 보고 캐시하지 않는다.
+    """
+    flight = SingleFlight()
+    value: Optional[int] = None
+    expires_at = 0.0
+
+    async def fetch() -> Optional[int]:
+        nonlocal value, expires_at
+        try:
+            metadata = await vector_store.get_collection_metadata()
+            value = metadata.get(SYNC_GENERATION_KEY)
+        except Exception as e:
+            logger.warning(f"Failed to read sync generation: {e}")
+            value = None
+        expires_at = time.monotonic() + refresh_seconds
+        return value
+
+    async def generation() -> Optional[int]:
+        if time.monotonic() < expires_at:
+            return value
+        result, _ = await flight.do("generation", fetch)
+        return result
+
+    return generation
+
+
+@dataclass
+class RetrievalCache:
+    """검색 결과 LRU cache.
+
+    항목은 저장 시점의 sync generation 으로 태그된다. TTL 없이 sync worker 가 새 generation 을 게시할 때까지 유효하고,
+    generation 을 알 수 없으면(아직 게시된 generation 이 없으면) 캐시하지 않는다.
+    """
+
+    generation: Callable[[], Awaitable[Optional[int]]] = field(repr=False)
+    max_size: int = 1024
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    _generation: Optional[int] = field(default=None, init=False)
+    _entries: "OrderedDict[Hashable, List[RetrievedDocument]]" = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+
+    @staticmethod
+    def key(query: str, filter: Optional[Dict[str, Any]], top_k: int, search_mode: str) -> Hashable:
+        # 대소문자, 공백, 유니코드 정규화 차이만 있는 질의는 같은 항목을 쓴다
+        normalized = " ".join(unicodedata.normalize("NFC", query).lower().split())
+        return normalized, tuple(sorted((filter or {}).items())), top_k, search_mode
+
+    async def current_generation(self) -> Optional[int]:
+        generation = await self.generation()
+        if generation != self._generation:
+            # 이전 generation 항목은 다시 쓰일 일이 없으므로 한 번에 비운다
+            self._entries.clear()
+            self._generation = generation
+        return generation
+
+    def get(self, key: Hashable, generation: Optional[int]) -> Optional[List[RetrievedDocument]]:
+        documents = self._entries.get(key) if generation is not None and generation == self._generation else None
+        if documents is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return list(documents)
+
+    async def put(self, key: Hashable, generation: Optional[int], documents: List[RetrievedDocument]) -> None:
+        # 검색 도중 새 generation 이 게시됐다면 이전 데이터로 만든 결과이므로 저장하지 않는다.
+        # 다른 요청이 아직 generation 을 확인하지 않았을 수 있으니 generation 을 다시 본다
+        if generation is None or generation != await self.current_generation():
+            return
+        self._entries[key] = list(documents)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"generation": self._generation, "size": len(self._entries), "hits": self.hits, "misses": self.misses}
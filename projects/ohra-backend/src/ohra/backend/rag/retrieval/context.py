@@ -0,0 +1,52 @@
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+from dataclasses import dataclass, field
+import asyncio
+
+from ohra.shared_kernel.infra.executor import CPUExecutor
+from ohra.shared_kernel.infra.sagemaker import SageMakerEmbeddingAdapter
+from ohra.shared_kernel.infra.timing import stage
+from ohra.shared_kernel.infra.tokenizer import BM25SparseEncoder, Tokenizer
+
+
+@dataclass
+class RetrievalContext:
+    """한 요청의 검색 분기들이 공유하는 질의 표현.
+
+    query embedding, 토큰, sparse 벡터는 처음 요청한 분기가 한 번만 계산하고 나머지 분기는 같은 결과를 기다린다.
+    latency budget 을 넘겨 결과 없이 취소된 분기는 ``dropped_branches`` 에 남는다.
+    """
+
+    query: str
+    embedding: Optional[SageMakerEmbeddingAdapter] = field(default=None, repr=False)
+    executor: CPUExecutor = field(default_factory=lambda: CPUExecutor(max_workers=0), repr=False)
+    dropped_branches: List[str] = field(default_factory=list, init=False)
+    _tasks: Dict[Hashable, asyncio.Future] = field(default_factory=dict, init=False, repr=False)
+
+    def _once(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Awaitable[Any]:
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(compute())
+        # 한 분기가 취소돼도 다른 분기가 기다리는 계산은 계속되도록 한다
+        return asyncio.shield(task)
+
+    async def query_vector(self) -> List[float]:
+        if self.embedding is None:
+            raise ValueError("RetrievalContext has no embedding adapter")
+
+        async def compute():
+            with stage("embedding"):
+                return await self.embedding.embed_text(self.query)
+
+        return await self._once("embedding", compute)
+
+    async def tokens(self, tokenizer: Tokenizer) -> Tuple[str, ...]:
+        return await self._once(
+            ("tokens", tokenizer.name), lambda: self.executor.run(tokenizer.tokenize_query, self.query)
+        )
+
+    async def sparse_vector(self, encoder: BM25SparseEncoder) -> Dict[str, List]:
+        async def compute():
+            tokens = await self.tokens(encoder.tokenizer)
+            return await self.executor.run(encoder.encode_query_tokens, tokens)
+
+        return await self._once(("sparse", encoder.version), compute)
@@ -1,68 +1,81 @@
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
-from collections import Counter
+from typing import List, Dict, Any, Optional, Sequence
+from dataclasses import dataclass, field
+from collections import defaultdict
+import asyncio
 
+from ohra.shared_kernel.infra.executor import CPUExecutor
 from ohra.shared_kernel.infra.qdrant import QdrantAdapter
 from ohra.shared_kernel.infra.sagemaker import SageMakerEmbeddingAdapter
+from ohra.shared_kernel.infra.timing import stage
+from ohra.shared_kernel.infra.tokenizer import BM25SparseEncoder
+from ohra.backend.rag.retrieval.context import RetrievalContext
 from ohra.backend.rag.service.v1.schema import RetrievedDocument
 
 
-def _tokenize_korean_for_sparse(text: str) -> List[str]:
-    tokens = []
-    words = text.lower().split()
+def reciprocal_rank_fusion(
+    rankings: Sequence[List[RetrievedDocument]], top_k: int, k: int = 60
+) -> List[RetrievedDocument]:
+    """여러 검색 결과를 순위만으로 합친다. 같은 문서가 여러 목록에 있으면 처음 나온 metadata 를 쓴다."""
+    rrf_scores = defaultdict(float)
+    doc_map: Dict[Any, RetrievedDocument] = {}
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking, 1):
+            rrf_scores[doc.id] += 1.0 / (k + rank)
+            doc_map.setdefault(doc.id, doc)
 
-    for word in words:
-        tokens.append(word)
-        if len(word) >= 2:
-            for i in range(len(word) - 1):
-                if i + 2 <= len(word):
-                    tokens.append(word[i : i + 2])
-                if i + 3 <= len(word):
-                    tokens.append(word[i : i + 3])
-
-    return tokens
+    fused = [RetrievedDocument(id=i, score=score, metadata=doc_map[i].metadata) for i, score in rrf_scores.items()]
+    return sorted(fused, key=lambda x: x.score, reverse=True)[:top_k]
 
 
 @dataclass
 class HybridRetriever:
+    """Qdrant dense / sparse 벡터를 각각 검색해 RRF 로 합친다.
+
+    Qdrant 에는 ``query_points`` 를 두 번 보내고 결합은 여기서 하므로 단계를 ``dense_search`` / ``sparse_search`` /
+    ``fusion`` 으로 나눠 측정한다.
+    """
+
     vector_store: QdrantAdapter
     embedding: SageMakerEmbeddingAdapter
     rrf_k: int = 60  # RRF constant default 60
+    sparse_encoder: BM25SparseEncoder = field(default_factory=BM25SparseEncoder)
+    executor: CPUExecutor = field(default_factory=lambda: CPUExecutor(max_workers=0))
 
-    def _calculate_query_sparse_vector(self, query: str) -> Dict[str, List[int]]:
-        tokens = _tokenize_korean_for_sparse(query)
-        if not tokens:
-            return {"indices": [], "values": []}
-
-        token_counts = Counter(tokens)
-        total_tokens = len(tokens)
-
-        indices = []
-        values = []
+    async def dense_search(
+        self, query_vector: List[float], top_k: int, filter: Optional[Dict[str, Any]] = None
+    ) -> List[RetrievedDocument]:
+        with stage("dense_search"):
+            results = await self.vector_store.search(query_vector=query_vector, top_k=top_k, filter=filter)
+        return [RetrievedDocument(**result) for result in results]
 
-        for token, count in token_counts.items():
-            token_id = hash(token) % (2**31)
-            score = count / total_tokens
-            indices.append(token_id)
-            values.append(float(score))
+    async def sparse_search(
+        self, context: RetrievalContext, top_k: int, filter: Optional[Dict[str, Any]] = None
+    ) -> List[RetrievedDocument]:
+        with stage("sparse_search"):
+            query_sparse_vector = await context.sparse_vector(self.sparse_encoder)
+            results = await self.vector_store.search_sparse(
+                query_sparse_vector=query_sparse_vector, top_k=top_k, filter=filter
+            )
+        return [RetrievedDocument(**result) for result in results]
 
-        return {"indices": indices, "values": values}
+    def fuse(
+        self, dense: List[RetrievedDocument], sparse: List[RetrievedDocument], top_k: int
+    ) -> List[RetrievedDocument]:
+        with stage("fusion"):
+            return reciprocal_rank_fusion([dense, sparse], top_k, k=self.rrf_k)
 
     async def retrieve(
         self,
         query: str,
         top_k: int = 5,
         filter: Optional[Dict[str, Any]] = None,
+        context: Optional[RetrievalContext] = None,
     ) -> List[RetrievedDocument]:
-        query_vector = await self.embedding.embed_text(query)
-        query_sparse_vector = self._calculate_query_sparse_vector(query)
-        results = await self.vector_store.search(
-            query_vector=query_vector,
-            top_k=top_k,
-            filter=filter,
-            query_sparse_vector=query_sparse_vector,
-            fusion="rrf",
-            rrf_k=self.rrf_k,
-        )
-        documents = [RetrievedDocument(**result) for result in results]
-        return documents
+        context = context or RetrievalContext(query, embedding=self.embedding, executor=self.executor)
+
+        async def dense() -> List[RetrievedDocument]:
+            return await self.dense_search(await context.query_vector(), top_k * 2, filter)
+
+        # 각 목록은 top_k 의 두 배까지 받아 결합한다 (QdrantAdapter.search 의 hybrid 경로와 같은 후보 수)
+        dense_results, sparse_results = await asyncio.gather(dense(), self.sparse_search(context, top_k * 2, filter))
+        return self.fuse(dense_results, sparse_results, top_k)
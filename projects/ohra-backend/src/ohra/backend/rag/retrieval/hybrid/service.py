@@ -1,18 +1,41 @@
-from typing import List, Dict, Any, Optional
+from typing import Awaitable, List, Dict, Any, Optional, Union
 from dataclasses import dataclass, field
-from collections import defaultdict
 import asyncio
+import logging
 
+from ohra.shared_kernel.infra.executor import CPUExecutor
+from ohra.shared_kernel.infra.qdrant import QdrantAdapter
+from ohra.shared_kernel.infra.sagemaker import SageMakerEmbeddingAdapter
+from ohra.shared_kernel.infra.timing import stage
+from ohra.shared_kernel.infra.tokenizer import BM25SparseEncoder, get_tokenizer
 from ohra.backend.rag.retrieval.vector.retriever import VectorRetriever
 from ohra.backend.rag.retrieval.keyword.retriever import BM25Retriever
+from ohra.backend.rag.retrieval.sparse.retriever import SparseRetriever
+from ohra.backend.rag.retrieval.hybrid.retriever import HybridRetriever, reciprocal_rank_fusion
+from ohra.backend.rag.retrieval.cache import RetrievalCache, collection_generation
+from ohra.backend.rag.retrieval.context import RetrievalContext
 from ohra.backend.rag.service.v1.schema import RetrievedDocument
+from ohra.backend.rag.service.v1.settings import LangchainRAGAnalyzerConfig
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
 class HybridSearchService:
     vector_retriever: VectorRetriever
-    keyword_retriever: BM25Retriever
+    keyword_retriever: Union[BM25Retriever, SparseRetriever]
     rrf_k: int = field(default=60)
+    # 있으면 hybrid 모드의 keyword 쪽을 Qdrant sparse 검색으로 처리한다 (dense / sparse query 두 번 + RRF)
+    hybrid_retriever: Optional[HybridRetriever] = field(default=None)
+    executor: CPUExecutor = field(default_factory=lambda: CPUExecutor(max_workers=0))
+    # 검색 분기별 latency budget. 넘긴 분기는 취소하고 도착한 결과만으로 결합한다 (None 이면 제한 없음)
+    # hybrid_retriever 를 쓰면 dense(query embedding + Qdrant query) / sparse 에 각각 적용한다
+    budget_ms: Optional[float] = field(default=None)
+    # 같은 질의/필터/top_k/모드의 결과를 index generation 이 바뀔 때까지 재사용한다
+    cache: Optional[RetrievalCache] = field(default=None)
+
+    def create_context(self, query: str) -> RetrievalContext:
+        return RetrievalContext(query, embedding=self.vector_retriever.embedding, executor=self.executor)
 
     async def search(
         self,
@@ -20,46 +43,134 @@ class HybridSearchService:
         top_k: int = 5,
         filter: Optional[Dict[str, Any]] = None,
         search_mode: str = "hybrid",
+        context: Optional[RetrievalContext] = None,
+        budget_ms: Optional[float] = None,
     ) -> List[RetrievedDocument]:
+        # 모든 분기가 같은 context 를 받아 query embedding / 토큰 / sparse 벡터를 한 번만 계산한다
+        context = context or self.create_context(query)
+        budget_ms = self.budget_ms if budget_ms is None else budget_ms
         search_methods = {
-            "vector": lambda: self.vector_retriever.retrieve(query, top_k, filter),
-            "keyword": lambda: self.keyword_retriever.retrieve(query, top_k, filter),
-            "hybrid": lambda: self._hybrid_search(query, top_k, filter),
+            "vector": lambda: self._branch(
+                "vector", self.vector_retriever.retrieve(query, top_k, filter, context=context), budget_ms, context
+            ),
+            "keyword": lambda: self._branch(
+                "keyword", self.keyword_retriever.retrieve(query, top_k, filter, context=context), budget_ms, context
+            ),
+            "hybrid": lambda: self._hybrid_search(query, top_k, filter, context, budget_ms),
         }
 
         if search_mode not in search_methods:
             raise ValueError(f"Invalid search_mode: {search_mode}. Must be 'vector', 'keyword', or 'hybrid'")
 
-        return await search_methods[search_mode]()
+        cache_key = generation = None
+        if self.cache is not None:
+            cache_key = RetrievalCache.key(query, filter, top_k, search_mode)
+            generation = await self.cache.current_generation()
+            if (documents := self.cache.get(cache_key, generation)) is not None:
+                return documents
+
+        documents = await search_methods[search_mode]()
+        # budget 초과로 일부 분기가 빠진 결과는 캐시하지 않는다
+        if cache_key is not None and not context.dropped_branches:
+            await self.cache.put(cache_key, generation, documents)
+        return documents
+
+    async def _branch(
+        self,
+        name: str,
+        search: Awaitable[List[RetrievedDocument]],
+        budget_ms: Optional[float],
+        context: RetrievalContext,
+    ) -> List[RetrievedDocument]:
+        if budget_ms is None:
+            return await search
+        try:
+            return await asyncio.wait_for(search, budget_ms / 1000)
+        except asyncio.TimeoutError:
+            logger.warning(f"Retrieval branch '{name}' exceeded its {budget_ms:.0f}ms budget and was dropped")
+            context.dropped_branches.append(name)
+            return []
 
     async def _hybrid_search(
         self,
         query: str,
         top_k: int,
         filter: Optional[Dict[str, Any]],
+        context: RetrievalContext,
+        budget_ms: Optional[float] = None,
     ) -> List[RetrievedDocument]:
+        if self.hybrid_retriever is not None:
+            hybrid = self.hybrid_retriever
+
+            async def dense() -> List[RetrievedDocument]:
+                return await hybrid.dense_search(await context.query_vector(), top_k * 2, filter)
+
+            # dense(query embedding 포함) / sparse 마다 따로 budget 을 두고 시간 안에 도착한 쪽만 결합한다
+            dense_results, sparse_results = await asyncio.gather(
+                self._branch("dense", dense(), budget_ms, context),
+                self._branch("sparse", hybrid.sparse_search(context, top_k * 2, filter), budget_ms, context),
+            )
+            return hybrid.fuse(dense_results, sparse_results, top_k)
+
         vector_results, keyword_results = await asyncio.gather(
-            self.vector_retriever.retrieve(query, top_k * 2, filter),
-            self.keyword_retriever.retrieve(query, top_k * 2, filter),
+            self._branch(
+                "vector", self.vector_retriever.retrieve(query, top_k * 2, filter, context=context), budget_ms, context
+            ),
+            self._branch(
+                "keyword",
+                self.keyword_retriever.retrieve(query, top_k * 2, filter, context=context),
+                budget_ms,
+                context,
+            ),
         )
 
-        rrf_scores = defaultdict(float)
+        with stage("fusion"):
+            return reciprocal_rank_fusion([vector_results, keyword_results], top_k, k=self.rrf_k)
+
 
-        for rank, doc in enumerate(vector_results, 1):
-            rrf_scores[doc.id] += 1.0 / (self.rrf_k + rank)
+def build_search_service(
+    config: LangchainRAGAnalyzerConfig,
+    embedding: SageMakerEmbeddingAdapter,
+    vector_store: QdrantAdapter,
+    executor: Optional[CPUExecutor] = None,
+) -> HybridSearchService:
+    """설정에 맞춰 vector / keyword / hybrid retriever 를 묶는다.
 
-        for rank, doc in enumerate(keyword_results, 1):
-            rrf_scores[doc.id] += 1.0 / (self.rrf_k + rank)
+    BM25 인덱스 같은 상태를 들고 있으므로 process 당 하나만 만들어 요청 간에 공유한다.
+    """
+    executor = executor or CPUExecutor(max_workers=0)
+    tokenizer = get_tokenizer(config.sparse_tokenizer)
+    sparse_encoder = BM25SparseEncoder(tokenizer=tokenizer)
 
-        doc_map = {doc.id: doc for doc in [*vector_results, *keyword_results]}
+    if config.keyword_retriever == "bm25":
+        keyword_retriever = BM25Retriever(
+            vector_store=vector_store, tokenizer=tokenizer, index_dir=config.keyword_index_dir, executor=executor
+        )
+    else:
+        keyword_retriever = SparseRetriever(vector_store=vector_store, sparse_encoder=sparse_encoder, executor=executor)
+
+    # 결과 cache 는 sync worker 가 동기화마다 collection metadata 에 올리는 generation 으로 무효화한다
+    cache = None
+    if config.retrieval_cache_size > 0:
+        cache = RetrievalCache(generation=collection_generation(vector_store), max_size=config.retrieval_cache_size)
 
-        combined = sorted(
-            [
-                RetrievedDocument(id=doc_id, score=score, metadata=doc_map[doc_id].metadata)
-                for doc_id, score in rrf_scores.items()
-            ],
-            key=lambda x: x.score,
-            reverse=True,
-        )[:top_k]
+    # Qdrant dense / sparse 결합은 sparse 검색기일 때만 쓴다. bm25 면 hybrid 도 dense 결과를 BM25 결과와 합친다
+    hybrid_retriever = None
+    if config.keyword_retriever == "sparse":
+        hybrid_retriever = HybridRetriever(
+            vector_store=vector_store,
+            embedding=embedding,
+            rrf_k=config.rrf_k,
+            sparse_encoder=sparse_encoder,
+            executor=executor,
+        )
 
-        return combined
+    return HybridSearchService(
+        vector_retriever=VectorRetriever(vector_store=vector_store, embedding=embedding),
+        keyword_retriever=keyword_retriever,
+        rrf_k=config.rrf_k,
+        executor=executor,
+        budget_ms=config.retrieval_budget_ms,
+        cache=cache,
+        hybrid_retriever=hybrid_retriever,
+    )
@@ -1,82 +1,282 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Union
 from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+import asyncio
 import logging
+import threading
+import time
 
-from rank_bm25 import BM25Okapi
+import numpy as np
+
+from ohra.shared_kernel.infra.bm25 import (
+    KEYWORD_FILTER_FIELDS,
+    BM25Index,
+    SegmentedBM25Index,
+    SnapshotLock,
+    load_snapshot,
+    publish_snapshot,
+    read_manifest,
+)
+from ohra.shared_kernel.infra.executor import CPUExecutor
 from ohra.shared_kernel.infra.qdrant import QdrantAdapter
+from ohra.shared_kernel.infra.timing import stage
+from ohra.shared_kernel.infra.tokenizer import NGramTokenizer, Tokenizer
+from ohra.backend.rag.retrieval.context import RetrievalContext
 from ohra.backend.rag.service.v1.schema import RetrievedDocument
 
 logger = logging.getLogger(__name__)
 
 
-def _tokenize_korean(text: str) -> List[str]:
-    # 단순 단어
-    tokens = []
-    words = text.lower().split()
+@dataclass
+class BM25Retriever:
+    """인메모리 BM25 keyword 검색.
 
-    for word in words:
-        tokens.append(word)
-        if len(word) >= 2:
-            for i in range(len(word) - 1):
-                if i + 2 <= len(word):
-                    tokens.append(word[i : i + 2])
-                if i + 3 <= len(word):
-                    tokens.append(word[i : i + 3])
+    인덱스에는 point id, 필터 필드 code, term 통계만 두고 payload(content, title, url 등)는
+    top_k 결과에 대해서만 Qdrant 에서 한 번에 가져온다.
+    토큰화, 색인, 점수 계산은 ``executor`` 에서 실행해 이벤트 루프를 막지 않는다.
+    ``index_dir`` 가 있으면 호스트의 uvicorn worker 들이 같은 snapshot 을 mmap 으로 공유하고,
+    각 process 는 snapshot 이후 변경분(delta)만 힙에 둔다.
+    주기적인 변경분 반영은 background task 하나가 맡고, 검색은 그동안 현재 인덱스로 바로 응답한다.
+    """
 
-    return tokens
+    vector_store: QdrantAdapter
+    tokenizer: Tokenizer = field(default_factory=NGramTokenizer)
+    refresh_interval_seconds: float = 60.0
+    # worker 의 indexed_at 은 upsert 직전에 찍히므로 polling 구간을 겹쳐 늦게 도착한 point 를 놓치지 않는다
+    change_feed_overlap_seconds: float = 300.0
+    # sync worker 가 게시하는 BM25 snapshot 디렉터리. 있으면 전체 scroll 대신 mmap 으로 읽는다
+    index_dir: Optional[str] = None
+    filter_fields: Tuple[str, ...] = KEYWORD_FILTER_FIELDS
+    executor: CPUExecutor = field(default_factory=lambda: CPUExecutor(max_workers=0))
 
+    _bm25_index: Optional[Union[BM25Index, SegmentedBM25Index]] = field(default=None, init=False, repr=False)
+    _generation: int = field(default=0, init=False, repr=False)
+    _watermark: Optional[datetime] = field(default=None, init=False, repr=False)
+    _last_refresh: float = field(default=0.0, init=False, repr=False)
+    _lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False, repr=False)
+    # 진행 중인 refresh. 동시에 들어온 요청은 같은 task 를 공유해 같은 변경분을 한 번만 가져온다
+    _refresh_task: Optional[asyncio.Task] = field(default=None, init=False, repr=False)
+    # executor thread 의 검색과 변경 반영이 같은 인덱스를 동시에 건드리지 않도록 한다
+    _index_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
 
-@dataclass
-class BM25Retriever:
-    vector_store: QdrantAdapter
-    _bm25_index: Optional[BM25Okapi] = field(default=None, init=False, repr=False)
-    _documents: List[Dict[str, Any]] = field(default_factory=list, init=False, repr=False)
+    @property
+    def _index_payload(self) -> List[str]:
+        return ["content", *self.filter_fields]
 
     async def _build_index(self) -> None:
         if self._bm25_index is not None:
             return
 
-        logger.info("Building BM25 index from Qdrant documents...")
-        all_docs = await self.vector_store.get_all_by_filter(filter={}, batch_size=1000)
+        async with self._lock:
+            if self._bm25_index is not None:
+                return
 
-        if not all_docs:
-            logger.warning("No documents found in Qdrant for BM25 indexing")
-            self._documents = []
-            self._bm25_index = BM25Okapi([[]])
-            return
+            if await self._load_snapshot() or await self._build_shared_snapshot():
+                return
+
+            logger.info("Building BM25 index from Qdrant documents...")
+            started_at = datetime.now(timezone.utc)
+            all_docs = await self.vector_store.get_all_by_filter(
+                filter={}, batch_size=1000, with_payload=self._index_payload
+            )
+
+            index = BM25Index(fields=self.filter_fields)
+            if not all_docs:
+                logger.warning("No documents found in Qdrant for BM25 indexing")
+            await self.executor.run(self._index_documents, index, all_docs)
+            self._bm25_index = index
+            self._watermark = started_at
+            self._last_refresh = time.monotonic()
+            logger.info(f"BM25 index built with {len(self._bm25_index)} documents")
+
+    async def _load_snapshot(self) -> bool:
+        if not self.index_dir:
+            return False
+        try:
+            snapshot = await asyncio.to_thread(load_snapshot, self.index_dir)
+        except Exception as e:
+            logger.warning(f"Failed to load BM25 snapshot from {self.index_dir}: {e}")
+            return False
+        if snapshot is None:
+            return False
+        if snapshot.tokenizer != self.tokenizer.name:
+            logger.warning(
+                f"Ignoring BM25 snapshot built with tokenizer '{snapshot.tokenizer}' (expected '{self.tokenizer.name}')"
+            )
+            return False
+
+        # snapshot 이후 색인된 point 는 change feed 로 delta 에 반영한다
+        watermark = datetime.fromisoformat(snapshot.indexed_at) if snapshot.indexed_at else datetime.now(timezone.utc)
+        started_at = datetime.now(timezone.utc)
+        since = watermark - timedelta(seconds=self.change_feed_overlap_seconds)
+        changed = await self.vector_store.get_all_modified_since(
+            since=since, field="indexed_at", with_payload=self._index_payload
+        )
+
+        index = SegmentedBM25Index(snapshot)
+        await self.executor.run(self._apply_changes, index, changed)
+        self._bm25_index = index
+        self._generation = snapshot.generation
+        self._watermark = started_at
+        self._last_refresh = time.monotonic()
+        logger.info(
+            f"BM25 snapshot generation {snapshot.generation} loaded with {len(snapshot)} documents "
+            f"(+{len(changed)} changed since snapshot)"
+        )
+        return True
+
+    async def _build_shared_snapshot(self) -> bool:
+        """게시된 snapshot 이 없으면 lock 을 먼저 잡은 process 만 Qdrant 를 scroll 해 게시한다.
+
+        나머지 process 는 lock 이 풀릴 때까지 기다렸다가 같은 snapshot 을 mmap 으로 읽는다.
+        """
+        if not self.index_dir:
+            return False
+        try:
+            async with SnapshotLock(self.index_dir):
+                if await asyncio.to_thread(read_manifest, self.index_dir) is None:
+                    logger.info(f"Building shared BM25 snapshot in {self.index_dir}...")
+                    started_at = datetime.now(timezone.utc)
+                    all_docs = await self.vector_store.get_all_by_filter(
+                        filter={}, batch_size=1000, with_payload=self._index_payload
+                    )
+                    index = BM25Index(fields=self.filter_fields)
+                    await self.executor.run(self._index_documents, index, all_docs)
+                    await self.executor.run(
+                        publish_snapshot,
+                        self.index_dir,
+                        index,
+                        tokenizer=self.tokenizer.name,
+                        indexed_at=started_at.isoformat(),
+                    )
+        except OSError as e:
+            # 읽기 전용 mount 등으로 게시할 수 없으면 process 별 인덱스로 대신한다
+            logger.warning(f"Cannot publish shared BM25 snapshot to {self.index_dir}: {e}")
+            return False
+        return await self._load_snapshot()
 
-        self._documents = all_docs
-        tokenized_docs = [_tokenize_korean(doc.get("metadata", {}).get("content", "")) for doc in all_docs]
+    async def _has_newer_snapshot(self) -> bool:
+        if not self.index_dir:
+            return False
+        manifest = await asyncio.to_thread(read_manifest, self.index_dir)
+        return manifest is not None and manifest.get("generation", 0) > self._generation
 
-        self._bm25_index = BM25Okapi(tokenized_docs)
-        logger.info(f"BM25 index built with {len(self._documents)} documents")
+    def _index_documents(self, index: Union[BM25Index, SegmentedBM25Index], docs: List[Dict[str, Any]]) -> None:
+        contents = [doc.get("metadata", {}).get("content", "") for doc in docs]
+        for doc, tokens in zip(docs, self.tokenizer.tokenize_batch(contents)):
+            index.add(doc["id"], tokens, doc.get("metadata", {}))
 
-    def _matches_filter(self, metadata: Dict[str, Any], filter: Dict[str, Any]) -> bool:
-        return all(metadata.get(k) == v for k, v in filter.items())
+    def add(self, doc: Dict[str, Any]) -> None:
+        self.apply_changes([doc])
+
+    def remove(self, point_id: Any) -> bool:
+        with self._index_lock:
+            return self._bm25_index.remove(point_id)
+
+    def apply_changes(self, docs: List[Dict[str, Any]]) -> None:
+        with self._index_lock:
+            self._apply_changes(self._bm25_index, docs)
+
+    def _apply_changes(self, index: Union[BM25Index, SegmentedBM25Index], docs: List[Dict[str, Any]]) -> None:
+        # 문서가 변경되면 worker 는 기존 청크를 지우고 새 version 으로 다시 올리므로, 다른 version 의 청크는 제거한다
+        versions = {}
+        for doc in docs:
+            metadata = doc.get("metadata", {})
+            source_id = metadata.get("source_document_id")
+            version_key = metadata.get("version_key")
+            if source_id is not None and version_key is not None:
+                versions[source_id] = version_key
+
+        if versions and {"source_document_id", "version_key"} <= set(index.fields):
+            stale = []
+            for source_id, version_key in versions.items():
+                mask = index.field_mask("source_document_id", source_id) & ~index.field_mask("version_key", version_key)
+                stale.extend(index.point_id(int(slot)) for slot in np.flatnonzero(mask))
+            for point_id in stale:
+                if point_id is not None:
+                    index.remove(point_id)
+
+        self._index_documents(index, docs)
+
+    async def refresh(self) -> int:
+        """새 snapshot 이 게시됐으면 다시 읽고, 아니면 indexed_at watermark 이후 색인된 point 를 반영한다.
+
+        sync 완료 알림 시 호출할 수 있다.
+        """
+        if self._bm25_index is None:
+            await self._build_index()
+            return 0
+        # 호출한 요청이 취소돼도 다른 요청이 기다리는 refresh 는 계속한다
+        return await asyncio.shield(self._start_refresh())
+
+    def _start_refresh(self) -> asyncio.Task:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh())
+            self._refresh_task.add_done_callback(self._refresh_done)
+        return self._refresh_task
+
+    def _refresh_done(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"BM25 index refresh failed: {task.exception()}")
+            # 실패하면 다음 주기까지 다시 시도하지 않는다
+            self._last_refresh = time.monotonic()
+
+    async def _refresh(self) -> int:
+        async with self._lock:
+            if await self._has_newer_snapshot() and await self._load_snapshot():
+                return len(self._bm25_index)
+
+            started_at = datetime.now(timezone.utc)
+            since = self._watermark - timedelta(seconds=self.change_feed_overlap_seconds)
+            changed = await self.vector_store.get_all_modified_since(
+                since=since, field="indexed_at", with_payload=self._index_payload
+            )
+            await self.executor.run(self.apply_changes, changed)
+            self._watermark = started_at
+            self._last_refresh = time.monotonic()
+
+        if changed:
+            logger.info(f"BM25 index refreshed with {len(changed)} changed documents (total {len(self._bm25_index)})")
+        return len(changed)
+
+    def _refresh_if_stale(self) -> None:
+        # 검색은 refresh 를 기다리지 않으므로 검색 deadline 이 refresh 시간에 묶이지 않는다
+        if time.monotonic() - self._last_refresh >= self.refresh_interval_seconds:
+            self._start_refresh()
+
+    def _search(
+        self, query_tokens: Tuple[str, ...], top_k: int, filter: Optional[Dict[str, Any]]
+    ) -> List[Tuple[Any, float]]:
+        with self._index_lock:
+            mask = self._bm25_index.filter_mask(filter) if filter else None
+            return self._bm25_index.search(query_tokens, top_k=top_k, mask=mask)
 
     async def retrieve(
         self,
         query: str,
         top_k: int = 5,
         filter: Optional[Dict[str, Any]] = None,
+        context: Optional[RetrievalContext] = None,
     ) -> List[RetrievedDocument]:
         await self._build_index()
+        self._refresh_if_stale()
 
-        if not self._documents:
+        if not len(self._bm25_index):
             return []
 
-        query_tokens = _tokenize_korean(query)
-        scores = self._bm25_index.get_scores(query_tokens)
-        scored_docs = sorted(zip(scores, self._documents), key=lambda x: x[0], reverse=True)
-
-        if filter:
-            scored_docs = [
-                (score, doc) for score, doc in scored_docs if self._matches_filter(doc.get("metadata", {}), filter)
-            ]
+        context = context or RetrievalContext(query, executor=self.executor)
+        with stage("sparse_search"):
+            query_tokens = await context.tokens(self.tokenizer)
+            results = await self.executor.run(self._search, query_tokens, top_k, filter)
+            if not results:
+                return []
 
-        documents = [
-            RetrievedDocument(id=doc["id"], score=float(score), metadata=doc.get("metadata", {}))
-            for score, doc in scored_docs[:top_k]
-            if score > 0
+            # payload 는 top_k 에 대해서만 한 번의 retrieve 호출로 가져온다
+            payloads = {
+                doc["id"]: doc["metadata"] for doc in await self.vector_store.retrieve([pid for pid, _ in results])
+            }
+        return [
+            RetrievedDocument(id=point_id, score=score, metadata=payloads[point_id])
+            for point_id, score in results
+            if point_id in payloads
         ]
-        return documents
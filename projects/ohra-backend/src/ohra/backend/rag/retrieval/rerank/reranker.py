@@ -0,0 +1,135 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Protocol, Set
+import asyncio
+import hashlib
+
+import numpy as np
+
+from ohra.shared_kernel.infra.executor import CPUExecutor
+from ohra.backend.rag.service.v1.schema import RetrievedDocument
+from ohra.backend.rag.service.v1.settings import LangchainRAGAnalyzerConfig
+
+
+class CrossEncoder(Protocol):
+    def score(self, query: str, texts: List[str]) -> List[float]: ...
+
+
+@dataclass
+class OnnxCrossEncoder:
+    """ONNX Runtime(CPU) cross-encoder (optional dependency).
+
+    ``model_dir`` 에는 int8 양자화된 ``model.onnx`` 와 HuggingFace ``tokenizer.json`` 이 있어야 한다.
+    """
+
+    model_dir: str
+    max_length: int = 512
+    num_threads: int = 1  # 배치 병렬화는 CPUExecutor 가 맡으므로 세션당 thread 는 적게 둔다
+    _session: Any = field(init=False, repr=False)
+    _tokenizer: Any = field(init=False, repr=False)
+    _input_names: Set[str] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        try:
+            import onnxruntime as ort
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise ImportError(
+                "OnnxCrossEncoder requires onnxruntime and tokenizers. Install with `pip install ohra-backend[rerank]`."
+            ) from e
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = self.num_threads
+        self._session = ort.InferenceSession(
+            str(Path(self.model_dir) / "model.onnx"), options, providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {node.name for node in self._session.get_inputs()}
+
+        # 질의는 남기고 청크 쪽만 잘라 max_length 에 맞춘다
+        self._tokenizer = Tokenizer.from_file(str(Path(self.model_dir) / "tokenizer.json"))
+        self._tokenizer.enable_truncation(max_length=self.max_length, strategy="only_second")
+        self._tokenizer.enable_padding()
+
+    def score(self, query: str, texts: List[str]) -> List[float]:
+        encodings = self._tokenizer.encode_batch([(query, text) for text in texts])
+        inputs = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        logits = self._session.run(None, {name: v for name, v in inputs.items() if name in self._input_names})[0]
+        # 관련도 logit 하나를 내는 모델이면 그대로, 2-class 모델이면 positive logit 을 쓴다
+        return (logits[:, -1] if logits.ndim == 2 else logits).astype(float).tolist()
+
+
+@dataclass
+class CrossEncoderReranker:
+    """fusion 결과를 cross-encoder 로 다시 점수화해 상위 ``top_n`` 개만 남긴다.
+
+    점수는 sha1(query + chunk) 키의 LRU cache 에 남겨 같은 질의-청크 쌍은 다시 계산하지 않는다.
+    """
+
+    model: CrossEncoder = field(repr=False)
+    batch_size: int = 16
+    cache_size: int = 4096
+    max_chars: int = 2000  # 긴 청크는 앞부분만 점수화한다
+    executor: CPUExecutor = field(default_factory=lambda: CPUExecutor(max_workers=0), repr=False)
+    _cache: "OrderedDict[str, float]" = field(default_factory=OrderedDict, init=False, repr=False)
+
+    @staticmethod
+    def cache_key(query: str, text: str) -> str:
+        return hashlib.sha1(f"{query}\0{text}".encode("utf-8")).hexdigest()
+
+    def _cached(self, key: str) -> Optional[float]:
+        score = self._cache.get(key)
+        if score is not None:
+            self._cache.move_to_end(key)
+        return score
+
+    def _store(self, key: str, score: float) -> None:
+        self._cache[key] = score
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def rerank(self, query: str, documents: List[RetrievedDocument], top_n: int) -> List[RetrievedDocument]:
+        texts = [doc.content[: self.max_chars] for doc in documents]
+        keys = [self.cache_key(query, text) for text in texts]
+
+        scores: Dict[str, float] = {}
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if (score := self._cached(key)) is not None:
+                scores[key] = score
+            else:
+                missing[key] = text
+
+        # cache 에 없는 쌍만 batch_size 단위로 묶어 executor 에서 점수화한다 (배치끼리는 병렬)
+        pending = list(missing.items())
+        batches = [pending[i : i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+        batch_scores = await asyncio.gather(
+            *[self.executor.run(self.model.score, query, [text for _, text in batch]) for batch in batches]
+        )
+        for batch, results in zip(batches, batch_scores):
+            for (key, _), score in zip(batch, results):
+                scores[key] = score
+                self._store(key, score)
+
+        ranked = sorted(zip(documents, keys), key=lambda item: scores[item[1]], reverse=True)[:top_n]
+        return [doc.model_copy(update={"score": scores[key]}) for doc, key in ranked]
+
+
+def build_reranker(
+    config: LangchainRAGAnalyzerConfig,
+    executor: Optional[CPUExecutor] = None,
+) -> Optional[CrossEncoderReranker]:
+    """``rerank_model_dir`` 가 설정된 경우에만 reranker 를 만든다."""
+    if not config.rerank_model_dir:
+        return None
+    return CrossEncoderReranker(
+        model=OnnxCrossEncoder(config.rerank_model_dir),
+        batch_size=config.rerank_batch_size,
+        cache_size=config.rerank_cache_size,
+        executor=executor or CPUExecutor(max_workers=0),
+    )
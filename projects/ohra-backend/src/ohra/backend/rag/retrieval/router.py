@@ -0,0 +1,156 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Pattern
+import json
+import logging
+import math
+import re
+import unicodedata
+
+from ohra.backend.rag.service.v1.settings import LangchainRAGAnalyzerConfig
+
+# 튜닝용 routing 로그 (질의, 결정, 근거를 JSON 한 줄로 남긴다)
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RouteRule:
+    name: str
+    pattern: Pattern[str]
+    retrieve: bool
+    needs_history: bool = False  # 이전 대화가 있을 때만 적용
+
+
+def _rule(name: str, pattern: str, retrieve: bool, needs_history: bool = False) -> RouteRule:
+    return RouteRule(name, re.compile(pattern), retrieve, needs_history)
+
+
+_GREETING = r"안녕(하세요|하십니까)?|안뇽|하이|반가워(요)?|반갑습니다|hi|hello|hey"
+# "우리 지금 무슨 얘기 하고 있었지?" 처럼 대화 자체를 묻는 발화 전체. 뒤에 다른 주제가 붙으면 검색한다
+_CHAT_ABOUT = (
+    r"^((우리|지금|방금|아까)\s*)+(무슨|뭔)\s*(얘기|이야기|대화)\s*"
+    r"(하고\s*있(어|었어|었지|지|나)|하던\s*중이(야|었지)|했(어|었지|지|나)|였(어|지))?\s*[?.!~]*$"
+)
+# 이전 대화를 가리키는 발화 끝의 부탁 표현. 뒤에는 문장부호만 올 수 있고, 다른 주제가 붙으면 검색한다
+_PLEASE = r"\s*(줘|주세요|줄래|줘요|봐)?\s*[?.!~]*$"
+_THANKS = (
+    r"고마워(요)?|고맙습니다|감사(합니다|해요)?|땡큐|ㄱㅅ|thanks|thank you"
+    r"|ok|okay|오케이|알겠(어|어요|습니다)|넵|네|응|ㅇㅋ"
+)
+
+# 위에서부터 처음 맞는 규칙을 쓴다. 문서를 직접 가리키는 질의는 먼저 검색으로 보낸다
+DEFAULT_RULES: List[RouteRule] = [
+    _rule("document_reference", r"(문서|위키|wiki|confluence|컨플루언스|jira|지라|이슈|가이드|정책|명세)", True),
+    _rule("conversation", _CHAT_ABOUT, False),
+    _rule(
+        "conversation",
+        r"^(이전|위|앞|방금|아까)\s*(의|에서)?\s*(대화|답변|말|내용)\s*(을|를|은|는|좀)?\s*"
+        r"((다시|한\s*번\s*더|더|자세히)\s*)*((요약|정리|번역|설명)\s*(좀\s*)?해|말해|알려|해)?" + _PLEASE,
+        False,
+        needs_history=True,
+    ),
+    _rule(
+        "conversation",
+        r"^(다시|한\s*번\s*더|더)\s*(자세히\s*)?(말해|설명해|알려|자세히)" + _PLEASE,
+        False,
+        needs_history=True,
+    ),
+    _rule(
+        "conversation",
+        r"^(그럼|그러면|그건|그거|그게)?\s*(요약|정리|번역)\s*(좀\s*)?(해|좀)" + _PLEASE,
+        False,
+        needs_history=True,
+    ),
+    _rule("identity", r"(너|넌|당신)\s*(는|은)?\s*(누구|뭐야|뭐니|이름)|who are you|your name", False),
+    _rule("greeting", rf"^(({_GREETING})[\s!~.?ㅎㅋ^]*)+$", False),
+    _rule("thanks", rf"^(({_THANKS})[\s!~.?ㅎㅋ^]*)+$", False),
+]
+
+
+@dataclass
+class QueryClassifier:
+    """글자 bigram 특징의 logistic regression (JSON weight 파일).
+
+    ``{"bias": float, "threshold": float, "weights": {"배포": 1.2, ...}}`` 형식이며 결과는 검색이 필요할 확률이다.
+    """
+
+    bias: float
+    weights: Dict[str, float]
+    threshold: float = 0.5
+
+    @classmethod
+    def load(cls, path: str) -> "QueryClassifier":
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls(bias=data["bias"], weights=data["weights"], threshold=data.get("threshold", 0.5))
+
+    @staticmethod
+    def features(text: str) -> Counter:
+        text = re.sub(r"\s+", "", text)
+        return Counter(text[i : i + 2] for i in range(len(text) - 1))
+
+    def probability(self, text: str) -> float:
+        z = self.bias + sum(self.weights.get(f, 0.0) * n for f, n in self.features(text).items())
+        return 1.0 / (1.0 + math.exp(-max(min(z, 50.0), -50.0)))
+
+
+@dataclass(frozen=True)
+class RouteDecision:
+    retrieve: bool
+    reason: str  # 규칙 이름 / "classifier" / "default"
+    score: Optional[float] = None  # classifier 확률
+
+
+@dataclass
+class QueryRouter:
+    """질의에 문서 검색이 필요한지 정한다 (규칙 → 선택적 classifier → 기본값 검색).
+
+    대화 내용 / 인사 / 자기소개 같은 질의는 embedding 과 Qdrant 검색을 건너뛴다.
+    애매하면 검색하는 쪽으로 둔다.
+    """
+
+    rules: List[RouteRule] = field(default_factory=lambda: list(DEFAULT_RULES))
+    classifier: Optional[QueryClassifier] = None
+    counts: Counter = field(default_factory=Counter, init=False)
+
+    def route(self, query: str, has_history: bool = False) -> RouteDecision:
+        text = unicodedata.normalize("NFC", query).strip().lower()
+        decision = self._decide(text, has_history)
+        self.counts[f"{'retrieve' if decision.retrieve else 'skip'}:{decision.reason}"] += 1
+        logger.info(
+            json.dumps(
+                {
+                    "query": query[:200],
+                    "has_history": has_history,
+                    "retrieve": decision.retrieve,
+                    "reason": decision.reason,
+                    "score": decision.score,
+                },
+                ensure_ascii=False,
+            )
+        )
+        return decision
+
+    def _decide(self, text: str, has_history: bool) -> RouteDecision:
+        if not text:
+            return RouteDecision(retrieve=False, reason="empty")
+        for rule in self.rules:
+            if rule.needs_history and not has_history:
+                continue
+            if rule.pattern.search(text):
+                return RouteDecision(retrieve=rule.retrieve, reason=rule.name)
+        if self.classifier is not None:
+            score = self.classifier.probability(text)
+            return RouteDecision(retrieve=score >= self.classifier.threshold, reason="classifier", score=score)
+        return RouteDecision(retrieve=True, reason="default")
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self.counts)
+
+
+def build_query_router(config: LangchainRAGAnalyzerConfig) -> Optional[QueryRouter]:
+    """``router_enabled`` 가 아니면 None (항상 검색)."""
+    if not config.router_enabled:
+        return None
+    classifier = QueryClassifier.load(config.router_model_path) if config.router_model_path else None
+    return QueryRouter(classifier=classifier)
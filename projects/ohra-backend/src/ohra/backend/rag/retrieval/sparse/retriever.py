@@ -0,0 +1,35 @@
+from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field
+
+from ohra.shared_kernel.infra.executor import CPUExecutor
+from ohra.shared_kernel.infra.qdrant import QdrantAdapter
+from ohra.shared_kernel.infra.timing import stage
+from ohra.shared_kernel.infra.tokenizer import BM25SparseEncoder
+from ohra.backend.rag.retrieval.context import RetrievalContext
+from ohra.backend.rag.service.v1.schema import RetrievedDocument
+
+
+@dataclass
+class SparseRetriever:
+    """Qdrant sparse(IDF modifier) 벡터 기반 BM25 키워드 검색. 인메모리 인덱스가 필요 없다."""
+
+    vector_store: QdrantAdapter
+    sparse_encoder: BM25SparseEncoder = field(default_factory=BM25SparseEncoder)
+    executor: CPUExecutor = field(default_factory=lambda: CPUExecutor(max_workers=0))
+
+    async def retrieve(
+        self,
+        query: str,
+        top_k: int = 5,
+        filter: Optional[Dict[str, Any]] = None,
+        context: Optional[RetrievalContext] = None,
+    ) -> List[RetrievedDocument]:
+        context = context or RetrievalContext(query, executor=self.executor)
+        with stage("sparse_search"):
+            query_sparse_vector = await context.sparse_vector(self.sparse_encoder)
+            results = await self.vector_store.search_sparse(
+                query_sparse_vector=query_sparse_vector,
+                top_k=top_k,
+                filter=filter,
+            )
+        return [RetrievedDocument(**result) for result in results]
@@ -3,6 +3,8 @@ from dataclasses import dataclass
 
 from ohra.shared_kernel.infra.qdrant import QdrantAdapter
 from ohra.shared_kernel.infra.sagemaker import SageMakerEmbeddingAdapter
+from ohra.shared_kernel.infra.timing import stage
+from ohra.backend.rag.retrieval.context import RetrievalContext
 from ohra.backend.rag.service.v1.schema import RetrievedDocument
 
 
@@ -16,13 +18,16 @@ class VectorRetriever:
         query: str,
         top_k: int = 5,
         filter: Optional[Dict[str, Any]] = None,
+        context: Optional[RetrievalContext] = None,
     ) -> List[RetrievedDocument]:
-        query_vector = await self.embedding.embed_text(query)
-        results = await self.vector_store.search(
-            query_vector=query_vector,
-            top_k=top_k,
-            filter=filter,
-        )
+        context = context or RetrievalContext(query, embedding=self.embedding)
+        query_vector = await context.query_vector()
+        with stage("dense_search"):
+            results = await self.vector_store.search(
+                query_vector=query_vector,
+                top_k=top_k,
+                filter=filter,
+            )
 
         documents = [RetrievedDocument(**result) for result in results]
         return documents
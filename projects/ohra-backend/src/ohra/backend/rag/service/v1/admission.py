@@ -0,0 +1,106 @@
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+import asyncio
+import math
+import time
+
+from ohra.shared_kernel.infra.timing import record_stage
+from ohra.backend.rag import exceptions
+from ohra.backend.rag.service.v1.settings import LangchainRAGAnalyzerConfig
+
+
+@dataclass
+class AdmissionController:
+    """LLM endpoint 로 동시에 보내는 요청 수를 ``max_in_flight`` 로 제한한다.
+
+    자리가 없으면 최대 ``max_queue`` 개까지 도착 순서대로 기다리고, 대기열이 가득 찼거나
+    ``queue_timeout`` 안에 자리가 나지 않으면 ``Retry-After`` 를 담은 429 로 바로 돌려보낸다.
+    endpoint 가 throttling 으로 모든 요청을 함께 늦추는 대신 넘치는 요청만 빨리 실패시킨다.
+    """
+
+    max_in_flight: int = 32
+    max_queue: int = 64
+    queue_timeout: float = 10.0
+    window: int = 1024  # 대기 시간 통계에 쓰는 최근 요청 수
+    in_flight: int = field(default=0, init=False)
+    waiting: int = field(default=0, init=False)
+    admitted: int = field(default=0, init=False)
+    rejected_full: int = field(default=0, init=False)
+    rejected_timeout: int = field(default=0, init=False)
+    _semaphore: asyncio.Semaphore = field(init=False, repr=False)
+    _waits: Deque[float] = field(init=False, repr=False)
+    _service_time: float = field(default=1.0, init=False, repr=False)  # 자리 하나를 쓰는 평균 시간 (초, EWMA)
+
+    def __post_init__(self):
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        self._waits = deque(maxlen=self.window)
+
+    def retry_after(self) -> int:
+        """대기열이 빠지는 데 걸릴 시간의 추정치 (초)"""
+        return min(60, max(1, math.ceil(self._service_time * (self.waiting / self.max_in_flight + 1))))
+
+    def check(self) -> None:
+        """검색 등 앞 단계를 시작하기 전에 대기열이 이미 가득 찼으면 바로 거절한다."""
+        if self.waiting >= self.max_queue:
+            self.rejected_full += 1
+            raise exceptions.TooManyRequestsException(self.retry_after())
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        start = time.perf_counter()
+        if self._semaphore.locked():
+            self.check()
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected_timeout += 1
+                raise exceptions.TooManyRequestsException(self.retry_after())
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+
+        admitted_at = time.perf_counter()
+        self._waits.append(admitted_at - start)
+        record_stage("queue", (admitted_at - start) * 1000)
+        self.admitted += 1
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+            self._service_time = 0.8 * self._service_time + 0.2 * (time.perf_counter() - admitted_at)
+
+    def stats(self) -> Dict[str, Any]:
+        waits = sorted(self._waits)
+
+        def percentile(p: float) -> float:
+            return round(waits[min(len(waits) - 1, int(len(waits) * p))] * 1000, 1) if waits else 0.0
+
+        return {
+            "in_flight": self.in_flight,
+            "queue_depth": self.waiting,
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected_full": self.rejected_full,
+            "rejected_timeout": self.rejected_timeout,
+            "wait_ms_p50": percentile(0.5),
+            "wait_ms_p95": percentile(0.95),
+            "wait_ms_max": percentile(1.0),
+        }
+
+
+def build_admission_controller(config: LangchainRAGAnalyzerConfig) -> Optional[AdmissionController]:
+    """``admission_max_in_flight`` 가 0 이면 None (제한 없음)."""
+    if config.admission_max_in_flight <= 0:
+        return None
+    return AdmissionController(
+        max_in_flight=config.admission_max_in_flight,
+        max_queue=config.admission_max_queue,
+        queue_timeout=config.admission_queue_timeout,
+    )
@@ -0,0 +1,112 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import logging
+
+from ohra.shared_kernel.infra.qdrant import QdrantAdapter
+from ohra.shared_kernel.infra.vector_store.exceptions import VectorStoreException
+from ohra.backend.rag.dtos.response import ChatCompletionResponse
+from ohra.backend.rag.service.v1.schema import RetrievedDocument
+from ohra.backend.rag.service.v1.settings import LangchainRAGAnalyzerConfig
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SemanticAnswerCache:
+    """비슷한 질문의 답변을 재사용하는 semantic cache (별도 Qdrant collection).
+
+    질의 embedding 과 답변 근거 청크의 id / content hash 를 함께 저장한다.
+    유사도가 ``threshold`` 이상이고 근거 청크가 바뀌지 않았을 때만 저장된 응답을 돌려준다.
+    cache collection 장애는 miss 로 처리해 답변 생성을 막지 않는다.
+    """
+
+    store: QdrantAdapter = field(repr=False)  # answer cache collection
+    documents: QdrantAdapter = field(repr=False)  # 근거 청크 hash 확인용 문서 collection
+    threshold: float = 0.95
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    stale: int = field(default=0, init=False)  # 유사 질문은 찾았지만 근거 청크가 바뀌어 버린 횟수
+    _ready: bool = field(default=False, init=False, repr=False)
+
+    @staticmethod
+    def scope(model: str, search_mode: str, filter: Optional[Dict[str, Any]]) -> str:
+        # 모델 / 검색 모드 / 필터가 다른 요청끼리는 답변을 공유하지 않는다
+        return hashlib.sha1(json.dumps([model, search_mode, filter or {}], sort_keys=True).encode()).hexdigest()
+
+    async def _ensure_collection(self, vector_size: int) -> None:
+        if not self._ready:
+            await self.store.ensure_collection_exists(vector_size, enable_sparse=False)
+            self._ready = True
+
+    async def _sources_unchanged(self, sources: Dict[str, Optional[str]]) -> bool:
+        current = await self.documents.retrieve([int(i) for i in sources], with_payload=["hash"])
+        return {str(doc["id"]): doc["metadata"].get("hash") for doc in current} == sources
+
+    async def lookup(self, query_vector: List[float], scope: str) -> Optional[ChatCompletionResponse]:
+        try:
+            await self._ensure_collection(len(query_vector))
+            results = await self.store.search(query_vector=query_vector, top_k=1, filter={"scope": scope})
+            if not results or results[0]["score"] < self.threshold:
+                self.misses += 1
+                return None
+
+            payload = results[0]["metadata"]
+            if not await self._sources_unchanged(payload["sources"]):
+                self.stale += 1
+                self.misses += 1
+                return None
+        except VectorStoreException as e:
+            logger.warning(f"Answer cache lookup failed: {e}")
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return ChatCompletionResponse.model_validate_json(payload["response"])
+
+    async def put(
+        self,
+        query: str,
+        query_vector: List[float],
+        scope: str,
+        documents: List[RetrievedDocument],
+        response: ChatCompletionResponse,
+    ) -> None:
+        payload = {
+            "scope": scope,
+            "query": query,
+            "sources": {str(doc.id): doc.metadata.get("hash") for doc in documents},
+            "response": response.model_dump_json(),
+            "indexed_at": datetime.now(timezone.utc).isoformat(),
+        }
+        # 같은 scope 의 같은 질문은 덮어쓴다
+        point_id = int(hashlib.md5(f"{scope}:{query}".encode()).hexdigest()[:15], 16)
+        try:
+            await self._ensure_collection(len(query_vector))
+            await self.store.upsert(id=point_id, vector=query_vector, metadata=payload)
+        except VectorStoreException as e:
+            logger.warning(f"Answer cache store failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def build_answer_cache(
+    config: LangchainRAGAnalyzerConfig, vector_store: QdrantAdapter
+) -> Optional[SemanticAnswerCache]:
+    """``answer_cache_enabled`` 일 때만 문서 collection 과 connection 을 공유하는 answer cache 를 만든다."""
+    if not config.answer_cache_enabled:
+        return None
+    return SemanticAnswerCache(
+        store=vector_store.with_collection(config.answer_cache_collection),
+        documents=vector_store,
+        threshold=config.answer_cache_threshold,
+    )
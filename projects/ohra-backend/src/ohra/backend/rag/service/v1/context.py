@@ -0,0 +1,153 @@
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, List, Optional, Protocol, Sequence
+import logging
+import re
+
+from .prompt import format_document
+from .schema import RetrievedDocument
+from .settings import LangchainRAGAnalyzerConfig
+
+logger = logging.getLogger(__name__)
+
+# 문장 끝(마침표 등 + 공백) 또는 줄바꿈에서만 청크를 자른다
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?。！？])\s+|\n+")
+
+
+class TokenCounter(Protocol):
+    def count(self, text: str) -> int: ...
+
+
+@dataclass
+class HFTokenCounter:
+    """HuggingFace tokenizers 로 LLM 과 같은 기준의 토큰 수를 센다.
+
+    ``tokenizer`` 는 ``tokenizer.json`` 파일, 그 파일이 있는 디렉터리, 또는 HuggingFace model id 이다.
+    """
+
+    tokenizer: str
+    _tokenizer: Any = field(init=False, repr=False)
+
+    def __post_init__(self):
+        try:
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise ImportError("HFTokenCounter requires tokenizers. Install with `pip install tokenizers`.") from e
+
+        path = Path(self.tokenizer)
+        if path.is_dir():
+            path = path / "tokenizer.json"
+        if path.is_file():
+            self._tokenizer = Tokenizer.from_file(str(path))
+        else:
+            self._tokenizer = Tokenizer.from_pretrained(self.tokenizer)
+
+    def count(self, text: str) -> int:
+        return len(self._tokenizer.encode(text, add_special_tokens=False).ids)
+
+
+@dataclass
+class EstimatedTokenCounter:
+    """tokenizer 를 쓸 수 없을 때의 보수적 추정치 (한글 등 비 ASCII 글자당 1 토큰, ASCII 는 3자당 1 토큰)"""
+
+    ascii_chars_per_token: float = 3.0
+
+    def count(self, text: str) -> int:
+        non_ascii = sum(1 for ch in text if ord(ch) > 127)
+        return non_ascii + int((len(text) - non_ascii) / self.ascii_chars_per_token + 0.999)
+
+
+@lru_cache(maxsize=None)
+def load_token_counter(tokenizer: Optional[str]) -> TokenCounter:
+    """tokenizer 는 process 당 한 번만 읽는다. 읽지 못하면 추정치로 대신한다."""
+    if not tokenizer:
+        return EstimatedTokenCounter()
+    try:
+        return HFTokenCounter(tokenizer)
+    except Exception as e:
+        logger.warning(f"Failed to load tokenizer {tokenizer!r}, falling back to estimated token counts: {e}")
+        return EstimatedTokenCounter()
+
+
+@dataclass
+class PackedContext:
+    documents: List[RetrievedDocument]
+    tokens: int  # 문서 태그를 포함해 프롬프트에 들어간 토큰 수
+    budget: int
+
+
+@dataclass
+class ContextPacker:
+    """검색된 문서를 관련도 순으로 토큰 budget 안에 채운다.
+
+    budget 은 ``max_model_len`` 에서 생성 토큰(``max_tokens``)과 나머지 프롬프트를 뺀 값과
+    ``max_context_tokens`` 중 작은 값이다. 남은 budget 보다 큰 청크는 문장 경계에서 자르고,
+    문장 경계가 없거나 첫 문장부터 넘치면 토큰 단위로 자른다.
+    """
+
+    counter: TokenCounter = field(repr=False)
+    max_model_len: int = 16384
+    max_context_tokens: int = 6144  # 프롬프트가 길수록 prefill 이 느려지므로 컨텍스트 자체에도 상한을 둔다
+    max_chunk_tokens: int = 1024  # 문서 하나가 차지할 수 있는 토큰 상한
+    min_chunk_tokens: int = 32  # 남은 budget 이 이보다 작으면 더 채우지 않는다
+    message_overhead: int = 8  # chat template 이 메시지마다 붙이는 role 태그 등
+
+    def budget(self, prompt: List[str], max_tokens: int) -> int:
+        used = sum(self.counter.count(text) + self.message_overhead for text in prompt)
+        return max(0, min(self.max_context_tokens, self.max_model_len - max_tokens - used))
+
+    def _longest_prefix(self, content: str, cuts: Sequence[int], limit: int) -> Optional[int]:
+        # limit 안에 들어가는 가장 긴 prefix 의 끝 위치 (prefix 토큰 수는 길이에 대해 단조 증가)
+        lo, hi, best = 0, len(cuts) - 1, None
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            if self.counter.count(content[: cuts[mid]]) <= limit:
+                best, lo = cuts[mid], mid + 1
+            else:
+                hi = mid - 1
+        return best
+
+    def _trim(self, content: str, limit: int) -> Optional[str]:
+        sentences = [m.start() for m in _SENTENCE_BREAK.finditer(content) if m.start() > 0]
+        end = self._longest_prefix(content, sentences, limit)
+        if end is None:
+            # 문장 경계에서 자를 수 없으면 글자 단위로 limit 토큰까지 채운다
+            end = self._longest_prefix(content, range(1, len(content)), limit)
+        trimmed = content[:end].rstrip() if end else ""
+        return trimmed or None
+
+    def pack(self, documents: List[RetrievedDocument], prompt: List[str], max_tokens: int) -> PackedContext:
+        """``prompt`` 는 컨텍스트를 뺀 나머지 메시지 본문 (system prompt, 이전 대화, 질문 템플릿)"""
+        budget = self.budget(prompt, max_tokens)
+        packed: List[RetrievedDocument] = []
+        used = 0
+        for doc in sorted(documents, key=lambda doc: doc.score, reverse=True):
+            if not doc.content:
+                continue
+            remaining = budget - used
+            if remaining < self.min_chunk_tokens:
+                break
+
+            overhead = self.counter.count(format_document(doc, content="")) + 2  # 문서 사이 빈 줄
+            limit = min(self.max_chunk_tokens, remaining - overhead)
+            content = doc.content
+            tokens = self.counter.count(content)
+            if tokens > limit:
+                if (content := self._trim(content, limit)) is None:
+                    continue
+                tokens = self.counter.count(content)
+                doc = doc.model_copy(update={"metadata": {**doc.metadata, "content": content}})
+
+            packed.append(doc)
+            used += tokens + overhead
+        return PackedContext(documents=packed, tokens=used, budget=budget)
+
+
+def build_context_packer(config: LangchainRAGAnalyzerConfig) -> ContextPacker:
+    return ContextPacker(
+        counter=load_token_counter(config.context_tokenizer),
+        max_model_len=config.max_model_len,
+        max_context_tokens=config.context_max_tokens,
+        max_chunk_tokens=config.context_chunk_max_tokens,
+    )
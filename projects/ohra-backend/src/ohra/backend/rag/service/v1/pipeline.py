@@ -1,86 +1,366 @@
+from contextlib import aclosing, asynccontextmanager
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional
-import json
-import boto3
+from typing import AsyncIterator, Dict, Any, List, Optional
+import time
+import uuid
 
-from ohra.shared_kernel.infra.sagemaker import SageMakerEmbeddingAdapter
+from ohra.shared_kernel.infra.executor import CPUExecutor
+from ohra.shared_kernel.infra.sagemaker import SageMakerEmbeddingAdapter, SageMakerLLMAdapter
 from ohra.shared_kernel.infra.qdrant import QdrantAdapter
+from ohra.shared_kernel.infra.timing import record_stage, stage
 
-from .prompt import __SYSTEM_PROMPT__, __PROMPT_TEMPLATE__, format_context_docs
+from .admission import AdmissionController, build_admission_controller
+from .answer_cache import SemanticAnswerCache, build_answer_cache
+from .context import ContextPacker, build_context_packer
+from .response_cache import LLMResponseCache, build_response_cache
+from .prompt import build_messages, format_context_docs, history_window
+from .schema import RetrievedDocument
 from .settings import LangchainRAGAnalyzerConfig
-from ohra.backend.rag.retrieval.hybrid.retriever import HybridRetriever
+from ohra.backend.rag.retrieval.hybrid.service import HybridSearchService, build_search_service
+from ohra.backend.rag.retrieval.rerank.reranker import CrossEncoderReranker, build_reranker
+from ohra.backend.rag.retrieval.router import QueryRouter, build_query_router
 from ohra.backend.rag.dtos.request import ChatCompletionRequest
-from ohra.backend.rag.dtos.response import ChatCompletionResponse
+from ohra.backend.rag.dtos.response import (
+    ChatCompletionChoice,
+    ChatCompletionChunk,
+    ChatCompletionChunkChoice,
+    ChatCompletionDelta,
+    ChatCompletionResponse,
+    RetrievalInfo,
+)
+from ohra.backend.rag.dtos.schemas import ChatMessage
 from ohra.backend.rag import exceptions
 
 
+@dataclass
+class _PreparedRequest:
+    """검색과 프롬프트 구성까지 끝난 요청 (ainvoke / astream 공통)"""
+
+    query: str
+    payload: Dict[str, Any]  # LLM endpoint 요청 본문
+    retrieval: RetrievalInfo
+    context_docs: List[RetrievedDocument]
+    cache_scope: Optional[str] = None  # answer cache 대상 요청일 때만 설정
+    query_vector: Optional[List[float]] = None
+    cached: Optional[ChatCompletionResponse] = None
+
+
 @dataclass
 class LangchainRAGAnalyzer:
+    """process 당 하나(container Singleton)만 만들어 모든 요청이 공유한다.
+
+    요청별 상태는 인스턴스에 두지 않고 ``_PreparedRequest`` 로 넘긴다.
+    """
+
     embedding: SageMakerEmbeddingAdapter = field(repr=False)
     vector_store: QdrantAdapter = field(repr=False)
     config: LangchainRAGAnalyzerConfig | dict = field(default_factory=LangchainRAGAnalyzerConfig)
-
-    sagemaker_client: Any = field(init=False, repr=False)
-    hybrid_retriever: HybridRetriever = field(init=False, repr=False)
+    # 검색 / rerank 와 같은 pool 을 쓰도록 container 의 Singleton 을 주입받는다
+    cpu_executor: Optional[CPUExecutor] = field(default=None, repr=False)
+    # BM25 인덱스 등 retriever 상태도 요청 간에 공유하도록 container 의 Singleton 을 주입받는다
+    search_service: Optional[HybridSearchService] = field(default=None, repr=False)
+    # 모델 세션과 점수 cache 를 요청 간에 공유한다 (rerank_model_dir 이 없으면 None)
+    reranker: Optional[CrossEncoderReranker] = field(default=None, repr=False)
+    # hit/miss 통계를 요청 간에 누적하도록 container 의 Singleton 을 주입받는다 (answer_cache_enabled 가 아니면 None)
+    answer_cache: Optional[SemanticAnswerCache] = field(default=None, repr=False)
+    # 같은 프롬프트의 LLM 응답을 worker 간에 공유할 수 있다 (response_cache_enabled 가 아니면 None)
+    response_cache: Optional[LLMResponseCache] = field(default=None, repr=False)
+    # routing 통계를 요청 간에 누적한다 (router_enabled 가 아니면 None)
+    router: Optional[QueryRouter] = field(default=None, repr=False)
+    # tokenizer 를 요청 간에 공유한다
+    context_packer: Optional[ContextPacker] = field(default=None, repr=False)
+    # LLM 호출용 thread / connection pool 도 요청 간에 공유하도록 container 의 Singleton 을 주입받는다
+    llm: Optional[SageMakerLLMAdapter] = field(default=None, repr=False)
+    # 동시 생성 수 / 대기열을 모든 요청이 공유한다 (admission_max_in_flight 가 0 이면 None)
+    admission: Optional[AdmissionController] = field(default=None, repr=False)
 
     def __post_init__(self):
         if isinstance(self.config, dict):
             self.config = LangchainRAGAnalyzerConfig(**self.config)
+        if self.cpu_executor is None:
+            self.cpu_executor = CPUExecutor(
+                max_workers=self.config.cpu_workers, max_pending=self.config.cpu_max_pending
+            )
+
+        if self.search_service is None:
+            self.search_service = build_search_service(
+                self.config, embedding=self.embedding, vector_store=self.vector_store, executor=self.cpu_executor
+            )
+        if self.reranker is None:
+            self.reranker = build_reranker(self.config, executor=self.cpu_executor)
+        if self.answer_cache is None:
+            self.answer_cache = build_answer_cache(self.config, vector_store=self.vector_store)
+        if self.response_cache is None:
+            self.response_cache = build_response_cache(self.config)
+        if self.router is None:
+            self.router = build_query_router(self.config)
+        if self.context_packer is None:
+            self.context_packer = build_context_packer(self.config)
+        if self.llm is None:
+            self.llm = SageMakerLLMAdapter(
+                endpoint_name=self.config.endpoint_name,
+                region=self.config.region,
+                max_connections=self.config.llm_max_connections,
+            )
+        if self.admission is None:
+            self.admission = build_admission_controller(self.config)
 
-        self.sagemaker_client = boto3.client("sagemaker-runtime", region_name=self.config.region)
+    async def _prepare(self, request: ChatCompletionRequest, filter: Optional[Dict[str, Any]]) -> _PreparedRequest:
+        query = next((msg.content for msg in reversed(request.messages) if msg.role == "user"), "")
+        options = request.retrieval
+        search_mode = (options and options.search_mode) or self.config.search_mode
+        top_k = (options and options.top_k) or self.config.top_k
+        filter = {**(options.filter if options else {}), **(filter or {})} or None
+        rerank = self.reranker is not None and (options is None or options.rerank is not False)
 
-        self.hybrid_retriever = HybridRetriever(
-            vector_store=self.vector_store,
-            embedding=self.embedding,
-            rrf_k=self.config.rrf_k,
+        print(f"[RAG] Query: {query[:100]}, mode: {search_mode}, top_k: {top_k}, filter: {filter}", flush=True)
+        history = history_window(
+            [{"role": msg.role, "content": msg.content} for msg in request.messages[:-1]],
+            max_messages=self.config.history_max_messages,
+            chunk=self.config.history_chunk,
         )
 
-    async def ainvoke(
-        self,
-        request: ChatCompletionRequest,
-        filter: Optional[Dict[str, Any]] = None,
-    ) -> ChatCompletionResponse:
-        query = next((msg.content for msg in reversed(request.messages) if msg.role == "user"), "")
+        # 검색 옵션을 직접 지정한 요청은 항상 검색한다
+        if self.router is not None and options is None:
+            decision = self.router.route(query, has_history=any(msg.role != "system" for msg in request.messages[:-1]))
+            if not decision.retrieve:
+                # embedding / Qdrant 호출 없이 이전 대화만으로 답한다
+                print(f"[RAG] Retrieval skipped ({decision.reason})", flush=True)
+                with stage("prompt"):
+                    messages = build_messages(query, None, history)
+                return _PreparedRequest(
+                    query=query,
+                    payload=self._payload(request, messages),
+                    retrieval=RetrievalInfo(search_mode=search_mode, documents=0, skipped=decision.reason),
+                    context_docs=[],
+                )
 
-        print(f"[RAG] Query: {query[:100]}, top_k: {self.config.top_k}", flush=True)
-        context_docs = await self.hybrid_retriever.retrieve(
+        retrieval_context = self.search_service.create_context(query)
+
+        # 이전 대화에 따라 답이 달라지는 multi-turn 요청은 캐시하지 않는다
+        use_answer_cache = (
+            self.answer_cache is not None
+            and request.cache is not False
+            and sum(msg.role != "system" for msg in request.messages) == 1
+        )
+        cache_scope = query_vector = None
+        if use_answer_cache:
+            query_vector = await retrieval_context.query_vector()
+            cache_scope = SemanticAnswerCache.scope(self.config.model_name, search_mode, filter)
+            with stage("answer_cache"):
+                cached = await self.answer_cache.lookup(query_vector, cache_scope)
+            if cached is not None:
+                print("[RAG] Answer cache hit", flush=True)
+                retrieval = cached.retrieval or RetrievalInfo(search_mode=search_mode, documents=0)
+                cached = cached.model_copy(
+                    update={
+                        "id": f"chatcmpl-{uuid.uuid4().hex}",
+                        "created": int(time.time()),
+                        "model": request.model or self.config.model_name,
+                        "usage": None,
+                        "retrieval": retrieval.model_copy(update={"cached": True}),
+                    }
+                )
+                return _PreparedRequest(
+                    query=query, payload={}, retrieval=cached.retrieval, context_docs=[], cached=cached
+                )
+
+        context_docs = await self.search_service.search(
             query=query,
-            top_k=self.config.top_k,
+            # rerank 할 때는 후보를 넓게 가져오고 cross-encoder 상위 top_k 개만 프롬프트에 넣는다
+            top_k=max(top_k, self.config.rerank_candidates) if rerank else top_k,
             filter=filter,
+            search_mode=search_mode,
+            context=retrieval_context,
+            budget_ms=options.budget_ms if options else None,
         )
         print(f"[RAG] Found {len(context_docs)} documents", flush=True)
+        if retrieval_context.dropped_branches:
+            print(f"[RAG] Dropped branches (budget exceeded): {retrieval_context.dropped_branches}", flush=True)
+        if rerank and context_docs:
+            with stage("rerank"):
+                context_docs = await self.reranker.rerank(query, context_docs, top_n=top_k)
+            print(f"[RAG] Reranked to {len(context_docs)} documents", flush=True)
         if context_docs:
             print(f"[RAG] First doc: {context_docs[0].title[:50]}... (score: {context_docs[0].score:.4f})", flush=True)
         else:
             print("[RAG] No documents found!", flush=True)
-        context_text = format_context_docs(context_docs)
 
-        enhanced_query = __PROMPT_TEMPLATE__.format(context=context_text, question=query)
+        # 생성 토큰과 나머지 프롬프트를 뺀 만큼만 검색 문서를 넣는다
+        with stage("prompt"):
+            prompt = [msg["content"] for msg in build_messages(query, "", history)]
+            packed = await self.cpu_executor.run(
+                self.context_packer.pack, context_docs, prompt, self._max_tokens(request)
+            )
+            context_docs = packed.documents
+            messages = build_messages(query, format_context_docs(context_docs), history)
+        print(f"[RAG] Packed {len(context_docs)} documents ({packed.tokens}/{packed.budget} tokens)", flush=True)
 
-        messages = [
-            {"role": "system", "content": __SYSTEM_PROMPT__},
-            *[{"role": msg.role, "content": msg.content} for msg in request.messages[-5:-1]],
-            {"role": "user", "content": enhanced_query},
-        ]
+        return _PreparedRequest(
+            query=query,
+            payload=self._payload(request, messages),
+            retrieval=RetrievalInfo(
+                search_mode=search_mode,
+                documents=len(context_docs),
+                dropped_branches=retrieval_context.dropped_branches,
+                reranked=rerank,
+                context_tokens=packed.tokens,
+            ),
+            context_docs=context_docs,
+            cache_scope=cache_scope,
+            query_vector=query_vector,
+        )
+
+    def _max_tokens(self, request: ChatCompletionRequest) -> int:
+        # "max_tokens": null 이면 설정한 기본값을 컨텍스트 budget 과 vLLM 요청에 똑같이 쓴다
+        return request.max_tokens or self.config.default_max_tokens
 
-        payload = {
+    def _payload(self, request: ChatCompletionRequest, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        return {
             "model": self.config.model_name,
             "messages": messages,
             "temperature": request.temperature,
-            "max_tokens": request.max_tokens,
-            "stream": self.config.stream,
+            "max_tokens": self._max_tokens(request),
+            "stream": False,
         }
 
-        try:
-            response = self.sagemaker_client.invoke_endpoint(
-                EndpointName=self.config.endpoint_name, ContentType="application/json", Body=json.dumps(payload)
-            )
+    def _use_response_cache(self, request: ChatCompletionRequest) -> bool:
+        # temperature 0 이거나 cache=true 로 명시한 요청(내부 bot 등)만 같은 응답을 돌려줘도 된다
+        if self.response_cache is None or request.cache is False:
+            return False
+        return request.temperature == 0 or request.cache is True
+
+    @asynccontextmanager
+    async def _llm_slot(self) -> AsyncIterator[None]:
+        if self.admission is None:
+            yield
+            return
+        async with self.admission.slot():
+            yield
+
+    async def _remember(self, prepared: _PreparedRequest, response: ChatCompletionResponse) -> None:
+        # 근거 문서가 없거나 일부 검색 분기가 빠진 답변은 재사용하지 않는다
+        if prepared.cache_scope is None or not prepared.context_docs or prepared.retrieval.dropped_branches:
+            return
+        await self.answer_cache.put(
+            prepared.query, prepared.query_vector, prepared.cache_scope, prepared.context_docs, response
+        )
+
+    async def ainvoke(
+        self,
+        request: ChatCompletionRequest,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> ChatCompletionResponse:
+        # 대기열이 가득 찼으면 검색도 하지 않고 바로 돌려보낸다
+        if self.admission is not None:
+            self.admission.check()
+        prepared = await self._prepare(request, filter)
+        if prepared.cached is not None:
+            return prepared.cached
+
+        # 결정적인 요청은 endpoint 를 부르기 전에 같은 프롬프트의 이전 응답을 찾는다
+        cache_key = None
+        if self._use_response_cache(request):
+            cache_key = self.response_cache.key(prepared.payload)
+            with stage("response_cache"):
+                cached = await self.response_cache.get(cache_key)
+            if cached is not None:
+                print("[RAG] Response cache hit", flush=True)
+                return cached.model_copy(
+                    update={
+                        "id": f"chatcmpl-{uuid.uuid4().hex}",
+                        "created": int(time.time()),
+                        "model": request.model or self.config.model_name,
+                        "usage": None,
+                        "retrieval": prepared.retrieval.model_copy(update={"cached": True}),
+                    }
+                )
+
+        async with self._llm_slot():
+            try:
+                with stage("llm"):
+                    result = await self.llm.invoke(prepared.payload)
 
-            result = json.loads(response["Body"].read())
+                chat_response = ChatCompletionResponse(**result)
+                chat_response.model = request.model or self.config.model_name
+                chat_response.retrieval = prepared.retrieval
+            except Exception as e:
+                raise exceptions.RAGException(f"Failed to invoke SageMaker endpoint: {str(e)}")
 
-            chat_response = ChatCompletionResponse(**result)
-            chat_response.model = request.model or self.config.model_name
+        if cache_key is not None:
+            await self.response_cache.put(cache_key, chat_response)
+        await self._remember(prepared, chat_response)
+        return chat_response
 
-            return chat_response
-        except Exception as e:
-            raise exceptions.RAGException(f"Failed to invoke SageMaker endpoint: {str(e)}")
+    async def astream(
+        self,
+        request: ChatCompletionRequest,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[ChatCompletionChunk]:
+        """vLLM 의 SSE 응답을 ``chat.completion.chunk`` 단위로 그대로 넘긴다. 검색 정보는 첫 chunk 에 싣는다."""
+        if self.admission is not None:
+            self.admission.check()
+        prepared = await self._prepare(request, filter)
+        model = request.model or self.config.model_name
+
+        if (cached := prepared.cached) is not None:
+            # cache 에서 가져온 답변은 한 chunk 로 보낸다
+            choice = cached.choices[0]
+            yield ChatCompletionChunk(
+                id=cached.id,
+                created=cached.created,
+                model=model,
+                choices=[
+                    ChatCompletionChunkChoice(
+                        index=0,
+                        delta=ChatCompletionDelta(role="assistant", content=choice.message.content),
+                        finish_reason=choice.finish_reason or "stop",
+                    )
+                ],
+                retrieval=cached.retrieval,
+            )
+            return
+
+        # 마지막 chunk 로 usage 를 받는다
+        payload = {**prepared.payload, "stream": True, "stream_options": {"include_usage": True}}
+        contents: List[str] = []
+        chunk = finish_reason = None
+        # 스트림이 끝나거나 클라이언트가 끊을 때까지 자리를 차지한다
+        async with self._llm_slot():
+            start = time.perf_counter()
+            try:
+                # 클라이언트가 끊겨 이 generator 가 닫히면 endpoint 스트림도 바로 닫는다
+                async with aclosing(self.llm.stream(payload)) as stream:
+                    async for data in stream:
+                        first = chunk is None
+                        chunk = ChatCompletionChunk.model_validate_json(data)
+                        chunk.model = model
+                        if first:
+                            record_stage("llm_ttfb", (time.perf_counter() - start) * 1000)
+                            chunk.retrieval = prepared.retrieval
+                        for choice in chunk.choices:
+                            contents.append(choice.delta.content or "")
+                            finish_reason = choice.finish_reason or finish_reason
+                        yield chunk
+            except Exception as e:
+                raise exceptions.RAGException(f"Failed to stream from SageMaker endpoint: {str(e)}")
+            record_stage("llm", (time.perf_counter() - start) * 1000)
+
+        if chunk is not None:
+            await self._remember(
+                prepared,
+                ChatCompletionResponse(
+                    id=chunk.id,
+                    created=chunk.created,
+                    model=model,
+                    choices=[
+                        ChatCompletionChoice(
+                            index=0,
+                            message=ChatMessage(role="assistant", content="".join(contents)),
+                            finish_reason=finish_reason,
+                        )
+                    ],
+                    usage=chunk.usage,
+                    retrieval=prepared.retrieval,
+                ),
+            )
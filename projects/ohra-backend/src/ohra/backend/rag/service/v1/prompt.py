@@ -1,22 +1,28 @@
 from langchain_core.prompts import PromptTemplate
-from typing import List
+from typing import Dict, List, Optional
 from .schema import RetrievedDocument
 
 
-def format_context_docs(context_docs: List[RetrievedDocument], max_content_length: int = 2000) -> str:
+def format_document(doc: RetrievedDocument, content: Optional[str] = None) -> str:
+    parts = [f"<title>{doc.title}</title>", f"<content>{doc.content if content is None else content}</content>"]
+    if url := doc.metadata.get("url"):
+        parts.append(f"<url>{url}</url>")
+    return "<document>\n" + "\n".join(parts) + "\n</document>"
+
+
+def format_context_docs(context_docs: List[RetrievedDocument], max_content_length: Optional[int] = None) -> str:
+    # 길이 제한은 ContextPacker 가 토큰 단위로 맞추므로 max_content_length 는 기본적으로 쓰지 않는다
     contents = []
     for doc in context_docs:
         if content := doc.content:
-            if len(content) > max_content_length:
+            if max_content_length is not None and len(content) > max_content_length:
                 content = content[:max_content_length] + "..."
-            parts = [f"<title>{doc.title}</title>", f"<content>{content}</content>"]
-            if url := doc.metadata.get("url"):
-                parts.append(f"<url>{url}</url>")
-            contents.append("<document>\n" + "\n".join(parts) + "\n</document>")
+            contents.append(format_document(doc, content))
 
     return "\n\n".join(contents) if contents else "제공된 문서가 없습니다."
 
 
+# 모든 요청이 같은 system prompt 로 시작해야 vLLM prefix cache 를 공유한다 (요청마다 바뀌는 값을 넣지 말 것)
 __SYSTEM_PROMPT__ = """You are OHRA, an AI assistant for AHA&Company.
 
 Answer the user's question directly and concisely.
@@ -31,18 +37,47 @@ Rules:
 6. For AHA&Company related questions, you can use general knowledge if documents are not available or not relevant.
 7. Do not make up or assume previous conversations that are not in the message history.
 8. If the question asks about conversation context (e.g., "우리 무슨 얘기하고 있어"),
-   use the message history, not documents."""
+   use the message history, not documents.
+
+Citations:
+- If you use information from the documents, cite the source using the <title> and <url> from the document tags.
+- Format citations as: [title](url) if URL is available, or just "title" if no URL.
+- If the documents are directly relevant, use them to provide an accurate answer with proper citations.
+- If the documents are NOT relevant, ignore them completely and answer based on your knowledge."""
 
+# 요청마다 달라지는 부분(검색 문서, 질문)은 마지막 user 메시지에만 둔다
 __PROMPT_TEMPLATE__ = PromptTemplate(
     template="""Reference documents (only use if directly relevant):
 {context}
 
 Question: {question}
 
-Answer the question directly and concisely.
-- If you use information from the documents, cite the source using the <title> and <url> from the document tags.
-- Format citations as: [title](url) if URL is available, or just "title" if no URL.
-- If the documents are directly relevant, use them to provide an accurate answer with proper citations.
-- If the documents are NOT relevant, ignore them completely and answer based on your knowledge.""",
+Answer the question directly and concisely.""",
     input_variables=["context", "question"],
 )
+
+
+def history_window(history: List[Dict[str, str]], max_messages: int = 10, chunk: int = 6) -> List[Dict[str, str]]:
+    """이전 대화 중 프롬프트에 넣을 부분.
+
+    최근 ``max_messages`` 개를 매 턴 한 칸씩 미는 대신 시작 위치를 ``chunk`` 단위로만 옮겨,
+    같은 대화의 연속된 요청이 system prompt 뒤의 대화 앞부분까지 같은 prefix 를 갖게 한다.
+    """
+    overflow = len(history) - max_messages
+    if overflow <= 0:
+        return list(history)
+    start = -(-overflow // chunk) * chunk
+    return list(history[start:])
+
+
+def build_messages(question: str, context: Optional[str], history: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """static system prompt → 이전 대화 → (검색 문서 + 질문) 순서의 chat messages
+
+    ``context`` 가 None 이면(검색을 생략한 질의) 질문만 보낸다.
+    """
+    question = question if context is None else __PROMPT_TEMPLATE__.format(context=context, question=question)
+    return [
+        {"role": "system", "content": __SYSTEM_PROMPT__},
+        *history,
+        {"role": "user", "content": question},
+    ]
@@ -0,0 +1,84 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Optional
+import hashlib
+import json
+import logging
+
+from redis.exceptions import RedisError
+
+from ohra.shared_kernel.infra.settings.model import CacheSettings
+from ohra.backend.rag.dtos.response import ChatCompletionResponse
+from ohra.backend.rag.service.v1.settings import LangchainRAGAnalyzerConfig
+
+if TYPE_CHECKING:
+    from fastapi_cache.backends import Backend
+
+logger = logging.getLogger(__name__)
+
+# 응답을 바꾸는 생성 파라미터만 key 에 넣는다
+KEY_FIELDS = ("model", "messages", "temperature", "max_tokens")
+
+
+@dataclass
+class LLMResponseCache:
+    """최종 프롬프트와 생성 파라미터가 완전히 같은 요청의 LLM 응답을 재사용하는 exact-match cache.
+
+    프롬프트에 검색 문서가 들어가므로 문서가 바뀌면 key 도 바뀐다.
+    backend(in-memory / Redis) 장애는 miss 로 처리해 답변 생성을 막지 않는다.
+    """
+
+    backend: "Backend" = field(repr=False)
+    expire: int = 3600
+    prefix: str = "ohra:llm:"
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    errors: int = field(default=0, init=False)
+
+    def key(self, payload: Dict[str, Any]) -> str:
+        params = json.dumps({name: payload.get(name) for name in KEY_FIELDS}, sort_keys=True, ensure_ascii=False)
+        return self.prefix + hashlib.sha256(params.encode()).hexdigest()
+
+    async def get(self, key: str) -> Optional[ChatCompletionResponse]:
+        try:
+            value = await self.backend.get(key)
+        except (RedisError, OSError) as e:
+            logger.warning(f"Response cache lookup failed: {e}")
+            self.errors += 1
+            value = None
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return ChatCompletionResponse.model_validate_json(value)
+
+    async def put(self, key: str, response: ChatCompletionResponse) -> None:
+        try:
+            await self.backend.set(key, response.model_dump_json().encode(), expire=self.expire)
+        except (RedisError, OSError) as e:
+            logger.warning(f"Response cache store failed: {e}")
+            self.errors += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def build_response_cache(config: LangchainRAGAnalyzerConfig) -> Optional[LLMResponseCache]:
+    """``response_cache_enabled`` 일 때만 만든다. ``response_cache_url`` 이 있으면 Redis, 없으면 process 메모리(LRU)."""
+    if not config.response_cache_enabled:
+        return None
+    # fastapi-cache2 backend 는 cache 를 켰을 때만 불러온다
+    from ohra.shared_kernel.infra.cache import build_cache_backend
+
+    setting = CacheSettings(
+        backend_url=config.response_cache_url,
+        expire=config.response_cache_ttl,
+        max_entries=config.response_cache_max_entries,
+    )
+    return LLMResponseCache(backend=build_cache_backend(setting), expire=setting.expire)
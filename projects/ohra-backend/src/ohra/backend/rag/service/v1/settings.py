@@ -1,3 +1,5 @@
+from typing import Literal, Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -6,5 +8,44 @@ class LangchainRAGAnalyzerConfig(BaseModel):
     endpoint_name: str = Field(default="qwen3-4b-instruct-2507-vllm-endpoint-1")
     region: str = Field(default="ap-northeast-2")
     top_k: int = Field(default=5)
-    stream: bool = Field(default=False)
+    stream: bool = Field(default=True)  # 요청의 stream=true 를 SSE 로 응답할지 (false 면 항상 한 번에 응답)
     rrf_k: int = Field(default=60)  # RRF constant default 60
+    sparse_tokenizer: str = Field(default="ngram")  # 색인과 동일한 토크나이저 사용 ("ngram" | "kiwi")
+    search_mode: Literal["vector", "keyword", "hybrid"] = Field(default="hybrid")
+    keyword_retriever: Literal["sparse", "bm25"] = Field(default="sparse")  # Qdrant sparse | 인메모리 BM25
+    keyword_index_dir: Optional[str] = Field(default=None)  # BM25 snapshot 경로 (없으면 Qdrant scroll 로 색인)
+    retrieval_budget_ms: Optional[float] = Field(default=2000)  # 검색 분기별 deadline (None 이면 제한 없음)
+    retrieval_cache_size: int = Field(default=1024)  # 검색 결과 cache 항목 수 (0 이면 끔)
+    # cross-encoder rerank: 후보를 넓게 검색한 뒤 상위 top_k 개만 프롬프트에 넣는다 (model_dir 이 없으면 사용 안 함)
+    rerank_model_dir: Optional[str] = Field(default=None)  # int8 ONNX model.onnx + tokenizer.json 경로
+    rerank_candidates: int = Field(default=20)  # rerank 전에 검색할 후보 수
+    rerank_batch_size: int = Field(default=16)
+    rerank_cache_size: int = Field(default=4096)  # (query, chunk) 점수 LRU cache 크기
+    # 대화 / 인사 등 검색이 필요 없는 질의는 embedding 과 Qdrant 검색을 건너뛴다
+    router_enabled: bool = Field(default=True)
+    router_model_path: Optional[str] = Field(default=None)  # 규칙으로 정하지 못한 질의용 classifier weight (JSON)
+    # 컨텍스트는 토큰 수 기준으로 채운다 (tokenizer 가 없으면 글자 수로 보수적으로 추정)
+    context_tokenizer: Optional[str] = Field(default=None)  # tokenizer.json 경로 또는 HuggingFace model id
+    max_model_len: int = Field(default=16384)  # vLLM --max-model-len
+    context_max_tokens: int = Field(default=6144)  # 검색 문서에 쓸 토큰 상한
+    default_max_tokens: int = Field(default=2000, gt=0)  # 요청의 max_tokens 가 null 일 때 생성 토큰 수
+    context_chunk_max_tokens: int = Field(default=1024)  # 문서 하나의 토큰 상한 (넘으면 문장 경계에서 자름)
+    # 이전 대화는 최대 history_max_messages 개를 넣되 시작 위치는 history_chunk 단위로 옮긴다 (prefix cache 재사용)
+    history_max_messages: int = Field(default=10)
+    history_chunk: int = Field(default=6)
+    # 비슷한 질문의 답변을 별도 Qdrant collection 에 저장해 재사용한다 (opt-in)
+    answer_cache_enabled: bool = Field(default=False)
+    answer_cache_collection: str = Field(default="ohra_answer_cache")
+    answer_cache_threshold: float = Field(default=0.95)  # 저장된 질문과의 cosine 유사도 하한
+    # 최종 프롬프트와 생성 파라미터가 같은 결정적인 요청의 LLM 응답을 재사용한다 (opt-in)
+    response_cache_enabled: bool = Field(default=False)
+    response_cache_url: Optional[str] = Field(default=None)  # Redis URL, 없으면 process 메모리
+    response_cache_ttl: int = Field(default=3600)  # 초
+    response_cache_max_entries: int = Field(default=1024)  # process 메모리 cache 의 최대 항목 수 (LRU)
+    llm_max_connections: int = Field(default=32)  # LLM endpoint 동시 호출 수 (thread / HTTP connection pool 크기)
+    # LLM endpoint 앞의 admission control: 동시 생성 수를 넘는 요청은 제한된 대기열에서 deadline 까지만 기다린다
+    admission_max_in_flight: int = Field(default=32)  # 0 이면 제한 없음
+    admission_max_queue: int = Field(default=64)  # 대기열이 가득 차면 바로 429
+    admission_queue_timeout: float = Field(default=10.0)  # 대기 deadline (초), 넘으면 429
+    cpu_workers: int = Field(default=4)  # 토큰화/BM25 점수 계산용 thread 수 (0 이면 이벤트 루프에서 바로 실행)
+    cpu_max_pending: int = Field(default=64)  # executor 에 동시에 넣을 수 있는 작업 수 상한
@@ -1,11 +1,18 @@
+import re
+import time
 import uuid
 import logging
-from dataclasses import dataclass
+import unicodedata
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Hashable, List, Optional
 
 from ohra.shared_kernel.infra.database.sqla.mixin import AsyncSqlaMixIn
+from ohra.shared_kernel.infra.executor import SingleFlight
+from ohra.shared_kernel.infra.timing import current_timings, stage
 from ohra.backend.rag.service.v1.pipeline import LangchainRAGAnalyzer
 from ohra.backend.rag.dtos.request import ChatCompletionRequest
-from ohra.backend.rag.dtos.response import ChatCompletionResponse
+from ohra.backend.rag.dtos.response import ChatCompletionChunk, ChatCompletionResponse
 from ohra.backend.rag.entities.message import Message
 from ohra.backend.rag.models.message_model import MessageModel
 from ohra.backend.rag import exceptions
@@ -15,7 +22,16 @@ logger = logging.getLogger(__name__)
 
 @dataclass
 class ChatCompletionUseCase(AsyncSqlaMixIn):
+    """process 당 하나(container Singleton)만 만들어 실행 중인 요청 목록을 모든 요청이 공유한다.
+
+    같은 질문이 거의 동시에 여러 번 들어오면(공유된 링크 등) 검색과 생성을 한 번만 하고 결과를 나눈다.
+    스트리밍 요청은 합치지 않는다.
+    """
+
     analyzer: LangchainRAGAnalyzer
+    coalesce_enabled: bool = True
+    coalesce_max_temperature: float = 0.3  # 이 temperature 이하인 요청만 합친다 (답변이 거의 같은 경우)
+    single_flight: SingleFlight = field(default_factory=SingleFlight, repr=False)
 
     def _message_to_model(self, message: Message) -> MessageModel:
         return MessageModel(
@@ -25,28 +41,80 @@ class ChatCompletionUseCase(AsyncSqlaMixIn):
             content=message.content,
         )
 
-    async def execute(self, user_id: str, request: ChatCompletionRequest) -> ChatCompletionResponse:
+    def _validate(self, request: ChatCompletionRequest) -> None:
         user_messages = [msg for msg in request.messages if msg.role == "user"]
         if not user_messages:
             raise exceptions.InvalidMessageRoleException("No user message found in request")
 
-        response = await self.analyzer.ainvoke(request)
+    def _coalesce_key(self, request: ChatCompletionRequest) -> Optional[Hashable]:
+        """생성 결과가 같아야 하는 요청끼리 같은 key. 합치지 않는 요청은 None"""
+        if request.coalesce is False or not self.coalesce_enabled:
+            return None
+        if request.coalesce is None and (request.temperature or 0.0) > self.coalesce_max_temperature:
+            return None
+        messages = tuple(
+            (msg.role, re.sub(r"\s+", " ", unicodedata.normalize("NFC", msg.content)).strip())
+            for msg in request.messages
+        )
+        retrieval = request.retrieval.model_dump_json(exclude_none=True) if request.retrieval else None
+        return (messages, request.model, request.temperature, request.max_tokens, retrieval, request.cache)
+
+    async def _save_assistant_message(self, request: ChatCompletionRequest, response_text: str) -> None:
+        if not response_text:
+            return
 
-        if response.choices:
-            response_text = response.choices[0].message.content
-
-            if response_text:
-                conversation_id = request.user or str(uuid.uuid4())
-                assistant_message = Message(
-                    id=f"msg_{uuid.uuid4()}",
-                    conversation_id=conversation_id,
-                    role="assistant",
-                    content=response_text,
+        conversation_id = request.user or str(uuid.uuid4())
+        assistant_message = Message(
+            id=f"msg_{uuid.uuid4()}",
+            conversation_id=conversation_id,
+            role="assistant",
+            content=response_text,
+        )
+
+        async with self.db.session() as session:
+            message_model = self._message_to_model(assistant_message)
+            session.add(message_model)
+            await session.commit()
+
+    async def execute(self, user_id: str, request: ChatCompletionRequest) -> ChatCompletionResponse:
+        self._validate(request)
+
+        key = self._coalesce_key(request)
+        if key is None:
+            response = await self.analyzer.ainvoke(request)
+        else:
+            response, shared = await self.single_flight.do(key, lambda: self.analyzer.ainvoke(request))
+            if shared:
+                # 함께 기다린 요청은 토큰을 쓰지 않았다
+                logger.info(f"Coalesced chat completion: {response.id}")
+                response = response.model_copy(
+                    update={
+                        "id": f"chatcmpl-{uuid.uuid4().hex}",
+                        "created": int(time.time()),
+                        "usage": None,
+                        "retrieval": response.retrieval
+                        and response.retrieval.model_copy(update={"coalesced": True}),
+                    },
+                    deep=True,
                 )
 
-                async with self.db.session() as session:
-                    message_model = self._message_to_model(assistant_message)
-                    session.add(message_model)
-                    await session.commit()
+        if response.choices:
+            with stage("db"):
+                await self._save_assistant_message(request, response.choices[0].message.content)
 
+        if (timings := current_timings()) is not None:
+            response.timings = timings.as_dict()
         return response
+
+    async def stream(self, user_id: str, request: ChatCompletionRequest) -> AsyncIterator[ChatCompletionChunk]:
+        self._validate(request)
+
+        contents: List[str] = []
+        async with aclosing(self.analyzer.astream(request)) as chunks:
+            async for chunk in chunks:
+                contents.extend(choice.delta.content or "" for choice in chunk.choices if choice.index == 0)
+                yield chunk
+
+        # 스트림이 끝까지 전달된 경우에만 저장한다 (클라이언트가 중간에 끊으면 저장하지 않음)
+        with stage("db"):
+            await self._save_assistant_message(request, "".join(contents))
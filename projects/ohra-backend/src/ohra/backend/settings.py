@@ -27,6 +27,39 @@ class Settings(BaseSettings):
     qdrant_host: str = "localhost"
     qdrant_port: int = 6333
     qdrant_collection_name: str = "ohra_documents"
+    qdrant_sparse_tokenizer: str = "ngram"
+
+    index_dir: str = ""  # sync worker 가 게시하는 BM25 snapshot 경로
+
+    rag_search_mode: str = "hybrid"  # 요청에 retrieval.search_mode 가 없을 때 ("vector" | "keyword" | "hybrid")
+    rag_keyword_retriever: str = "sparse"  # keyword / hybrid 모드 검색기 ("sparse" | "bm25")
+    rag_retrieval_budget_ms: float = 2000.0  # 검색 분기별 deadline (0 이면 제한 없음)
+    rag_retrieval_cache_size: int = 1024  # sync generation 단위로 무효화되는 검색 결과 cache (0 이면 끔)
+    rag_rerank_model_dir: str = ""  # cross-encoder ONNX 모델 경로 (비어 있으면 rerank 단계 없음)
+    rag_rerank_candidates: int = 20
+    rag_router_enabled: bool = True  # 검색이 필요 없는 질의(대화 / 인사 등)는 검색 생략
+    rag_router_model_path: str = ""
+    # 컨텍스트 토큰 수 계산용 tokenizer.json 경로 (비어 있으면 추정치). HuggingFace model id 는 기동 시 내려받는다
+    rag_context_tokenizer: str = ""
+    rag_max_model_len: int = 16384
+    rag_context_max_tokens: int = 6144
+    rag_default_max_tokens: int = 2000  # 요청의 max_tokens 가 null 이면 이만큼 생성 토큰을 남기고 vLLM 에도 넘긴다
+    rag_answer_cache_enabled: bool = False  # semantic answer cache (요청의 cache=false 로 우회)
+    rag_answer_cache_collection: str = "ohra_answer_cache"
+    rag_answer_cache_threshold: float = 0.95
+    rag_response_cache_enabled: bool = False  # temperature 0 / cache=true 요청의 exact-match LLM 응답 cache
+    rag_response_cache_url: str = ""  # Redis URL (비어 있으면 worker process 메모리)
+    rag_response_cache_ttl: int = 3600
+    rag_response_cache_max_entries: int = 1024  # Redis 를 쓰지 않을 때 worker process 당 최대 항목 수
+    rag_llm_max_connections: int = 32  # 동시에 생성 중일 수 있는 LLM 요청 수 (초과분은 대기)
+    rag_admission_max_in_flight: int = 32  # LLM endpoint 로 동시에 보내는 요청 수 (0 이면 제한 없음)
+    rag_admission_max_queue: int = 64
+    rag_admission_queue_timeout: float = 10.0
+    rag_coalesce_enabled: bool = True  # 동시에 들어온 같은 요청은 한 번만 생성해 결과를 나눈다
+    rag_coalesce_max_temperature: float = 0.3  # 이 temperature 이하인 요청만 합친다
+    rag_cpu_workers: int = 4
+    rag_cpu_max_pending: int = 64
+    event_loop_lag_warn_ms: float = 100.0
 
     cors: CORSSettings = Field(default_factory=CORSSettings)
     gzip: GZipSettings = Field(default_factory=GZipSettings)
@@ -59,6 +92,7 @@ class Settings(BaseSettings):
             host=self.qdrant_host,
             port=self.qdrant_port,
             collection_name=self.qdrant_collection_name,
+            sparse_tokenizer=self.qdrant_sparse_tokenizer,
         )
 
     @property
@@ -66,6 +100,33 @@ class Settings(BaseSettings):
         return LangchainRAGAnalyzerConfig(
             endpoint_name=self.sagemaker_llm_endpoint,
             region=self.sagemaker_region,
+            sparse_tokenizer=self.qdrant_sparse_tokenizer,
+            search_mode=self.rag_search_mode,
+            keyword_retriever=self.rag_keyword_retriever,
+            keyword_index_dir=self.index_dir or None,
+            retrieval_budget_ms=self.rag_retrieval_budget_ms or None,
+            retrieval_cache_size=self.rag_retrieval_cache_size,
+            rerank_model_dir=self.rag_rerank_model_dir or None,
+            rerank_candidates=self.rag_rerank_candidates,
+            router_enabled=self.rag_router_enabled,
+            router_model_path=self.rag_router_model_path or None,
+            context_tokenizer=self.rag_context_tokenizer or None,
+            max_model_len=self.rag_max_model_len,
+            context_max_tokens=self.rag_context_max_tokens,
+            default_max_tokens=self.rag_default_max_tokens,
+            answer_cache_enabled=self.rag_answer_cache_enabled,
+            answer_cache_collection=self.rag_answer_cache_collection,
+            answer_cache_threshold=self.rag_answer_cache_threshold,
+            response_cache_enabled=self.rag_response_cache_enabled,
+            response_cache_url=self.rag_response_cache_url or None,
+            response_cache_ttl=self.rag_response_cache_ttl,
+            response_cache_max_entries=self.rag_response_cache_max_entries,
+            llm_max_connections=self.rag_llm_max_connections,
+            admission_max_in_flight=self.rag_admission_max_in_flight,
+            admission_max_queue=self.rag_admission_max_queue,
+            admission_queue_timeout=self.rag_admission_queue_timeout,
+            cpu_workers=self.rag_cpu_workers,
+            cpu_max_pending=self.rag_cpu_max_pending,
         )
 
     model_config = SettingsConfigDict(env_prefix="OHRA_", env_file=".env", env_file_encoding="utf-8", extra="allow")
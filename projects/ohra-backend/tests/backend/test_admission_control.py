@@ -0,0 +1,111 @@
+"""LLM endpoint 앞 admission control 테스트 (동시 생성 수 제한, 제한된 대기열, 429 + Retry-After)"""
+
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ohra.backend.rag import exceptions
+from ohra.backend.rag.service.v1.admission import AdmissionController
+from ohra.shared_kernel.domain.exception import BaseMsgException
+from ohra.shared_kernel.infra.fastapi.exception_handlers.base import custom_exception_handler
+from ohra.shared_kernel.infra.sagemaker import SageMakerLLMAdapter
+from tests.utils.fakes import build_analyzer, chat_request
+
+LLM_SECONDS = 0.2  # fake endpoint 의 답변 생성 시간 (초)
+
+
+async def _hold(admission: AdmissionController, seconds: float) -> float:
+    async with admission.slot():
+        await asyncio.sleep(seconds)
+    return seconds
+
+
+@pytest.mark.asyncio
+async def test_full_queue_is_rejected_immediately():
+    """평가대상: 동시 실행 + 대기열이 가득 차면 나머지 요청은 기다리지 않고 바로 429 를 받아야 함"""
+    admission = AdmissionController(max_in_flight=2, max_queue=2, queue_timeout=5.0)
+
+    start = time.perf_counter()
+    tasks = [asyncio.create_task(_hold(admission, LLM_SECONDS)) for _ in range(6)]
+    await asyncio.sleep(0.01)
+    stats = admission.stats()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert (stats["in_flight"], stats["queue_depth"]) == (2, 2)
+    rejected = [r for r in results if isinstance(r, exceptions.TooManyRequestsException)]
+    assert len(rejected) == 2
+    assert all(r.code == 429 and int(r.headers["Retry-After"]) >= 1 for r in rejected)
+    # 대기열을 기다린 두 요청은 앞의 요청이 끝난 뒤 실행된다
+    assert time.perf_counter() - start >= LLM_SECONDS * 2
+    assert admission.stats()["rejected_full"] == 2 and admission.stats()["admitted"] == 4
+    assert admission.stats()["wait_ms_max"] >= LLM_SECONDS * 1000 * 0.9
+
+
+@pytest.mark.asyncio
+async def test_queue_deadline_rejects_with_retry_after():
+    """평가대상: deadline 안에 자리가 나지 않으면 대기를 포기하고 429 를 받아야 함"""
+    admission = AdmissionController(max_in_flight=1, max_queue=10, queue_timeout=0.05)
+
+    holder = asyncio.create_task(_hold(admission, LLM_SECONDS))
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    with pytest.raises(exceptions.TooManyRequestsException):
+        await _hold(admission, 0)
+    waited = time.perf_counter() - start
+    await holder
+
+    assert 0.05 <= waited < LLM_SECONDS
+    assert admission.stats()["rejected_timeout"] == 1
+    assert admission.stats()["queue_depth"] == 0 and admission.stats()["in_flight"] == 0
+
+
+def test_too_many_requests_response_has_retry_after():
+    """평가대상: 429 응답에 Retry-After 헤더가 실려야 함"""
+    app = FastAPI(exception_handlers={BaseMsgException: custom_exception_handler})
+
+    @app.middleware("http")
+    async def correlation_id(request, call_next):
+        request.state.correlation_id = "test"
+        return await call_next(request)
+
+    @app.get("/busy")
+    async def busy():
+        raise exceptions.TooManyRequestsException(retry_after=3)
+
+    response = TestClient(app).get("/busy")
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "3"
+
+
+@pytest.mark.asyncio
+async def test_spike_is_bounded_at_the_endpoint(endpoint):
+    """평가대상: 요청이 몰려도 endpoint 동시 요청 수는 max_in_flight 이하이고 넘치는 요청만 빨리 실패해야 함"""
+    llm = SageMakerLLMAdapter(endpoint_name="fake", endpoint_url=endpoint.url)
+    admission = AdmissionController(max_in_flight=4, max_queue=8, queue_timeout=5.0)
+    analyzer = build_analyzer(llm=llm, admission=admission)
+    request = chat_request(retrieval={"top_k": 1})
+
+    async def call():
+        start = time.perf_counter()
+        try:
+            await analyzer.ainvoke(request)
+            return True, time.perf_counter() - start
+        except exceptions.TooManyRequestsException:
+            return False, time.perf_counter() - start
+
+    try:
+        results = await asyncio.gather(*[call() for _ in range(40)])
+    finally:
+        llm.shutdown()
+
+    served = [elapsed for ok, elapsed in results if ok]
+    rejected = [elapsed for ok, elapsed in results if not ok]
+    print(f"\n[admission] served {len(served)}, rejected {len(rejected)}, stats {admission.stats()}")
+    assert len(served) == 4 + 8 and len(rejected) == 40 - 12
+    assert endpoint.max_in_flight <= 4
+    assert max(rejected) < LLM_SECONDS / 2
+    assert admission.stats()["queue_depth"] == 0 and admission.stats()["in_flight"] == 0
@@ -1,109 +1,105 @@
-"""Backend API 동시 처리 한계 테스트"""
+"""Backend 동시 처리 한계 테스트 (로컬 fake LLM endpoint 대상, 반복 가능한 벤치마크)"""
 
-import pytest
 import asyncio
-import aiohttp
+import math
 import time
 from datetime import datetime
 from pathlib import Path
 
-from tests.utils.api_client import make_chat_request
+import pytest
+
+from ohra.backend.rag.service.v1.admission import AdmissionController
+from ohra.shared_kernel.infra.executor import EventLoopLagMonitor
+from ohra.shared_kernel.infra.sagemaker import SageMakerLLMAdapter
+from tests.utils.fakes import FakeRetriever, build_analyzer, chat_request
 from tests.utils.test_helpers import (
     print_test_header,
     print_test_summary,
     save_test_results,
 )
 
+LLM_SECONDS = 0.2  # fake endpoint 의 답변 생성 시간 (초)
+MAX_CONNECTIONS = 20
+CONCURRENT_COUNTS = [5, 10, 20, 50, 100]
+
 
 @pytest.mark.asyncio
-async def test_concurrent_limit():
-    """동시 처리 한계 탐색 테스트"""
+async def test_concurrent_limit(endpoint):
+    """평가대상: 동시 요청이 connection pool 크기 단위로 처리되고 생성 중에도 이벤트 루프가 막히지 않아야 함"""
     test_start = time.time()
 
     test_info = {
-        "test_name": "Backend API 동시 처리 한계 테스트",
+        "test_name": "Backend 동시 처리 한계 테스트",
         "test_type": "backend",
-        "is_evaluation_target": False,
+        "is_evaluation_target": True,
         "started_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
     }
 
     print_test_header(
         test_info["test_name"],
-        "동시 요청 수를 점진적으로 증가시켜 최대 동시 처리 가능 수를 확인합니다.",
-        is_evaluation_target=False,
+        f"응답에 {LLM_SECONDS}s 걸리는 로컬 endpoint 에 동시 요청 수를 늘려 가며 처리 시간과 event-loop lag 를 잽니다.",
+        is_evaluation_target=True,
     )
 
-    query = "ai 아메바는 무슨일을 해"
-    concurrent_counts = [5, 10, 20, 50, 100]
-
-    print(f"[INFO] 테스트 쿼리: {query}")
-    print(f"[INFO] 테스트할 동시 요청 수: {concurrent_counts}\n")
+    llm = SageMakerLLMAdapter(endpoint_name="fake", max_connections=MAX_CONNECTIONS, endpoint_url=endpoint.url)
+    analyzer = build_analyzer(
+        FakeRetriever("아메바", "ai 아메바 소개"),
+        llm=llm,
+        # 거절 없이 모든 요청을 대기열에 받아 pool 단위 처리 시간을 잰다
+        admission=AdmissionController(max_in_flight=MAX_CONNECTIONS, max_queue=max(CONCURRENT_COUNTS)),
+    )
+    request = chat_request("ai 아메바는 무슨일을 해", retrieval={"search_mode": "keyword"})
 
     results = []
-
-    async with aiohttp.ClientSession() as session:
-        for count in concurrent_counts:
-            print(f"\n[TESTING] 동시 요청 수: {count}")
-            print("  요청 시작...")
-
-            start_time = time.time()
-            tasks = [make_chat_request(session, query) for _ in range(count)]
-            responses = await asyncio.gather(*tasks, return_exceptions=True)
-            elapsed = time.time() - start_time
-
-            # 결과 분석
-            success_count = sum(1 for r in responses if isinstance(r, dict) and r.get("status") == 200)
-            failure_count = count - success_count
-            success_rate = (success_count / count) * 100
-
-            elapsed_times = [
-                r.get("elapsed_time", 0) for r in responses if isinstance(r, dict) and r.get("status") == 200
-            ]
-            avg_response_time = sum(elapsed_times) / len(elapsed_times) if elapsed_times else 0
-
-            test_result = {
-                "concurrent_count": count,
-                "success_count": success_count,
-                "failure_count": failure_count,
-                "success_rate": f"{success_rate:.1f}%",
-                "avg_response_time": f"{avg_response_time:.3f}s",
-                "total_elapsed_time": f"{elapsed:.3f}s",
-            }
-
-            results.append(test_result)
-
+    try:
+        for count in CONCURRENT_COUNTS:
+            monitor = EventLoopLagMonitor(interval=0.01, warn_threshold=None)
+            monitor.start()
+
+            start_time = time.perf_counter()
+            responses = await asyncio.gather(*[analyzer.ainvoke(request) for _ in range(count)], return_exceptions=True)
+            elapsed = time.perf_counter() - start_time
+            await monitor.stop()
+
+            success_count = sum(1 for r in responses if not isinstance(r, BaseException))
+            # pool 크기만큼씩 순서대로 처리될 때의 이론 시간
+            expected = LLM_SECONDS * math.ceil(count / MAX_CONNECTIONS)
+            lag = monitor.stats()
+
+            results.append(
+                {
+                    "concurrent_count": count,
+                    "success_count": success_count,
+                    "total_elapsed_time": f"{elapsed:.3f}s",
+                    "expected_elapsed_time": f"{expected:.3f}s",
+                    "throughput_rps": f"{count / elapsed:.1f}",
+                    "loop_lag_max_ms": f"{lag['max_ms']:.1f}",
+                }
+            )
             print(
-                f"  결과: 성공={success_count}/{count} ({success_rate:.1f}%), 평균 응답 시간={avg_response_time:.3f}s"
+                f"  동시 {count:>3}: 성공={success_count}/{count}, {elapsed:.3f}s (이론 {expected:.3f}s), "
+                f"{count / elapsed:.1f} req/s, loop lag max={lag['max_ms']:.1f}ms"
             )
 
-            # 실패율이 50% 이상이면 중단
-            if success_rate < 50:
-                print("  [WARNING] 성공률이 50% 미만이므로 테스트 중단")
-                break
+            assert success_count == count
+            # 요청이 직렬로 처리되면 count * LLM_SECONDS 가 걸린다
+            assert elapsed < expected * 1.5 + 0.1
+            assert lag["max_ms"] < 100
+    finally:
+        llm.shutdown()
 
-            # 요청 간 간격
-            await asyncio.sleep(1)
-
-    # 최종 결과
-    valid_results = [r for r in results if float(r["success_rate"].rstrip("%")) >= 50]
-    max_concurrent = max(r["concurrent_count"] for r in valid_results) if valid_results else 0
+    assert endpoint.max_in_flight <= MAX_CONNECTIONS
 
     test_info["completed_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     test_info["total_duration"] = time.time() - test_start
     test_info["results"] = results
     test_info["summary"] = {
-        "max_concurrent_requests": max_concurrent,
-        "recommended_concurrent_requests": min(max_concurrent, 20) if max_concurrent > 0 else 5,
+        "llm_latency": LLM_SECONDS,
+        "max_connections": MAX_CONNECTIONS,
+        "max_in_flight": endpoint.max_in_flight,
     }
 
     print_test_summary(test_info)
 
-    print("\n[한계 테스트 결과]")
-    print(f"최대 동시 처리 가능 수: {max_concurrent}")
-    print(f"권장 동시 요청 수: {test_info['summary']['recommended_concurrent_requests']}")
-
-    # 결과 저장
     output_dir = Path(__file__).parent.parent / "results"
     save_test_results("backend_concurrent_limit", test_info, output_dir)
-
-    return test_info
@@ -0,0 +1,76 @@
+"""요청마다 RAG 객체 그래프를 새로 만드는(Factory) 비용과 Singleton 재사용 비용 비교 (pytest-benchmark)"""
+
+import timeit
+
+import pytest
+from dependency_injector import containers, providers
+
+from ohra.backend.rag.containers.di import RAGContainer
+from ohra.backend.rag.service.v1.pipeline import LangchainRAGAnalyzer
+from ohra.backend.rag.use_case.chat_use_case import ChatCompletionUseCase
+from ohra.backend.settings import Settings
+from ohra.shared_kernel.infra.database.sqla.container.di import SqlaContainer
+
+pytest.importorskip("pytest_benchmark")
+
+
+class _Container(containers.DeclarativeContainer):
+    # AsyncSqlaMixIn 이 "database.async_db" 를 주입받을 수 있는 최소 구성 (embedding / Qdrant 는 쓰지 않음)
+    settings = providers.Object(Settings())
+    database = providers.Container(SqlaContainer, settings=settings.provided.db)
+    rag = providers.Container(
+        RAGContainer, settings=settings, embedding=providers.Object(None), vector_store=providers.Object(None)
+    )
+
+
+@pytest.fixture(scope="module")
+def container():
+    container = _Container()
+    container.wire(modules=["ohra.shared_kernel.infra.database.sqla.mixin"])
+    yield container
+    container.unwire()
+    container.rag.cpu_executor().shutdown()
+    container.rag.llm().shutdown()
+
+
+def _factory_use_case(rag) -> providers.Factory:
+    """이전 구성: 요청마다 config 를 다시 만들고 analyzer / use case 를 새로 생성 (공유 자원은 Singleton)"""
+    analyzer = providers.Factory(
+        LangchainRAGAnalyzer,
+        config=rag.settings.provided.rag_analyzer,
+        embedding=rag.embedding,
+        vector_store=rag.vector_store,
+        cpu_executor=rag.cpu_executor,
+        search_service=rag.search_service,
+        reranker=rag.reranker,
+        answer_cache=rag.answer_cache,
+        router=rag.router,
+        context_packer=rag.context_packer,
+        llm=rag.llm,
+        admission=rag.admission,
+    )
+    return providers.Factory(ChatCompletionUseCase, analyzer=analyzer)
+
+
+@pytest.mark.parametrize("scope", ["factory", "singleton"])
+def test_chat_use_case_resolution_benchmark(benchmark, container, scope):
+    """chat_completion_use_case 를 한 번 꺼내는 비용 (요청당 DI 오버헤드)"""
+    provider = _factory_use_case(container.rag) if scope == "factory" else container.rag.chat_completion_use_case
+    use_case = benchmark(provider)
+    assert use_case.analyzer.llm is container.rag.llm()
+
+
+def test_singleton_removes_per_request_construction(container):
+    """평가대상: 같은 use case / analyzer 를 재사용하고 DB 주입도 유지되며, 요청당 비용이 크게 줄어야 함"""
+    use_case = container.rag.chat_completion_use_case()
+    assert use_case is container.rag.chat_completion_use_case()
+    assert use_case.analyzer is container.rag.analyzer()
+    assert use_case.db is container.database.async_db()
+
+    factory = _factory_use_case(container.rag)
+    number = 2000
+    before = min(timeit.repeat(factory, number=number, repeat=3)) / number
+    after = min(timeit.repeat(container.rag.chat_completion_use_case, number=number, repeat=3)) / number
+
+    print(f"\n[DI] per-request overhead: factory {before * 1e6:.1f}us → singleton {after * 1e6:.2f}us")
+    assert after * 10 < before
@@ -0,0 +1,154 @@
+"""동시에 들어온 같은 chat 요청의 single-flight 병합 테스트 (CPU 전용)"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, List
+
+import pytest
+
+from ohra.backend.rag.dtos.request import ChatCompletionRequest
+from ohra.backend.rag.dtos.response import ChatCompletionResponse, RetrievalInfo
+from ohra.backend.rag.use_case.chat_use_case import ChatCompletionUseCase
+from ohra.shared_kernel.infra.executor import SingleFlight
+
+LATENCY = 0.1  # 검색 + 생성 시간 (초)
+
+
+class SlowAnalyzer:
+    def __init__(self, error: Exception = None):
+        self.calls = 0
+        self.error = error
+
+    async def ainvoke(self, request: ChatCompletionRequest) -> ChatCompletionResponse:
+        self.calls += 1
+        number = self.calls
+        await asyncio.sleep(LATENCY)
+        if self.error is not None:
+            raise self.error
+        return ChatCompletionResponse(
+            id=f"chatcmpl-{number}",
+            created=1730000000,
+            model="qwen",
+            choices=[{"index": 0, "message": {"role": "assistant", "content": f"답변 {number}"}}],
+            usage={"prompt_tokens": 2000, "completion_tokens": 100},
+            retrieval=RetrievalInfo(search_mode="hybrid", documents=3),
+        )
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.added: List[Any] = []
+
+    @asynccontextmanager
+    async def session(self):
+        database = self
+
+        class Session:
+            def add(self, model):
+                database.added.append(model)
+
+            async def commit(self):
+                pass
+
+        yield Session()
+
+
+def _use_case(analyzer: SlowAnalyzer) -> ChatCompletionUseCase:
+    use_case = ChatCompletionUseCase(analyzer=analyzer)
+    use_case.db = FakeDatabase()
+    return use_case
+
+
+def _request(content: str = "배포 절차 알려줘", **kwargs) -> ChatCompletionRequest:
+    return ChatCompletionRequest(messages=[{"role": "user", "content": content}], **{"temperature": 0.0, **kwargs})
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_share_one_execution():
+    """평가대상: 동시에 들어온 같은 요청은 한 번만 실행하고 모든 호출이 같은 답변을 받아야 함"""
+    analyzer = SlowAnalyzer()
+    use_case = _use_case(analyzer)
+
+    contents = ["배포 절차 알려줘", " 배포  절차\n알려줘 "] * 10
+    responses = await asyncio.gather(*[use_case.execute("u1", _request(content)) for content in contents])
+
+    assert analyzer.calls == 1
+    assert {response.choices[0].message.content for response in responses} == {"답변 1"}
+    assert len({response.id for response in responses}) == len(responses)
+    assert sum(response.retrieval.coalesced for response in responses) == len(responses) - 1
+    assert sum(response.usage is not None for response in responses) == 1
+    # 각 요청의 대화에는 따로 저장한다
+    assert len(use_case.db.added) == len(responses)
+    assert use_case.single_flight.stats() == {"in_flight": 0, "executions": 1, "shared": len(responses) - 1}
+
+
+@pytest.mark.asyncio
+async def test_different_or_opted_out_requests_run_separately():
+    """평가대상: 질문 / 생성 옵션이 다르거나, temperature 가 높거나, coalesce=false 인 요청은 따로 실행해야 함"""
+    analyzer = SlowAnalyzer()
+    use_case = _use_case(analyzer)
+
+    requests = [
+        _request(),
+        _request("휴가 신청 방법"),
+        _request(max_tokens=100),
+        _request(retrieval={"search_mode": "keyword"}),
+        _request(temperature=0.7),
+        _request(temperature=0.7),
+        _request(coalesce=False),
+    ]
+    await asyncio.gather(*[use_case.execute("u1", request) for request in requests])
+
+    assert analyzer.calls == len(requests)
+    # coalesce=true 면 temperature 가 높아도 합친다
+    await asyncio.gather(*[use_case.execute("u1", _request(temperature=0.7, coalesce=True)) for _ in range(3)])
+    assert analyzer.calls == len(requests) + 1
+
+
+@pytest.mark.asyncio
+async def test_finished_requests_are_not_cached():
+    """평가대상: 실행이 끝난 뒤에 들어온 같은 요청은 새로 실행해야 함 (cache 가 아님)"""
+    analyzer = SlowAnalyzer()
+    use_case = _use_case(analyzer)
+
+    first = await use_case.execute("u1", _request())
+    second = await use_case.execute("u1", _request())
+
+    assert analyzer.calls == 2
+    assert first.choices[0].message.content != second.choices[0].message.content
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller():
+    """평가대상: 공유된 실행이 실패하면 기다리던 모든 호출이 같은 예외를 받아야 함"""
+    analyzer = SlowAnalyzer(error=RuntimeError("endpoint down"))
+    use_case = _use_case(analyzer)
+
+    results = await asyncio.gather(*[use_case.execute("u1", _request()) for _ in range(5)], return_exceptions=True)
+
+    assert analyzer.calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert not use_case.db.added
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_followers():
+    """평가대상: 먼저 들어온 요청이 취소되어도(클라이언트 연결 종료) 함께 기다리던 요청은 결과를 받아야 함"""
+    flights = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(LATENCY)
+        return "done"
+
+    leader = asyncio.create_task(flights.do("key", work))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flights.do("key", work))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == ("done", True)
+    assert calls == 1
+    assert leader.cancelled()
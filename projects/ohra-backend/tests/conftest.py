@@ -9,6 +9,8 @@ import os
 from pathlib import Path
 from datetime import datetime
 
+from tests.utils.fake_endpoint import FakeLLMEndpoint
+
 
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_api_key():
@@ -75,3 +77,13 @@ def setup_test_api_key():
         del os.environ["OHRA_API_KEY"]
 
     print(f"[TEST TEARDOWN] API Key deleted: {key_id}")
+
+
+@pytest.fixture
+def endpoint(request, monkeypatch):
+    """로컬 fake SageMaker endpoint. 답변 생성 시간은 테스트 모듈의 ``LLM_SECONDS`` (없으면 0초)"""
+    # 요청 서명에만 쓰이는 더미 자격 증명
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test")
+    with FakeLLMEndpoint(latency=getattr(request.module, "LLM_SECONDS", 0.0)) as endpoint:
+        yield endpoint
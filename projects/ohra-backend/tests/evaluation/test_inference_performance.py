@@ -5,6 +5,7 @@ import aiohttp
 import time
 from datetime import datetime
 from pathlib import Path
+from typing import Dict, List
 
 from tests.utils.api_client import make_chat_request
 from tests.utils.test_helpers import (
@@ -24,6 +25,25 @@ QUERY_SET = [
 ]
 
 
+def _inference_time(timings: Dict[str, float], total_time: float) -> float:
+    """LLM 단계 시간 (초). Server-Timing 이 없는 서버면 전체 응답 시간의 95% 로 추정한다."""
+    if "llm" in timings:
+        return timings["llm"] / 1000
+    return total_time * 0.95
+
+
+def _format_timings(timings: Dict[str, float]) -> str:
+    return ", ".join(f"{name}={ms:.0f}ms" for name, ms in timings.items()) or "N/A"
+
+
+def _average_timings(timings: List[Dict[str, float]]) -> Dict[str, float]:
+    stages = {name for entry in timings for name in entry}
+    return {
+        name: round(sum(entry[name] for entry in timings if name in entry) / len(timings), 1)
+        for name in sorted(stages)
+    }
+
+
 @pytest.mark.asyncio
 async def test_inference_performance_basic():
     """평가대상: 기본 테스트 - 평균 추론 시간 2초 이내"""
@@ -58,22 +78,23 @@ async def test_inference_performance_basic():
 
             result = await make_chat_request(session, query)
 
-            # 백엔드 로그에서 LLM 추론 시간을 추출할 수 없으므로
-            # 전체 응답 시간의 95%를 추론 시간으로 추정
-            # (실제로는 백엔드 로그 파싱 필요)
+            # 서버가 Server-Timing 헤더로 돌려준 단계별 시간으로 LLM 추론 시간을 구한다
             total_time = result.get("elapsed_time", 0)
-            inference_time = total_time * 0.95  # 추정값 (검색 시간 약 5% 가정)
+            timings = result.get("timings", {})
+            inference_time = _inference_time(timings, total_time)
 
             results.append(
                 {
                     "query": query,
                     "inference_time": inference_time,
                     "total_time": total_time,
+                    "timings_ms": timings,
                     "status": result.get("status", 0),
                 }
             )
 
-            print(f"  LLM 추론 시간: {inference_time:.3f}s (추정)")
+            measured = "측정" if "llm" in timings else "추정"
+            print(f"  LLM 추론 시간: {inference_time:.3f}s ({measured}), 단계별: {_format_timings(timings)}")
 
     inference_times = [r["inference_time"] for r in results if r["status"] == 200]
 
@@ -107,6 +128,8 @@ async def test_inference_performance_basic():
             "avg_inference_time": f"{avg_inference_time:.3f}s",
             "min_inference_time": f"{min_inference_time:.3f}s",
             "max_inference_time": f"{max_inference_time:.3f}s",
+            # latency 회귀가 어느 단계에서 생겼는지 보기 위한 단계별 평균 (ms)
+            "avg_stage_timings_ms": _average_timings([r["timings_ms"] for r in results if r["status"] == 200]),
             "results": results,
         }
 
@@ -170,13 +193,14 @@ async def test_input_token_limit():
                 break
 
             actual_tokens = response.get("usage", {}).get("prompt_tokens", 0)
-            inference_time = elapsed * 0.95  # 추정값
+            inference_time = _inference_time(response.get("timings", {}), elapsed)
 
             result = {
                 "target_tokens": token_count,
                 "actual_tokens": actual_tokens,
                 "inference_time": inference_time,
                 "total_time": elapsed,
+                "timings_ms": response.get("timings", {}),
                 "tokens_per_second": actual_tokens / inference_time if inference_time > 0 else 0,
             }
 
@@ -249,13 +273,14 @@ async def test_output_token_limit():
                 break
 
             actual_tokens = response.get("usage", {}).get("completion_tokens", 0)
-            inference_time = elapsed * 0.95  # 추정값
+            inference_time = _inference_time(response.get("timings", {}), elapsed)
 
             result = {
                 "max_tokens": max_tokens,
                 "actual_tokens": actual_tokens,
                 "generation_time": inference_time,
                 "total_time": elapsed,
+                "timings_ms": response.get("timings", {}),
                 "tokens_per_second": actual_tokens / inference_time if inference_time > 0 else 0,
             }
 
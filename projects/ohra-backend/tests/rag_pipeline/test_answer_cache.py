@@ -0,0 +1,170 @@
+"""semantic answer cache: 비슷한 질문 재사용, 근거 문서 변경 감지, 요청 단위 우회 테스트"""
+
+import json
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from ohra.backend.rag.dtos.request import ChatCompletionRequest
+from ohra.backend.rag.service.v1.answer_cache import SemanticAnswerCache
+from ohra.backend.rag.service.v1.schema import RetrievedDocument
+from ohra.backend.rag.service.v1.settings import LangchainRAGAnalyzerConfig
+from ohra.shared_kernel.infra.sagemaker import SageMakerLLMAdapter
+from tests.utils.fakes import build_analyzer
+
+# 같은 의미의 질문은 가까운 벡터, 다른 질문은 먼 벡터가 나오도록 한 embedding 대역
+EMBEDDINGS = {
+    "배포 절차가 어떻게 되나요": [1.0, 0.0, 0.0],
+    "배포는 어떤 절차로 하나요": [0.99, 0.05, 0.0],
+    "휴가 신청 방법": [0.0, 1.0, 0.0],
+}
+
+
+class FakeEmbedding:
+    async def embed_text(self, text: str) -> List[float]:
+        return EMBEDDINGS[text]
+
+
+@dataclass
+class FakeCollection:
+    """Qdrant collection 대역 (dense cosine 검색, payload 필드 일치 필터)"""
+
+    points: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+
+    async def ensure_collection_exists(self, vector_size: int, enable_sparse: bool = True) -> None:
+        pass
+
+    async def upsert(self, id, vector, metadata, sparse_vector=None) -> None:
+        self.points[id] = {"id": id, "vector": vector, "metadata": metadata}
+
+    async def search(self, query_vector, top_k=5, filter=None, **kwargs):
+        def cosine(a, b):
+            return sum(x * y for x, y in zip(a, b)) / (math.hypot(*a) * math.hypot(*b))
+
+        hits = [
+            {"id": p["id"], "score": cosine(query_vector, p["vector"]), "metadata": p["metadata"]}
+            for p in self.points.values()
+            if all(p["metadata"].get(k) == v for k, v in (filter or {}).items())
+        ]
+        return sorted(hits, key=lambda hit: hit["score"], reverse=True)[:top_k]
+
+    async def retrieve(self, ids, with_payload=True):
+        return [{"id": i, "metadata": self.points[i]["metadata"]} for i in ids if i in self.points]
+
+
+@dataclass
+class CollectionRetriever:
+    """``FakeCollection`` 의 모든 문서를 돌려주는 retriever 대역 (답변 cache 의 hash 검증용)"""
+
+    documents: FakeCollection
+    embedding: Any = None
+
+    async def retrieve(self, query: str, top_k: int = 5, filter: Optional[Dict[str, Any]] = None, context=None):
+        points = self.documents.points.values()
+        return [RetrievedDocument(id=p["id"], score=1.0, metadata=p["metadata"]) for p in points]
+
+
+class FakeSageMakerClient:
+    """LLM endpoint 대역. 호출 횟수를 센다."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke_endpoint(self, EndpointName, ContentType, Body):
+        self.calls += 1
+        answer = {
+            "id": f"chatcmpl-{self.calls}",
+            "created": 1730000000,
+            "model": "qwen",
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": f"답변 {self.calls}"}}],
+            "usage": {"prompt_tokens": 2000, "completion_tokens": 100, "total_tokens": 2100},
+        }
+        return {"Body": _Body(json.dumps(answer).encode())}
+
+
+class _Body:
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def read(self) -> bytes:
+        return self.data
+
+
+def _analyzer():
+    documents = FakeCollection()
+    for i, content in enumerate(["배포는 main merge 후 승인자가 트리거합니다.", "배포 전 QA 를 거칩니다."]):
+        documents.points[i] = {"id": i, "vector": [], "metadata": {"content": content, "hash": f"h{i}"}}
+
+    embedding = FakeEmbedding()
+    llm = SageMakerLLMAdapter(endpoint_name="endpoint")
+    llm.client = FakeSageMakerClient()
+    analyzer = build_analyzer(
+        CollectionRetriever(documents, embedding=embedding),
+        embedding=embedding,
+        vector_store=documents,
+        config=LangchainRAGAnalyzerConfig(search_mode="vector"),
+        answer_cache=SemanticAnswerCache(store=FakeCollection(), documents=documents, threshold=0.95),
+        llm=llm,
+    )
+    return analyzer, documents
+
+
+def _request(*questions: str, **kwargs) -> ChatCompletionRequest:
+    messages = []
+    for question in questions:
+        messages += [{"role": "user", "content": question}, {"role": "assistant", "content": "..."}]
+    return ChatCompletionRequest(messages=messages[:-1], **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_paraphrase_returns_cached_answer_without_llm_call():
+    """평가대상: 유사도가 threshold 이상인 질문은 LLM 호출 없이 저장된 답변을 돌려줘야 함"""
+    analyzer, _ = _analyzer()
+
+    first = await analyzer.ainvoke(_request("배포 절차가 어떻게 되나요"))
+    second = await analyzer.ainvoke(_request("배포는 어떤 절차로 하나요"))
+
+    assert analyzer.llm.client.calls == 1
+    assert second.choices[0].message.content == first.choices[0].message.content
+    assert second.id != first.id
+    assert second.retrieval.cached and not first.retrieval.cached
+    assert analyzer.answer_cache.stats() == {"hits": 1, "misses": 1, "stale": 0, "hit_rate": 0.5}
+
+
+@pytest.mark.asyncio
+async def test_different_question_misses():
+    """평가대상: 유사도가 낮은 질문은 새로 답변을 생성해야 함"""
+    analyzer, _ = _analyzer()
+
+    await analyzer.ainvoke(_request("배포 절차가 어떻게 되나요"))
+    await analyzer.ainvoke(_request("휴가 신청 방법"))
+
+    assert analyzer.llm.client.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_changed_source_document_invalidates_answer():
+    """평가대상: 근거 청크의 content hash 가 바뀌면 저장된 답변을 쓰지 않아야 함"""
+    analyzer, documents = _analyzer()
+
+    await analyzer.ainvoke(_request("배포 절차가 어떻게 되나요"))
+    documents.points[1]["metadata"] = {"content": "배포 전 QA 와 보안 점검을 거칩니다.", "hash": "h1-v2"}
+    await analyzer.ainvoke(_request("배포는 어떤 절차로 하나요"))
+
+    assert analyzer.llm.client.calls == 2
+    assert analyzer.answer_cache.stats()["stale"] == 1
+
+
+@pytest.mark.asyncio
+async def test_request_bypass_and_multi_turn_skip_cache():
+    """평가대상: cache=false 요청과 이전 대화가 있는 요청은 cache 를 조회하지도 저장하지도 않아야 함"""
+    analyzer, _ = _analyzer()
+
+    await analyzer.ainvoke(_request("배포 절차가 어떻게 되나요", cache=False))
+    await analyzer.ainvoke(_request("휴가 신청 방법", "배포 절차가 어떻게 되나요"))
+    await analyzer.ainvoke(_request("배포 절차가 어떻게 되나요"))
+
+    assert analyzer.llm.client.calls == 3
+    assert analyzer.answer_cache.stats()["hits"] == 0
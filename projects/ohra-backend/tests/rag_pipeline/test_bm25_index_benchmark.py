@@ -0,0 +1,137 @@
+"""inverted-index BM25 검색 벤치마크 (10k / 100k / 1M 청크, pytest-benchmark)"""
+
+import math
+from collections import Counter
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import pytest
+
+from ohra.shared_kernel.infra.bm25 import BM25Index
+
+pytest.importorskip("pytest_benchmark")
+
+
+VOCAB_SIZE = 50_000
+TOKENS_PER_CHUNK = 40
+TOP_K = 10
+SIZES = [10_000, 100_000, 1_000_000]
+
+_corpora: Dict[int, Tuple[BM25Index, List[List[str]]]] = {}
+
+
+def _synthetic_tokens(num_chunks: int, seed: int = 0) -> List[List[str]]:
+    # n-gram 토큰 분포와 비슷하도록 Zipf 분포에서 term 을 뽑는다
+    rng = np.random.default_rng(seed)
+    term_ids = (rng.zipf(1.2, size=(num_chunks, TOKENS_PER_CHUNK)) - 1) % VOCAB_SIZE
+    return [[f"t{i}" for i in row] for row in term_ids.tolist()]
+
+
+def _corpus(num_chunks: int) -> Tuple[BM25Index, List[List[str]]]:
+    if num_chunks not in _corpora:
+        docs = _synthetic_tokens(num_chunks)
+        index = BM25Index()
+        for point_id, tokens in enumerate(docs):
+            index.add(point_id, tokens)
+        _corpora[num_chunks] = (index, docs)
+    return _corpora[num_chunks]
+
+
+QUERIES = [["t3", "t17", "t250"], ["t1", "t40", "t999", "t12000"], ["t7", "t7", "t300"]]
+
+
+def _full_corpus_scorer(docs: List[List[str]]) -> Callable[[List[str], int], List[Tuple[int, float]]]:
+    # 기존 BM25Okapi.get_scores + sorted 방식: 모든 문서를 점수화한 뒤 전체 정렬 (통계는 미리 계산)
+    counts = [Counter(doc) for doc in docs]
+    doc_lens = [len(doc) for doc in docs]
+    n = len(docs)
+    avgdl = sum(doc_lens) / n
+    df = Counter(term for c in counts for term in c)
+
+    def search(query: List[str], top_k: int) -> List[Tuple[int, float]]:
+        scores = [0.0] * n
+        for term in query:
+            idf = math.log1p((n - df[term] + 0.5) / (df[term] + 0.5))
+            for i, c in enumerate(counts):
+                tf = c.get(term, 0)
+                scores[i] += idf * tf * 2.5 / (tf + 1.5 * (0.25 + 0.75 * doc_lens[i] / avgdl))
+        return sorted(enumerate(scores), key=lambda x: x[1], reverse=True)[:top_k]
+
+    return search
+
+
+def test_inverted_index_matches_full_corpus_scoring():
+    """posting 기반 누적 결과가 전체 문서 점수화 결과와 같은지 확인"""
+    docs = _synthetic_tokens(2_000, seed=1)
+    index = BM25Index()
+    for point_id, tokens in enumerate(docs):
+        index.add(point_id, tokens)
+
+    full_corpus_search = _full_corpus_scorer(docs)
+    for query in QUERIES:
+        expected = full_corpus_search(query, TOP_K)
+        actual = index.search(query, top_k=TOP_K)
+        assert [score for _, score in actual] == pytest.approx([score for _, score in expected], rel=1e-4)
+
+
+def test_filter_mask_is_applied_during_accumulation():
+    docs = _synthetic_tokens(2_000, seed=2)
+    index = BM25Index()
+    for point_id, tokens in enumerate(docs):
+        index.add(point_id, tokens)
+
+    allowed = set(range(0, 2_000, 7))
+    results = index.search(QUERIES[0], top_k=TOP_K, mask=index.mask(allowed))
+    assert results and all(point_id in allowed for point_id, _ in results)
+    assert len(results) == min(TOP_K, sum(1 for i in allowed if set(QUERIES[0]) & set(docs[i])))
+
+
+def test_removed_documents_are_not_returned():
+    docs = _synthetic_tokens(1_000, seed=3)
+    index = BM25Index()
+    for point_id, tokens in enumerate(docs):
+        index.add(point_id, tokens)
+    for point_id in range(0, 1_000, 2):
+        index.remove(point_id)
+
+    results = index.search(QUERIES[1])
+    assert len(index) == 500
+    assert results and all(point_id % 2 == 1 for point_id, _ in results)
+
+
+def test_doc_freq_follows_remove_and_update():
+    """평가대상: 삭제·수정된 문서의 term 은 compact 전에도 df 에서 빠지고, 같은 id 재색인은 df 를 두 번 세지 않음"""
+    index = BM25Index()
+    index.add(1, ["배포", "승인", "배포"])
+    index.add(2, ["배포", "롤백"])
+    index.add(3, ["알림톡"])
+
+    index.add(1, ["롤백"])
+    assert (index.doc_freq("배포"), index.doc_freq("승인"), index.doc_freq("롤백")) == (1, 0, 2)
+
+    index.remove(2)
+    assert (index.doc_freq("배포"), index.doc_freq("롤백"), index.doc_freq("알림톡")) == (0, 1, 1)
+    assert "배포" not in set(index.terms())
+
+
+def test_benchmark_full_corpus_scoring_10k(benchmark):
+    benchmark.group = "bm25-10000"
+    _, docs = _corpus(10_000)
+    full_corpus_search = _full_corpus_scorer(docs)
+    benchmark(lambda: [full_corpus_search(query, TOP_K) for query in QUERIES])
+
+
+@pytest.mark.parametrize("num_chunks", SIZES)
+def test_benchmark_inverted_index_search(benchmark, num_chunks):
+    benchmark.group = f"bm25-{num_chunks}"
+    index, _ = _corpus(num_chunks)
+    results = benchmark(lambda: [index.search(query, top_k=TOP_K) for query in QUERIES])
+    assert all(len(r) == TOP_K for r in results)
+
+
+@pytest.mark.parametrize("num_chunks", SIZES)
+def test_benchmark_inverted_index_filtered_search(benchmark, num_chunks):
+    benchmark.group = f"bm25-{num_chunks}"
+    index, _ = _corpus(num_chunks)
+    mask = index.mask(range(0, num_chunks, 10))
+    benchmark(lambda: [index.search(query, top_k=TOP_K, mask=mask) for query in QUERIES])
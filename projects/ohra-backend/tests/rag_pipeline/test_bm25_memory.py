@@ -0,0 +1,71 @@
+"""keyword 인덱스 상주 메모리 비교: payload 보관 + dict posting vs 필터 필드/통계만 보관하는 BM25Index"""
+
+import random
+import tracemalloc
+from collections import Counter
+
+from ohra.backend.rag.retrieval.keyword.retriever import KEYWORD_FILTER_FIELDS
+from ohra.shared_kernel.infra.bm25 import BM25Index
+from ohra.shared_kernel.infra.tokenizer import NGramTokenizer
+
+NUM_CHUNKS = 3000
+WORDS = ["배포", "프로세스", "자동", "승인", "알림톡", "발송", "실패", "관리자", "콘솔", "수신자", "필터", "문서"] + [
+    f"term{i}" for i in range(3000)
+]
+
+
+def _chunks():
+    rng = random.Random(0)
+    return [
+        {
+            "id": i,
+            "metadata": {
+                "content": " ".join(rng.choice(WORDS) for _ in range(250)),
+                "title": f"문서 제목 {i // 5}",
+                "url": f"https://wiki.example.com/pages/{i // 5}",
+                "source_type": "confluence",
+                "source_document_id": str(i // 5),
+                "version_key": "2024-01-01T00:00:00",
+                "space_key": "DEV",
+                "chunk_index": i % 5,
+                "hash": "ab" * 32,
+            },
+        }
+        for i in range(NUM_CHUNKS)
+    ]
+
+
+def _traced(build):
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        return tracemalloc.get_traced_memory()[0] - before, kept
+    finally:
+        tracemalloc.stop()
+
+
+def test_lean_index_uses_far_less_memory_than_payload_store():
+    docs = _chunks()
+    tokens = NGramTokenizer().tokenize_batch([doc["metadata"]["content"] for doc in docs])
+
+    def payload_store():
+        # 기존 방식: 전체 payload dict 와 term -> {point_id: tf} posting 을 모두 보관
+        documents = {doc["id"]: {"id": doc["id"], "metadata": dict(doc["metadata"])} for doc in docs}
+        postings = {}
+        for doc, doc_tokens in zip(docs, tokens):
+            for term, tf in Counter(doc_tokens).items():
+                postings.setdefault(term, {})[doc["id"]] = tf
+        return documents, postings
+
+    def lean_index():
+        index = BM25Index(fields=KEYWORD_FILTER_FIELDS)
+        for doc, doc_tokens in zip(docs, tokens):
+            index.add(doc["id"], doc_tokens, doc["metadata"])
+        return index
+
+    payload_bytes, _ = _traced(payload_store)
+    lean_bytes, _ = _traced(lean_index)
+
+    print(f"\n  payload store: {payload_bytes / 1e6:.1f}MB, lean index: {lean_bytes / 1e6:.1f}MB")
+    assert lean_bytes * 4 < payload_bytes
@@ -0,0 +1,66 @@
+"""BM25 인덱스 변경분(change feed) 반영이 검색 요청을 막지 않고 한 번만 실행되는지 테스트"""
+
+import asyncio
+import time
+
+import pytest
+
+from ohra.backend.rag.retrieval.keyword.retriever import BM25Retriever
+
+REFRESH_SECONDS = 0.3  # change feed scroll 에 걸리는 시간
+
+
+def _doc(i: int, content: str) -> dict:
+    return {"id": i, "metadata": {"content": content, "source_document_id": f"doc-{i}", "version_key": "v1"}}
+
+
+class SlowChangeFeedStore:
+    def __init__(self):
+        self.docs = [_doc(0, "배포 프로세스는 GitHub Actions 에서 자동으로 실행됩니다.")]
+        self.changed = [_doc(1, "알림톡 수신자 필터는 관리자 콘솔에서 설정합니다.")]
+        self.feed_calls = 0
+
+    async def get_all_by_filter(self, filter, batch_size=1000, with_payload=True):
+        return list(self.docs)
+
+    async def get_all_modified_since(self, since, field="indexed_at", with_payload=True):
+        self.feed_calls += 1
+        await asyncio.sleep(REFRESH_SECONDS)
+        return list(self.changed)
+
+    async def retrieve(self, ids):
+        by_id = {doc["id"]: doc for doc in self.docs + self.changed}
+        return [by_id[i] for i in ids if i in by_id]
+
+
+@pytest.mark.asyncio
+async def test_stale_requests_share_one_background_refresh():
+    """평가대상: 주기가 지난 뒤 동시에 들어온 검색은 refresh 를 기다리지 않고, 변경분은 한 번만 가져와야 함"""
+    store = SlowChangeFeedStore()
+    retriever = BM25Retriever(vector_store=store, refresh_interval_seconds=0)
+    await retriever.retrieve("배포", top_k=1)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*[retriever.retrieve("배포", top_k=1) for _ in range(10)])
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < REFRESH_SECONDS / 2
+    assert all(docs and docs[0].id == 0 for docs in results)
+    assert store.feed_calls == 1
+
+    # refresh 가 끝나면 변경분이 검색에 반영된다
+    await retriever._refresh_task
+    assert [doc.id for doc in await retriever.retrieve("알림톡 수신자", top_k=1)] == [1]
+
+
+@pytest.mark.asyncio
+async def test_explicit_refresh_joins_running_refresh():
+    """평가대상: sync 완료 알림 등으로 refresh 를 동시에 여러 번 불러도 change feed 는 한 번만 읽어야 함"""
+    store = SlowChangeFeedStore()
+    retriever = BM25Retriever(vector_store=store)
+    await retriever.retrieve("배포", top_k=1)
+
+    counts = await asyncio.gather(*[retriever.refresh() for _ in range(5)])
+
+    assert counts == [1] * 5
+    assert store.feed_calls == 1
@@ -0,0 +1,96 @@
+"""여러 uvicorn worker process 가 BM25 snapshot 하나를 공유하는지 테스트"""
+
+import asyncio
+import multiprocessing
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ohra.backend.rag.retrieval.keyword.retriever import BM25Retriever
+from ohra.shared_kernel.infra.bm25 import read_manifest
+
+NUM_WORKERS = 4
+DOCS = [
+    {
+        "id": i,
+        "metadata": {
+            "content": content,
+            "source_type": "confluence",
+            "source_document_id": f"doc-{i}",
+            "version_key": "v1",
+            "title": f"문서 {i}",
+        },
+    }
+    for i, content in enumerate(
+        [
+            "배포 프로세스는 GitHub Actions 에서 main 브랜치 merge 시 자동으로 실행됩니다.",
+            "어뷰징 경고 알림톡은 관리자 콘솔에서 수신자 필터를 설정한 사용자에게만 발송됩니다.",
+            "API 인증은 Bearer 토큰 방식이며 키는 관리자 페이지에서 발급받을 수 있습니다.",
+        ]
+        * 200
+    )
+]
+
+
+class FakeVectorStore:
+    """scroll 호출을 파일에 기록하는 Qdrant 대역 (process 간 호출 횟수 집계용)"""
+
+    def __init__(self, log_path: Path):
+        self.log_path = log_path
+
+    async def get_all_by_filter(self, filter, batch_size=1000, with_payload=True):
+        with open(self.log_path, "a") as f:
+            f.write("scroll\n")
+        await asyncio.sleep(0.3)  # 다른 worker 가 lock 을 기다리는 동안 빌드가 진행되도록 한다
+        return [{"id": doc["id"], "metadata": dict(doc["metadata"])} for doc in DOCS]
+
+    async def get_all_modified_since(self, since, field="indexed_at", with_payload=True):
+        return []
+
+    async def retrieve(self, ids):
+        by_id = {doc["id"]: doc for doc in DOCS}
+        return [by_id[i] for i in ids if i in by_id]
+
+
+def _worker(index_dir: str, log_path: str, results) -> None:
+    async def main():
+        retriever = BM25Retriever(vector_store=FakeVectorStore(Path(log_path)), index_dir=index_dir)
+        docs = await retriever.retrieve("배포 자동", top_k=3)
+        snapshot = retriever._bm25_index.base
+        return [doc.id for doc in docs], isinstance(snapshot.post_slots, np.memmap), len(retriever._bm25_index)
+
+    results.put(asyncio.run(main()))
+
+
+def test_single_build_shared_by_all_workers(tmp_path):
+    """평가대상: N 개 worker 중 한 process 만 Qdrant 를 scroll 하고 나머지는 같은 snapshot 을 mmap 으로 읽어야 함"""
+    ctx = multiprocessing.get_context("fork")
+    index_dir, log_path = tmp_path / "index", tmp_path / "scroll.log"
+    results = ctx.Queue()
+    processes = [ctx.Process(target=_worker, args=(str(index_dir), str(log_path), results)) for _ in range(NUM_WORKERS)]
+    for process in processes:
+        process.start()
+    outputs = [results.get(timeout=60) for _ in processes]
+    for process in processes:
+        process.join(timeout=10)
+        assert process.exitcode == 0
+
+    assert log_path.read_text().count("scroll") == 1
+    assert read_manifest(index_dir)["generation"] == 1
+    assert all(mmapped and size == len(DOCS) for _, mmapped, size in outputs)
+    assert len({tuple(ids) for ids, _, _ in outputs}) == 1
+
+
+@pytest.mark.asyncio
+async def test_read_only_index_dir_falls_back_to_process_index(tmp_path):
+    """평가대상: snapshot 을 게시할 수 없는 경로면 process 별 인덱스로 검색해야 함"""
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    retriever = BM25Retriever(
+        vector_store=FakeVectorStore(tmp_path / "scroll.log"), index_dir=str(blocker / "index")
+    )
+
+    docs = await retriever.retrieve("관리자 콘솔", top_k=3)
+
+    assert docs and docs[0].metadata["content"].startswith("어뷰징")
@@ -0,0 +1,98 @@
+"""BM25 snapshot 게시/mmap 로드 및 snapshot + delta 검색 테스트"""
+
+import time
+
+import numpy as np
+import pytest
+
+from ohra.shared_kernel.infra.bm25 import (
+    BM25Index,
+    SegmentedBM25Index,
+    load_snapshot,
+    publish_snapshot,
+    read_manifest,
+)
+from ohra.shared_kernel.infra.tokenizer import NGramTokenizer
+
+CHUNKS = [
+    ("doc-1", "v1", "confluence", "배포 프로세스는 GitHub Actions 에서 main 브랜치 merge 시 자동으로 실행됩니다."),
+    ("doc-1", "v1", "confluence", "staging 환경 검증 후 production 배포는 승인자가 수동으로 트리거합니다."),
+    ("doc-2", "v1", "confluence", "어뷰징 경고 알림톡은 관리자 콘솔에서 수신자 필터를 설정한 사용자에게만 발송됩니다."),
+    ("doc-3", "v7", "jira", "[OHRA-123] 오래된 문서가 검색되는 문제를 version_key 비교 로직으로 해결했습니다."),
+    ("doc-4", "v2", "jira", "API 인증은 Bearer 토큰 방식이며 키는 관리자 페이지에서 발급받을 수 있습니다."),
+]
+FIELDS = ("source_document_id", "version_key", "source_type")
+
+
+@pytest.fixture
+def corpus():
+    tokenizer = NGramTokenizer()
+    index = BM25Index(fields=FIELDS)
+    for point_id, (source_id, version, source_type, content) in enumerate(CHUNKS, start=1000):
+        payload = {"source_document_id": source_id, "version_key": version, "source_type": source_type}
+        index.add(point_id, tokenizer.tokenize(content), payload)
+    return tokenizer, index
+
+
+def test_publish_and_mmap_load(tmp_path, corpus):
+    tokenizer, index = corpus
+    expected = index.search(tokenizer.tokenize_query("배포 승인"), top_k=3)
+
+    assert publish_snapshot(tmp_path, index, indexed_at="2026-01-01T00:00:00+00:00") == 1
+    assert publish_snapshot(tmp_path, index) == 2
+    assert read_manifest(tmp_path)["generation"] == 2
+
+    snapshot = load_snapshot(tmp_path)
+    assert isinstance(snapshot.post_slots, np.memmap)
+    assert len(snapshot) == len(CHUNKS)
+    assert snapshot.slot_of(1003) is not None and snapshot.slot_of(42) is None
+
+    segmented = SegmentedBM25Index(snapshot)
+    actual = segmented.search(tokenizer.tokenize_query("배포 승인"), top_k=3)
+    assert [point_id for point_id, _ in actual] == [point_id for point_id, _ in expected]
+    assert [score for _, score in actual] == pytest.approx([score for _, score in expected], rel=1e-5)
+
+
+def test_delta_and_tombstones_over_snapshot(tmp_path, corpus):
+    tokenizer, index = corpus
+    publish_snapshot(tmp_path, index)
+    segmented = SegmentedBM25Index(load_snapshot(tmp_path))
+
+    # doc-1 이 새 version 으로 바뀌어 기존 청크 두 개가 사라지고 새 청크 하나가 추가된 상황
+    stale = segmented.field_mask("source_document_id", "doc-1") & ~segmented.field_mask("version_key", "v2")
+    for point_id in [segmented.point_id(int(slot)) for slot in np.flatnonzero(stale)]:
+        segmented.remove(point_id)
+    payload = {"source_document_id": "doc-1", "version_key": "v2", "source_type": "confluence"}
+    segmented.add(2000, tokenizer.tokenize("배포는 이제 ArgoCD 로 자동 승인 없이 진행됩니다."), payload)
+
+    assert len(segmented) == len(CHUNKS) - 1
+    results = segmented.search(tokenizer.tokenize_query("배포 승인"), top_k=5)
+    assert results[0][0] == 2000
+    assert not {1000, 1001} & {point_id for point_id, _ in results}
+    assert segmented.filter_mask({"source_document_id": "doc-1", "version_key": "v2"}).sum() == 1
+
+    jira_only = segmented.filter_mask({"source_type": "jira"})
+    results = segmented.search(tokenizer.tokenize_query("관리자 페이지 문서"), top_k=5, mask=jira_only)
+    assert results and {point_id for point_id, _ in results} <= {1003, 1004}
+
+    with pytest.raises(ValueError):
+        segmented.filter_mask({"title": "배포"})
+
+
+def test_snapshot_load_is_faster_than_rebuild(tmp_path):
+    tokenizer = NGramTokenizer()
+    contents = [content for *_, content in CHUNKS] * 2000
+
+    start = time.perf_counter()
+    index = BM25Index()
+    for point_id, tokens in enumerate(tokenizer.tokenize_batch(contents)):
+        index.add(point_id, tokens)
+    rebuild_seconds = time.perf_counter() - start
+
+    publish_snapshot(tmp_path, index)
+    start = time.perf_counter()
+    SegmentedBM25Index(load_snapshot(tmp_path))
+    load_seconds = time.perf_counter() - start
+
+    print(f"\n  rebuild: {rebuild_seconds * 1000:.1f}ms, mmap load: {load_seconds * 1000:.1f}ms")
+    assert load_seconds < rebuild_seconds
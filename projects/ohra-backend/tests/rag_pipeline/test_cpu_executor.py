@@ -0,0 +1,70 @@
+"""CPU 작업을 이벤트 루프에서 직접 실행할 때와 CPUExecutor 로 넘길 때의 event-loop lag 비교"""
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from ohra.shared_kernel.infra.bm25 import BM25Index
+from ohra.shared_kernel.infra.executor import CPUExecutor, EventLoopLagMonitor
+
+NUM_CHUNKS = 200_000
+NUM_SEARCHES = 20
+# 자주 등장하는 term 위주의 질의 → posting 이 길어 한 번의 검색이 수십 ms 걸린다
+QUERY = ["t0", "t1", "t2", "t3", "t5", "t8"]
+
+
+@pytest.fixture(scope="module")
+def index():
+    rng = np.random.default_rng(0)
+    term_ids = (rng.zipf(1.2, size=(NUM_CHUNKS, 40)) - 1) % 50_000
+    index = BM25Index()
+    for point_id, row in enumerate(term_ids.tolist()):
+        index.add(point_id, [f"t{i}" for i in row])
+    return index
+
+
+async def _measure(executor: CPUExecutor, index: BM25Index) -> dict:
+    monitor = EventLoopLagMonitor(interval=0.005, warn_threshold=None)
+    monitor.start()
+    await asyncio.sleep(0.02)
+    await asyncio.gather(*[executor.run(index.search, QUERY, 10) for _ in range(NUM_SEARCHES)])
+    # 루프가 막혀 있던 동안 밀린 tick 이 기록되도록 한 번 더 깨운다
+    await asyncio.sleep(0.02)
+    await monitor.stop()
+    return monitor.stats()
+
+
+@pytest.mark.asyncio
+async def test_executor_keeps_event_loop_responsive(index):
+    """평가대상: executor 사용 시 검색 중 event-loop max lag 가 인라인 실행보다 작아야 함"""
+    inline = await _measure(CPUExecutor(max_workers=0), index)
+
+    executor = CPUExecutor(max_workers=2)
+    try:
+        offloaded = await _measure(executor, index)
+    finally:
+        executor.shutdown()
+
+    print()
+    for name, stats in [("inline", inline), ("executor", offloaded)]:
+        print(f"  {name:<9} p50 {stats['p50_ms']:.1f}ms, p99 {stats['p99_ms']:.1f}ms, max {stats['max_ms']:.1f}ms")
+    assert offloaded["max_ms"] < inline["max_ms"]
+
+
+@pytest.mark.asyncio
+async def test_executor_bounds_pending_work():
+    """평가대상: max_pending 을 넘는 작업은 pool 대기열에 쌓이지 않고 코루틴에서 대기해야 함"""
+    executor = CPUExecutor(max_workers=1, max_pending=2)
+    release = threading.Event()
+    try:
+        tasks = [asyncio.create_task(executor.run(release.wait, 5)) for _ in range(8)]
+        await asyncio.sleep(0.05)
+        # 실행 중 1개 + pool 대기열 1개 = max_pending
+        assert executor._pool._work_queue.qsize() == 1
+        release.set()
+        assert all(await asyncio.gather(*tasks))
+    finally:
+        release.set()
+        executor.shutdown()
@@ -0,0 +1,91 @@
+"""vLLM prefix cache 를 위한 프롬프트 prefix 안정성 테스트 (CPU 전용)"""
+
+from typing import Dict, List
+
+import pytest
+
+from ohra.backend.rag.service.v1.prompt import __SYSTEM_PROMPT__, build_messages, history_window
+from tests.utils.fakes import CapturingLLM, FakeRetriever, build_analyzer, chat_request
+
+
+def _render(messages: List[Dict[str, str]]) -> str:
+    # Qwen chat template (ChatML) 과 같은 형태로 펼친 문자열 = vLLM 이 prefix 를 비교하는 대상
+    return "".join(f"<|im_start|>{m['role']}\n{m['content']}<|im_end|>\n" for m in messages)
+
+
+def _common_prefix(a: str, b: str) -> int:
+    n = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        n += 1
+    return n
+
+
+def _conversation(turns: int) -> List[List[Dict[str, str]]]:
+    """대화가 진행될 때 매 턴 LLM 에 보내는 messages"""
+    history: List[Dict[str, str]] = []
+    requests = []
+    for turn in range(turns):
+        question = f"{turn}번째 질문"
+        requests.append(build_messages(question, f"<document>{turn}번 문서</document>", history_window(history)))
+        history += [{"role": "user", "content": question}, {"role": "assistant", "content": f"{turn}번째 답변"}]
+    return requests
+
+
+def test_requests_share_system_prompt_prefix():
+    """평가대상: 질문과 검색 문서가 달라도 렌더링된 프롬프트가 system prompt 전체를 prefix 로 공유해야 함"""
+    first = _render(build_messages("배포 절차", "<document>배포 문서</document>", []))
+    second = _render(build_messages("휴가 신청", "<document>휴가 문서</document>", []))
+
+    assert _common_prefix(first, second) >= len(_render([{"role": "system", "content": __SYSTEM_PROMPT__}]))
+
+
+def test_build_messages_is_pure_and_context_only_in_last_turn():
+    """평가대상: 같은 입력이면 같은 messages, 입력 history 는 그대로이고 검색 문서는 마지막 user 메시지에만 있어야 함"""
+    history = [{"role": "user", "content": "이전 질문"}, {"role": "assistant", "content": "이전 답변"}]
+
+    messages = build_messages("배포 절차", "<document>배포 문서</document>", history)
+
+    assert messages == build_messages("배포 절차", "<document>배포 문서</document>", history)
+    assert len(history) == 2
+    assert messages[0] == {"role": "system", "content": __SYSTEM_PROMPT__}
+    assert messages[1:3] == history
+    assert [i for i, m in enumerate(messages) if "<document>" in m["content"]] == [3]
+
+
+def test_history_window_moves_in_chunks():
+    """평가대상: history 가 max_messages 를 넘으면 시작 위치가 chunk 단위로만 움직여야 함"""
+    history = [{"role": "user", "content": str(i)} for i in range(30)]
+
+    starts = [history_window(history[:n], max_messages=10, chunk=6)[0]["content"] for n in range(1, 31)]
+
+    assert all(len(history_window(history[:n], 10, 6)) <= 10 for n in range(31))
+    assert sorted({int(start) for start in starts}) == [0, 6, 12, 18, 24]
+
+
+def test_conversation_reuses_previous_prefix_on_most_turns():
+    """평가대상: 대화 중 연속된 요청의 대부분이 이전 요청의 system + history 를 그대로 prefix 로 가져야 함"""
+    requests = _conversation(turns=30)
+
+    reused = 0
+    for previous, current in zip(requests, requests[1:]):
+        prefix = _render(previous[:-1])  # 이전 요청에서 마지막(문서 + 질문) 메시지를 뺀 부분
+        reused += _render(current).startswith(prefix)
+    # 한 칸씩 미는 window 였다면 history 가 가득 찬 뒤로는 매 턴 prefix 가 깨진다
+    print(f"\n[prefix] reused {reused}/{len(requests) - 1} turns")
+    assert reused / (len(requests) - 1) >= 0.6
+
+
+@pytest.mark.asyncio
+async def test_pipeline_payload_starts_with_static_system_prompt():
+    """평가대상: analyzer 가 보내는 요청이 질문과 무관하게 같은 system prompt 로 시작해야 함"""
+    llm = CapturingLLM()
+    analyzer = build_analyzer(FakeRetriever("{query}", "{query} 문서"), llm=llm)
+
+    for question in ["배포 절차", "휴가 신청"]:
+        await analyzer.ainvoke(chat_request(question, retrieval={"search_mode": "keyword"}))
+
+    first, second = (payload["messages"] for payload in llm.payloads)
+    assert first[0] == second[0] == {"role": "system", "content": __SYSTEM_PROMPT__}
+    assert "배포 절차 문서" in first[-1]["content"] and "휴가 신청 문서" in second[-1]["content"]
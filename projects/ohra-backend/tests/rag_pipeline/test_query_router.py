@@ -0,0 +1,120 @@
+"""검색이 필요 없는 질의(대화 / 인사 등)의 검색 생략 routing 테스트 (CPU 전용)"""
+
+import json
+import logging
+
+import pytest
+
+from ohra.backend.rag.dtos.request import ChatCompletionRequest
+from ohra.backend.rag.retrieval.router import QueryClassifier, QueryRouter, build_query_router
+from ohra.backend.rag.service.v1.pipeline import LangchainRAGAnalyzer
+from ohra.backend.rag.service.v1.settings import LangchainRAGAnalyzerConfig
+from tests.utils.fakes import CapturingLLM, FakeRetriever, build_analyzer, chat_request
+
+
+@pytest.mark.parametrize(
+    "query, has_history, retrieve, reason",
+    [
+        ("우리 무슨 얘기하고 있어?", False, False, "conversation"),
+        ("우리 지금 무슨 얘기 했었지", True, False, "conversation"),
+        ("우리 서비스 장애 관련해서 지금 무슨 얘기 나오고 있어?", False, True, "default"),
+        ("방금 답변 다시 요약해줘", True, False, "conversation"),
+        ("더 자세히 알려줘", True, False, "conversation"),
+        ("요약 좀 해줘!", True, False, "conversation"),
+        # 이전 대화를 가리키는 표현 뒤에 새 주제가 붙으면 검색한다
+        ("아까 말한 서버 배포 방법 자세히 알려줘", True, True, "default"),
+        ("위 내용 중 배포 스크립트 경로 어디야?", True, True, "default"),
+        ("더 자세히 알려줘 쿠버네티스 롤백 방법", True, True, "default"),
+        ("안녕하세요!", False, False, "greeting"),
+        ("감사합니다 ㅎㅎ", False, False, "thanks"),
+        ("너는 누구야", False, False, "identity"),
+        ("네트워크 설정?", False, True, "default"),
+        ("배포 문서 알려줘", False, True, "document_reference"),
+        ("안녕하세요 휴가 신청 방법 알려주세요", False, True, "default"),
+        ("  ", False, False, "empty"),
+    ],
+)
+def test_rules(query, has_history, retrieve, reason):
+    """평가대상: 대화 / 인사 / 자기소개 질의만 검색을 생략하고 애매한 질의는 검색해야 함"""
+    decision = QueryRouter().route(query, has_history=has_history)
+
+    assert (decision.retrieve, decision.reason) == (retrieve, reason)
+
+
+def test_history_rules_need_history():
+    """평가대상: 이전 대화를 가리키는 규칙은 이전 대화가 있을 때만 적용되어야 함"""
+    router = QueryRouter()
+
+    assert router.route("이전 답변 요약해줘", has_history=False).retrieve
+    assert not router.route("이전 답변 요약해줘", has_history=True).retrieve
+
+
+def test_classifier_decides_unmatched_queries(tmp_path):
+    """평가대상: 규칙에 걸리지 않는 질의는 classifier 확률로 정하고 점수를 남겨야 함"""
+    path = tmp_path / "router.json"
+    path.write_text(json.dumps({"bias": -1.0, "weights": {"배포": 3.0, "절차": 2.0}}), encoding="utf-8")
+    config = LangchainRAGAnalyzerConfig(endpoint_name="endpoint", router_model_path=str(path))
+    router = build_query_router(config)
+
+    assert isinstance(router.classifier, QueryClassifier)
+    hit, miss = router.route("배포 절차"), router.route("오늘 날씨 좋다")
+    assert hit.retrieve and hit.reason == "classifier" and hit.score > 0.9
+    assert not miss.retrieve and miss.score < 0.5
+    assert build_query_router(config.model_copy(update={"router_enabled": False})) is None
+
+
+def test_routing_is_logged_and_counted(caplog):
+    """평가대상: 튜닝용으로 결정마다 JSON 로그 한 줄을 남기고 결정별 횟수를 세야 함"""
+    router = QueryRouter()
+    with caplog.at_level(logging.INFO, logger="ohra.backend.rag.retrieval.router"):
+        router.route("안녕")
+        router.route("배포 문서")
+        router.route("고마워")
+
+    logged = [json.loads(record.getMessage()) for record in caplog.records]
+    assert [(entry["query"], entry["retrieve"], entry["reason"]) for entry in logged] == [
+        ("안녕", False, "greeting"),
+        ("배포 문서", True, "document_reference"),
+        ("고마워", False, "thanks"),
+    ]
+    assert router.stats() == {"skip:greeting": 1, "retrieve:document_reference": 1, "skip:thanks": 1}
+
+
+def _analyzer(retriever: FakeRetriever, llm: CapturingLLM) -> LangchainRAGAnalyzer:
+    return build_analyzer(retriever, config={"endpoint_name": "endpoint", "search_mode": "keyword"}, llm=llm)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_skips_retrieval_for_conversation():
+    """평가대상: 검색을 생략한 질의는 retriever 를 호출하지 않고 문서 없는 짧은 프롬프트로 답해야 함"""
+    retriever, llm = FakeRetriever("{query}", "{query} 문서"), CapturingLLM()
+    analyzer = _analyzer(retriever, llm)
+    messages = [
+        {"role": "user", "content": "배포 절차 알려줘"},
+        {"role": "assistant", "content": "배포는 ..."},
+        {"role": "user", "content": "방금 답변 요약해줘"},
+    ]
+
+    response = await analyzer.ainvoke(ChatCompletionRequest(messages=messages))
+
+    assert retriever.calls == 0
+    assert response.retrieval.skipped == "conversation" and response.retrieval.documents == 0
+    sent = llm.payloads[0]["messages"]
+    assert sent[-1] == {"role": "user", "content": "방금 답변 요약해줘"}
+    assert sent[1:3] == messages[:2]
+    assert not any("<document>" in message["content"] for message in sent)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_retrieves_when_needed_or_options_given():
+    """평가대상: 검색이 필요한 질의와 검색 옵션을 지정한 요청은 router 와 관계없이 검색해야 함"""
+    retriever, llm = FakeRetriever("{query}", "{query} 문서"), CapturingLLM()
+    analyzer = _analyzer(retriever, llm)
+
+    docs = await analyzer.ainvoke(chat_request("배포 절차 알려줘"))
+    forced = await analyzer.ainvoke(chat_request("안녕하세요", retrieval={"top_k": 3}))
+
+    assert retriever.calls == 2
+    assert docs.retrieval.skipped is None and forced.retrieval.skipped is None
+    assert all("<document>" in payload["messages"][-1]["content"] for payload in llm.payloads)
+    assert analyzer.router.stats() == {"retrieve:default": 1}
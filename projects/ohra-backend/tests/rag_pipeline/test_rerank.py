@@ -0,0 +1,127 @@
+"""cross-encoder rerank 단계: 배치 점수화, 점수 cache, 프롬프트 크기 테스트"""
+
+import asyncio
+import time
+from typing import List
+
+import pytest
+
+from ohra.backend.rag.retrieval.rerank.reranker import CrossEncoderReranker
+from ohra.backend.rag.service.v1.prompt import format_context_docs
+from ohra.backend.rag.service.v1.schema import RetrievedDocument
+from ohra.shared_kernel.infra.executor import CPUExecutor
+
+QUERY = "배포 승인 절차"
+CANDIDATES = 20
+TOP_N = 5
+PAIR_COST_SECONDS = 0.002  # CPU int8 cross-encoder 의 (query, chunk) 한 쌍 비용에 가깝게 둔다
+
+
+class OverlapCrossEncoder:
+    """질의 단어가 청크에 몇 번 나오는지로 점수를 매기는 cross-encoder 대역"""
+
+    def __init__(self):
+        self.batches: List[int] = []
+
+    def score(self, query: str, texts: List[str]) -> List[float]:
+        self.batches.append(len(texts))
+        time.sleep(PAIR_COST_SECONDS * len(texts))
+        return [float(sum(text.count(word) for word in query.split())) for text in texts]
+
+
+def _candidates(n: int = CANDIDATES) -> List[RetrievedDocument]:
+    # fusion 점수 순서와 실제 관련도 순서가 반대가 되도록 뒤쪽 후보에 질의 단어를 더 넣는다
+    return [
+        RetrievedDocument(
+            id=i,
+            score=1.0 / (i + 1),
+            metadata={"title": f"문서 {i}", "content": f"{i}번 " + "사내 위키 본문 " * 60 + "배포 승인 " * (i % 7)},
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_rerank_keeps_best_n_by_cross_encoder_score():
+    """평가대상: fusion 순서와 무관하게 cross-encoder 점수 상위 top_n 개만 남아야 함"""
+    model = OverlapCrossEncoder()
+    reranker = CrossEncoderReranker(model=model, batch_size=8)
+
+    docs = await reranker.rerank(QUERY, _candidates(), top_n=TOP_N)
+
+    assert len(docs) == TOP_N
+    assert all(doc.id % 7 == 6 for doc in docs[:2])
+    assert [doc.score for doc in docs] == sorted((doc.score for doc in docs), reverse=True)
+    assert sorted(model.batches) == [4, 8, 8]
+
+
+@pytest.mark.asyncio
+async def test_scores_are_cached_per_query_and_chunk():
+    """평가대상: 같은 (query, chunk) 쌍은 다시 점수화하지 않고 질의가 바뀌면 다시 계산해야 함"""
+    model = OverlapCrossEncoder()
+    reranker = CrossEncoderReranker(model=model, batch_size=CANDIDATES)
+
+    first = await reranker.rerank(QUERY, _candidates(), top_n=TOP_N)
+    second = await reranker.rerank(QUERY, _candidates(), top_n=TOP_N)
+    assert [doc.id for doc in first] == [doc.id for doc in second]
+    assert model.batches == [CANDIDATES]
+
+    await reranker.rerank("배포 일정", _candidates(), top_n=TOP_N)
+    assert model.batches == [CANDIDATES, CANDIDATES]
+
+
+@pytest.mark.asyncio
+async def test_cache_is_bounded():
+    """평가대상: 점수 cache 는 cache_size 를 넘지 않고 오래된 쌍부터 밀려나야 함"""
+    reranker = CrossEncoderReranker(model=OverlapCrossEncoder(), cache_size=10)
+
+    await reranker.rerank(QUERY, _candidates(), top_n=TOP_N)
+
+    assert len(reranker._cache) == 10
+
+
+@pytest.mark.asyncio
+async def test_reranked_prompt_is_smaller_and_batches_run_in_parallel():
+    """평가대상: 넓게 검색 후 rerank 하면 프롬프트 토큰이 줄고, 배치는 executor 에서 병렬로 점수화되어야 함"""
+    candidates = _candidates()
+    executor = CPUExecutor(max_workers=4)
+    try:
+        sequential = CrossEncoderReranker(model=OverlapCrossEncoder(), batch_size=5)
+        parallel = CrossEncoderReranker(model=OverlapCrossEncoder(), batch_size=5, executor=executor)
+
+        start = time.perf_counter()
+        await sequential.rerank(QUERY, candidates, top_n=TOP_N)
+        sequential_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reranked = await parallel.rerank(QUERY, candidates, top_n=TOP_N)
+        parallel_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await parallel.rerank(QUERY, candidates, top_n=TOP_N)
+        cached_time = time.perf_counter() - start
+    finally:
+        executor.shutdown()
+
+    # 토큰 수는 test_inference_performance 와 같이 1.5 글자/토큰으로 근사한다
+    wide_tokens = len(format_context_docs(candidates)) / 1.5
+    reranked_tokens = len(format_context_docs(reranked)) / 1.5
+    print(
+        f"\n[rerank] prompt tokens: top_k={CANDIDATES} {wide_tokens:.0f} -> rerank top_n={TOP_N} "
+        f"{reranked_tokens:.0f}, rerank latency: sequential {sequential_time * 1000:.1f}ms / "
+        f"parallel {parallel_time * 1000:.1f}ms / cached {cached_time * 1000:.2f}ms"
+    )
+
+    assert reranked_tokens < wide_tokens * TOP_N / CANDIDATES * 1.2
+    assert parallel_time < sequential_time
+    assert cached_time < parallel_time / 5
+
+
+def test_benchmark_rerank_warm_cache(benchmark):
+    benchmark.group = "rerank"
+    reranker = CrossEncoderReranker(model=OverlapCrossEncoder())
+    candidates = _candidates()
+    asyncio.run(reranker.rerank(QUERY, candidates, top_n=TOP_N))
+
+    docs = benchmark(lambda: asyncio.run(reranker.rerank(QUERY, candidates, top_n=TOP_N)))
+    assert len(docs) == TOP_N
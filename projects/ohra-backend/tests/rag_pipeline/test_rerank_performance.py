@@ -0,0 +1,108 @@
+"""RAG Pipeline rerank 단계 end-to-end 지연 시간 / 프롬프트 토큰 비교 테스트"""
+
+import pytest
+import aiohttp
+import time
+from datetime import datetime
+from pathlib import Path
+
+from tests.utils.api_client import make_chat_request
+from tests.utils.test_helpers import (
+    print_test_header,
+    print_test_summary,
+    save_test_results,
+)
+
+
+QUERY_SET = [
+    "ai 아메바는 무슨일을 해",
+    "어뷰징 경고 알림톡 수신자 필터 기능",
+    "배포 프로세스는 어떻게 되나요",
+]
+# 기존 방식(recall 을 위해 top_k 를 키움) vs 넓게 검색 후 rerank 로 상위 5개만 사용
+VARIANTS = {
+    "wide_top_k": {"top_k": 20, "rerank": False},
+    "rerank_top_5": {"top_k": 5, "rerank": True},
+}
+
+
+@pytest.mark.asyncio
+async def test_rerank_latency_and_prompt_tokens():
+    """rerank 사용 여부에 따른 end-to-end 응답 시간과 prompt 토큰 수 비교"""
+    test_start = time.time()
+
+    test_info = {
+        "test_name": "RAG Pipeline rerank 성능 테스트",
+        "test_type": "rag_pipeline",
+        "is_evaluation_target": False,
+        "started_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+    print_test_header(
+        test_info["test_name"],
+        "top_k 20 으로 모두 프롬프트에 넣는 경우와 cross-encoder rerank 후 5개만 넣는 경우를 비교합니다.",
+        is_evaluation_target=False,
+    )
+
+    results = []
+
+    async with aiohttp.ClientSession() as session:
+        for i, query in enumerate(QUERY_SET, 1):
+            print(f"[TESTING] 쿼리 {i}/{len(QUERY_SET)}: {query[:50]}...")
+
+            for variant, retrieval in VARIANTS.items():
+                start_time = time.time()
+                response = await make_chat_request(session, query, retrieval=retrieval)
+                elapsed = time.time() - start_time
+                info = response.get("response", {}).get("retrieval") or {}
+
+                results.append(
+                    {
+                        "query": query,
+                        "variant": variant,
+                        "status": response.get("status", 0),
+                        "response_time": elapsed,
+                        "prompt_tokens": response.get("usage", {}).get("prompt_tokens", 0),
+                        "reranked": info.get("reranked", False),
+                    }
+                )
+
+                print(
+                    f"  [{variant}] Status={response.get('status', 0)}, Time={elapsed:.3f}s, "
+                    f"prompt_tokens={results[-1]['prompt_tokens']}, reranked={results[-1]['reranked']}"
+                )
+
+    success_count = sum(1 for r in results if r["status"] == 200)
+    summary = {
+        variant: {
+            "avg_response_time": sum(r["response_time"] for r in results if r["variant"] == variant) / len(QUERY_SET),
+            "avg_prompt_tokens": sum(r["prompt_tokens"] for r in results if r["variant"] == variant) / len(QUERY_SET),
+        }
+        for variant in VARIANTS
+    }
+    fewer_tokens = summary["rerank_top_5"]["avg_prompt_tokens"] < summary["wide_top_k"]["avg_prompt_tokens"]
+
+    test_info["completed_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    test_info["total_duration"] = time.time() - test_start
+    test_info["result"] = {
+        "actual_value": f"성공: {success_count}/{len(results)}, 변형별: {summary}",
+        "achieved": success_count == len(results),
+        "suitable": success_count == len(results) and fewer_tokens,
+        "suitability_reason": (
+            "rerank 후 프롬프트 토큰 감소"
+            if fewer_tokens
+            else "rerank 후에도 프롬프트 토큰이 줄지 않음 (reranker 미설정 여부 확인)"
+        ),
+    }
+    test_info["details"] = {
+        "results": results,
+        "success_count": success_count,
+        "summary": summary,
+    }
+
+    print_test_summary(test_info)
+
+    output_dir = Path(__file__).parent.parent / "results"
+    save_test_results("rag_pipeline_rerank_performance", test_info, output_dir)
+
+    return test_info
@@ -0,0 +1,158 @@
+"""exact-match LLM 응답 cache 테스트 (로컬 fake endpoint 대상)"""
+
+from types import SimpleNamespace
+from typing import Dict, Optional
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from ohra.backend.rag.dtos.request import ChatCompletionRequest
+from ohra.backend.rag.service.v1.pipeline import LangchainRAGAnalyzer
+from ohra.backend.rag.service.v1.response_cache import LLMResponseCache, build_response_cache
+from ohra.backend.rag.service.v1.settings import LangchainRAGAnalyzerConfig
+from ohra.shared_kernel.infra.cache import LRUMemoryBackend
+from ohra.shared_kernel.infra.cache import backends as cache_backends
+from ohra.shared_kernel.infra.sagemaker import SageMakerLLMAdapter
+from ohra.shared_kernel.infra.timing import start_timings
+from tests.utils.fakes import FakeRetriever, build_analyzer, chat_request
+
+LLM_SECONDS = 0.05
+
+
+class DictBackend:
+    """fastapi-cache backend 와 같은 get / set 인터페이스"""
+
+    def __init__(self, fail: bool = False):
+        self.values: Dict[str, bytes] = {}
+        self.fail = fail
+
+    async def get(self, key: str) -> Optional[bytes]:
+        if self.fail:
+            raise ConnectionError("redis down")
+        return self.values.get(key)
+
+    async def set(self, key: str, value: bytes, expire: Optional[int] = None) -> None:
+        if self.fail:
+            raise ConnectionError("redis down")
+        self.values[key] = value
+
+
+def _analyzer(endpoint, cache: LLMResponseCache, retriever: FakeRetriever) -> LangchainRAGAnalyzer:
+    llm = SageMakerLLMAdapter(endpoint_name="fake", endpoint_url=endpoint.url)
+    return build_analyzer(retriever, llm=llm, response_cache=cache)
+
+
+def _request(temperature: float = 0.0, **kwargs) -> ChatCompletionRequest:
+    return chat_request(temperature=temperature, retrieval={"top_k": 1}, **kwargs)
+
+
+def test_key_covers_prompt_and_generation_params():
+    """평가대상: 프롬프트나 생성 파라미터 중 하나라도 다르면 다른 key, stream 등 나머지 필드는 무시해야 함"""
+    cache = LLMResponseCache(backend=DictBackend())
+    payload = {"model": "m", "messages": [{"role": "user", "content": "q"}], "temperature": 0, "max_tokens": 100}
+
+    assert cache.key(payload) == cache.key({**payload, "stream": True})
+    assert cache.key(payload) != cache.key({**payload, "max_tokens": 200})
+    assert cache.key(payload) != cache.key({**payload, "messages": [{"role": "user", "content": "q2"}]})
+    assert cache.key(payload) != cache.key({**payload, "model": "m2"})
+
+
+@pytest.mark.asyncio
+async def test_deterministic_request_skips_endpoint(endpoint):
+    """평가대상: temperature 0 인 같은 질문은 endpoint 를 부르지 않고 저장된 응답을 새 id 로 돌려줘야 함"""
+    cache = LLMResponseCache(backend=DictBackend())
+    analyzer = _analyzer(endpoint, cache, FakeRetriever())
+    try:
+        first = await analyzer.ainvoke(_request())
+        timings = start_timings()
+        second = await analyzer.ainvoke(_request())
+    finally:
+        analyzer.llm.shutdown()
+
+    assert endpoint.requests == 1
+    assert second.choices[0].message.content == first.choices[0].message.content
+    assert second.id != first.id and second.usage is None
+    assert second.retrieval.cached and not first.retrieval.cached
+    assert "response_cache" in timings.stages and "llm" not in timings.stages
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_only_deterministic_or_opted_in_requests_are_cached(endpoint):
+    """평가대상: temperature 가 0 이 아니면 cache=true 일 때만, cache=false 면 temperature 0 이어도 매번 생성해야 함"""
+    cache = LLMResponseCache(backend=DictBackend())
+    analyzer = _analyzer(endpoint, cache, FakeRetriever())
+    try:
+        for request in [_request(0.7), _request(0.7), _request(0.0, cache=False), _request(0.0, cache=False)]:
+            await analyzer.ainvoke(request)
+        assert endpoint.requests == 4 and cache.stats()["hits"] + cache.stats()["misses"] == 0
+
+        # 내부 bot 처럼 cache=true 로 명시하면 temperature 와 상관없이 재사용한다
+        await analyzer.ainvoke(_request(0.7, cache=True))
+        await analyzer.ainvoke(_request(0.7, cache=True))
+    finally:
+        analyzer.llm.shutdown()
+
+    assert endpoint.requests == 5 and cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_changed_documents_miss(endpoint):
+    """평가대상: 검색 문서가 바뀌면 프롬프트가 달라지므로 이전 응답을 쓰지 않아야 함"""
+    cache = LLMResponseCache(backend=DictBackend())
+    retriever = FakeRetriever()
+    analyzer = _analyzer(endpoint, cache, retriever)
+    try:
+        await analyzer.ainvoke(_request())
+        retriever.content = "바뀐 배포 문서"
+        await analyzer.ainvoke(_request())
+    finally:
+        analyzer.llm.shutdown()
+
+    assert endpoint.requests == 2 and cache.stats()["hits"] == 0
+
+
+@pytest.mark.asyncio
+async def test_backend_failure_falls_back_to_endpoint(endpoint):
+    """평가대상: cache backend(Redis) 장애는 miss 로 처리하고 답변은 정상 생성해야 함"""
+    cache = LLMResponseCache(backend=DictBackend(fail=True))
+    analyzer = _analyzer(endpoint, cache, FakeRetriever())
+    try:
+        response = await analyzer.ainvoke(_request())
+    finally:
+        analyzer.llm.shutdown()
+
+    assert response.choices[0].message.content
+    assert endpoint.requests == 1
+    assert cache.stats()["errors"] == 2 and cache.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_is_bounded_and_expires(monkeypatch):
+    """평가대상: 메모리 backend 는 인스턴스마다 따로 두고, 상한을 넘으면 LRU 로 버리며 TTL 이 지나면 지워야 함"""
+    now = [1000.0]
+    monkeypatch.setattr(cache_backends, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    backend, other = LRUMemoryBackend(max_entries=2), LRUMemoryBackend(max_entries=2)
+
+    await backend.set("a", b"1", expire=60)
+    await backend.set("b", b"2", expire=60)
+    assert await backend.get("a") == b"1"  # a 를 최근에 썼으므로 b 가 먼저 밀려난다
+    await backend.set("c", b"3", expire=60)
+    assert (await backend.get("b"), len(backend)) == (None, 2)
+    assert await other.get("a") is None
+
+    now[0] += 61
+    assert await backend.get_with_ttl("a") == (0, None)
+    assert await backend.get("c") is None and len(backend) == 0
+
+
+def test_response_cache_without_url_uses_bounded_memory_backend():
+    """평가대상: response_cache_url 이 없으면 설정한 항목 수 상한이 있는 process 메모리 backend 를 써야 함"""
+    config = LangchainRAGAnalyzerConfig(
+        endpoint_name="endpoint", response_cache_enabled=True, response_cache_max_entries=16
+    )
+
+    cache = build_response_cache(config)
+
+    assert isinstance(cache.backend, LRUMemoryBackend) and cache.backend.max_entries == 16
+    assert build_response_cache(config).backend is not cache.backend
@@ -0,0 +1,157 @@
+"""검색 분기별 latency budget: 늦은 분기를 취소하고 도착한 결과로 응답하는지 테스트"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import pydantic
+import pytest
+
+from ohra.backend.rag.dtos.request import ChatCompletionRequest
+from ohra.backend.rag.retrieval.hybrid.retriever import HybridRetriever
+from ohra.backend.rag.retrieval.hybrid.service import HybridSearchService
+from ohra.backend.rag.service.v1.schema import RetrievedDocument
+
+SLOW_SECONDS = 1.0
+
+
+@dataclass
+class DelayedRetriever:
+    """``delay`` 초 뒤에 고정된 문서를 돌려주는 retriever 대역"""
+
+    name: str
+    ids: List[int]
+    delay: float = 0.0
+    cancelled: bool = False
+    embedding: Any = None
+
+    async def retrieve(self, query: str, top_k: int = 5, filter: Optional[Dict[str, Any]] = None, context=None):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return [RetrievedDocument(id=i, score=1.0, metadata={"source": self.name}) for i in self.ids[:top_k]]
+
+
+@dataclass
+class DelayedEmbedding:
+    delay: float = 0.0
+
+    async def embed_text(self, text: str) -> List[float]:
+        await asyncio.sleep(self.delay)
+        return [0.1, 0.2, 0.3]
+
+
+@dataclass
+class DelayedVectorStore:
+    """dense / sparse query 가 각각 지정한 시간 뒤에 응답하는 Qdrant 대역"""
+
+    dense_delay: float = 0.0
+    sparse_delay: float = 0.0
+
+    async def search(self, query_vector, top_k: int = 5, filter: Optional[Dict[str, Any]] = None, **kwargs):
+        await asyncio.sleep(self.dense_delay)
+        return [{"id": i, "score": 1.0, "metadata": {"source": "dense"}} for i in [1, 2][:top_k]]
+
+    async def search_sparse(self, query_sparse_vector, top_k: int = 5, filter: Optional[Dict[str, Any]] = None):
+        await asyncio.sleep(self.sparse_delay)
+        return [{"id": i, "score": 1.0, "metadata": {"source": "sparse"}} for i in [3, 4][:top_k]]
+
+
+def _qdrant_hybrid_service(store: DelayedVectorStore, embedding_delay: float = 0.0) -> HybridSearchService:
+    embedding = DelayedEmbedding(embedding_delay)
+    return HybridSearchService(
+        vector_retriever=DelayedRetriever("vector", [1, 2], embedding=embedding),
+        keyword_retriever=DelayedRetriever("keyword", [3, 4]),
+        hybrid_retriever=HybridRetriever(vector_store=store, embedding=embedding),
+        budget_ms=100,
+    )
+
+
+def _service(keyword_delay: float, budget_ms: Optional[float] = 100) -> HybridSearchService:
+    return HybridSearchService(
+        vector_retriever=DelayedRetriever("vector", [1, 2]),
+        keyword_retriever=DelayedRetriever("keyword", [3, 4], delay=keyword_delay),
+        budget_ms=budget_ms,
+    )
+
+
+@pytest.mark.asyncio
+async def test_slow_branch_is_dropped_and_fusion_uses_arrived_results():
+    """평가대상: budget 을 넘긴 keyword 분기는 취소되고 vector 결과만으로 hybrid 응답을 budget 안에 돌려줘야 함"""
+    service = _service(keyword_delay=SLOW_SECONDS)
+    context = service.create_context("배포 절차")
+
+    start = time.perf_counter()
+    docs = await service.search("배포 절차", top_k=2, search_mode="hybrid", context=context)
+    elapsed = time.perf_counter() - start
+
+    assert [doc.id for doc in docs] == [1, 2]
+    assert context.dropped_branches == ["keyword"]
+    assert service.keyword_retriever.cancelled
+    assert elapsed < SLOW_SECONDS / 2
+
+
+@pytest.mark.asyncio
+async def test_branches_within_budget_are_kept():
+    """평가대상: 모든 분기가 budget 안에 끝나면 dropped_branches 는 비어 있고 두 결과가 합쳐져야 함"""
+    service = _service(keyword_delay=0.01)
+    context = service.create_context("배포 절차")
+
+    docs = await service.search("배포 절차", top_k=4, search_mode="hybrid", context=context)
+
+    assert {doc.id for doc in docs} == {1, 2, 3, 4}
+    assert context.dropped_branches == []
+
+
+@pytest.mark.asyncio
+async def test_qdrant_hybrid_keeps_dense_when_sparse_query_is_late():
+    """평가대상: Qdrant hybrid 도 dense / sparse query 마다 budget 을 두어 늦은 sparse 만 버리고 dense 결과를 써야 함"""
+    service = _qdrant_hybrid_service(DelayedVectorStore(sparse_delay=SLOW_SECONDS))
+    context = service.create_context("배포 절차")
+
+    start = time.perf_counter()
+    docs = await service.search("배포 절차", top_k=2, search_mode="hybrid", context=context)
+    elapsed = time.perf_counter() - start
+
+    assert [doc.id for doc in docs] == [1, 2]
+    assert context.dropped_branches == ["sparse"]
+    assert elapsed < SLOW_SECONDS / 2
+
+
+@pytest.mark.asyncio
+async def test_qdrant_hybrid_budget_includes_query_embedding():
+    """평가대상: query embedding 이 budget 을 넘기면 dense 분기를 버리고 sparse 결과만으로 결합해야 함"""
+    service = _qdrant_hybrid_service(DelayedVectorStore(), embedding_delay=SLOW_SECONDS)
+    context = service.create_context("배포 절차")
+
+    start = time.perf_counter()
+    docs = await service.search("배포 절차", top_k=2, search_mode="hybrid", context=context)
+    elapsed = time.perf_counter() - start
+
+    assert [doc.id for doc in docs] == [3, 4]
+    assert context.dropped_branches == ["dense"]
+    assert elapsed < SLOW_SECONDS / 2
+
+
+@pytest.mark.asyncio
+async def test_request_budget_overrides_configured_budget():
+    """평가대상: 요청 budget_ms 가 설정값보다 우선해야 함 (넉넉한 budget 이면 느린 분기도 기다림)"""
+    service = _service(keyword_delay=0.2, budget_ms=50)
+    context = service.create_context("배포 절차")
+
+    docs = await service.search("배포 절차", top_k=2, search_mode="keyword", context=context, budget_ms=1000)
+
+    assert [doc.id for doc in docs] == [3, 4]
+    assert context.dropped_branches == []
+
+
+def test_request_budget_must_be_positive():
+    """평가대상: retrieval.budget_ms 는 0 보다 커야 함"""
+    request = ChatCompletionRequest(messages=[{"role": "user", "content": "배포"}], retrieval={"budget_ms": 300})
+    assert request.retrieval.budget_ms == 300
+
+    with pytest.raises(pydantic.ValidationError):
+        ChatCompletionRequest(messages=[{"role": "user", "content": "배포"}], retrieval={"budget_ms": 0})
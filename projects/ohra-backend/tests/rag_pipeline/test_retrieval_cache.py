@@ -0,0 +1,173 @@
+"""index generation 으로 무효화되는 검색 결과 cache 테스트"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from ohra.backend.rag.retrieval.cache import RetrievalCache, collection_generation
+from ohra.backend.rag.retrieval.hybrid.service import HybridSearchService
+from ohra.backend.rag.service.v1.schema import RetrievedDocument
+from ohra.shared_kernel.infra.qdrant import SYNC_GENERATION_KEY
+
+
+@dataclass
+class CountingRetriever:
+    """호출 횟수를 세고 ``delay`` 초 뒤 고정된 문서를 돌려주는 retriever 대역"""
+
+    ids: List[int]
+    delay: float = 0.0
+    calls: int = 0
+    embedding: Any = None
+
+    async def retrieve(self, query: str, top_k: int = 5, filter: Optional[Dict[str, Any]] = None, context=None):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return [RetrievedDocument(id=i, score=1.0, metadata={}) for i in self.ids[:top_k]]
+
+
+@dataclass
+class Generation:
+    value: Optional[int] = 1
+
+    async def __call__(self) -> Optional[int]:
+        return self.value
+
+
+@dataclass
+class MetadataVectorStore:
+    """sync worker 가 올린 collection metadata 를 돌려주고 조회 횟수를 세는 Qdrant 대역"""
+
+    metadata: Dict[str, Any]
+    delay: float = 0.0
+    reads: int = 0
+
+    async def get_collection_metadata(self) -> Dict[str, Any]:
+        self.reads += 1
+        await asyncio.sleep(self.delay)
+        return dict(self.metadata)
+
+
+def _service(generation: Generation, keyword_delay: float = 0.0, budget_ms: Optional[float] = None):
+    return HybridSearchService(
+        vector_retriever=CountingRetriever([1, 2, 3]),
+        keyword_retriever=CountingRetriever([3, 4], delay=keyword_delay),
+        budget_ms=budget_ms,
+        cache=RetrievalCache(generation=generation, max_size=8),
+    )
+
+
+@pytest.mark.asyncio
+async def test_normalized_identical_queries_hit_cache():
+    """평가대상: 공백/대소문자만 다른 같은 질의는 embedding·검색 없이 cache 결과를 돌려줘야 함"""
+    service = _service(Generation())
+
+    first = await service.search("API 인증  방식", top_k=3, filter={"space_key": "DEV"}, search_mode="hybrid")
+    second = await service.search(" api 인증 방식", top_k=3, filter={"space_key": "DEV"}, search_mode="hybrid")
+
+    assert [doc.id for doc in first] == [doc.id for doc in second]
+    assert service.vector_retriever.calls == 1 and service.keyword_retriever.calls == 1
+    assert service.cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "other",
+    [
+        {"filter": {"space_key": "OPS"}},
+        {"top_k": 2},
+        {"search_mode": "vector"},
+    ],
+)
+async def test_filter_top_k_and_mode_are_part_of_key(other):
+    """평가대상: filter / top_k / search_mode 가 다르면 다른 항목이어야 함"""
+    service = _service(Generation())
+    base = {"filter": {"space_key": "DEV"}, "top_k": 3, "search_mode": "hybrid"}
+
+    await service.search("배포 절차", **base)
+    await service.search("배포 절차", **{**base, **other})
+
+    assert service.cache.stats()["hits"] == 0
+
+
+@pytest.mark.asyncio
+async def test_new_generation_invalidates_entries():
+    """평가대상: TTL 과 무관하게 generation 이 바뀌기 전까지 유지되고, 바뀌면 다시 검색해야 함"""
+    generation = Generation()
+    service = _service(generation)
+
+    await service.search("배포 절차", top_k=3, search_mode="vector")
+    await service.search("배포 절차", top_k=3, search_mode="vector")
+    generation.value = 2
+    await service.search("배포 절차", top_k=3, search_mode="vector")
+
+    assert service.vector_retriever.calls == 2
+    assert service.cache.stats() == {"generation": 2, "size": 1, "hits": 1, "misses": 2}
+
+
+@pytest.mark.asyncio
+async def test_partial_and_unversioned_results_are_not_cached():
+    """평가대상: budget 초과로 분기가 빠진 결과와 generation 을 모를 때의 결과는 저장하지 않아야 함"""
+    service = _service(Generation(), keyword_delay=0.2, budget_ms=20)
+    await service.search("배포 절차", top_k=3, search_mode="hybrid")
+    assert service.cache.stats()["size"] == 0
+
+    service = _service(Generation(value=None))
+    await service.search("배포 절차", top_k=3, search_mode="vector")
+    await service.search("배포 절차", top_k=3, search_mode="vector")
+    assert service.vector_retriever.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_result_from_previous_generation_is_not_stored():
+    """평가대상: 검색 중에 새 generation 이 게시되면 그 뒤 다른 요청이 없더라도 이전 결과를 저장하지 않아야 함"""
+    generation = Generation()
+    service = _service(generation, keyword_delay=0.05)
+
+    search = asyncio.ensure_future(service.search("배포 절차", top_k=3, search_mode="hybrid"))
+    await asyncio.sleep(0.01)
+    generation.value = 2
+    await search
+
+    assert service.cache.stats()["size"] == 0
+    await service.search("배포 절차", top_k=3, search_mode="hybrid")
+    assert service.keyword_retriever.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_collection_generation_is_read_once_per_refresh():
+    """평가대상: 검색마다 Qdrant 를 부르지 않고 refresh 주기마다 한 번만 collection metadata 를 읽어야 함"""
+    store = MetadataVectorStore({SYNC_GENERATION_KEY: 1}, delay=0.01)
+    generation = collection_generation(store, refresh_seconds=0.2)
+
+    # 만료 뒤 동시에 들어온 요청은 조회 하나를 함께 기다린다
+    assert await asyncio.gather(*(generation() for _ in range(5))) == [1] * 5
+    store.metadata[SYNC_GENERATION_KEY] = 2
+    assert await generation() == 1
+    await asyncio.sleep(0.25)
+    assert await generation() == 2
+    assert store.reads == 2
+
+
+@pytest.mark.asyncio
+async def test_collection_generation_follows_sync_worker():
+    """평가대상: sync worker 가 generation 을 올리기 전에는 캐시하지 않고, 올리면 그 값으로 무효화해야 함"""
+    store = MetadataVectorStore({})
+    service = HybridSearchService(
+        vector_retriever=CountingRetriever([1, 2, 3]),
+        keyword_retriever=CountingRetriever([3, 4]),
+        cache=RetrievalCache(generation=collection_generation(store, refresh_seconds=0), max_size=8),
+    )
+
+    await service.search("배포 절차", top_k=3, search_mode="vector")
+    assert service.cache.stats()["size"] == 0
+
+    store.metadata[SYNC_GENERATION_KEY] = 1
+    await service.search("배포 절차", top_k=3, search_mode="vector")
+    await service.search("배포 절차", top_k=3, search_mode="vector")
+    store.metadata[SYNC_GENERATION_KEY] = 2
+    await service.search("배포 절차", top_k=3, search_mode="vector")
+
+    assert service.vector_retriever.calls == 3
+    assert service.cache.stats() == {"generation": 2, "size": 1, "hits": 1, "misses": 3}
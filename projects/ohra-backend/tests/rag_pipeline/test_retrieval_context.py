@@ -0,0 +1,112 @@
+"""요청 단위 RetrievalContext 로 검색 분기들이 query embedding / sparse 벡터를 한 번만 계산하는지 테스트"""
+
+import asyncio
+from typing import Any, List
+
+import pytest
+
+from ohra.backend.rag.retrieval.context import RetrievalContext
+from ohra.backend.rag.retrieval.hybrid.retriever import HybridRetriever
+from ohra.backend.rag.retrieval.hybrid.service import HybridSearchService
+from ohra.backend.rag.retrieval.keyword.retriever import BM25Retriever
+from ohra.backend.rag.retrieval.sparse.retriever import SparseRetriever
+from ohra.backend.rag.retrieval.vector.retriever import VectorRetriever
+
+QUERY = "배포 프로세스 승인 절차"
+
+
+class CountingEmbedding:
+    """embed_text 호출 횟수를 세는 SageMaker embedding 대역"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def embed_text(self, text: str) -> List[float]:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return [0.1, 0.2, 0.3]
+
+
+class RecordingVectorStore:
+    """검색 요청에 넘어온 벡터를 기록하는 Qdrant 대역"""
+
+    def __init__(self):
+        self.dense_vectors: List[Any] = []
+        self.sparse_vectors: List[Any] = []
+        self.docs = [
+            {"id": 1, "metadata": {"content": "배포 프로세스는 main merge 시 자동으로 실행됩니다."}},
+            {"id": 2, "metadata": {"content": "production 배포는 승인자가 수동으로 트리거합니다."}},
+        ]
+
+    async def search(self, query_vector, top_k=5, filter=None, query_sparse_vector=None, fusion=None, rrf_k=60):
+        self.dense_vectors.append(query_vector)
+        if query_sparse_vector is not None:
+            self.sparse_vectors.append(query_sparse_vector)
+        return [{"id": doc["id"], "score": 1.0, "metadata": doc["metadata"]} for doc in self.docs[:top_k]]
+
+    async def search_sparse(self, query_sparse_vector, top_k=5, filter=None):
+        self.sparse_vectors.append(query_sparse_vector)
+        return [{"id": doc["id"], "score": 1.0, "metadata": doc["metadata"]} for doc in self.docs[:top_k]]
+
+    async def get_all_by_filter(self, filter, batch_size=1000, with_payload=True):
+        return self.docs
+
+    async def get_all_modified_since(self, since, field="indexed_at", with_payload=True):
+        return []
+
+    async def retrieve(self, ids):
+        return [doc for doc in self.docs if doc["id"] in ids]
+
+
+def _service(keyword: str = "sparse", server_hybrid: bool = True) -> HybridSearchService:
+    store, embedding = RecordingVectorStore(), CountingEmbedding()
+    keyword_retriever = BM25Retriever(vector_store=store) if keyword == "bm25" else SparseRetriever(vector_store=store)
+    return HybridSearchService(
+        vector_retriever=VectorRetriever(vector_store=store, embedding=embedding),
+        keyword_retriever=keyword_retriever,
+        hybrid_retriever=HybridRetriever(vector_store=store, embedding=embedding) if server_hybrid else None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_client_side_hybrid_with_bm25_branch():
+    """평가대상: vector + BM25 분기를 RRF 로 합칠 때 BM25 는 context 토큰으로 검색하고 embedding 은 1회여야 함"""
+    service = _service(keyword="bm25", server_hybrid=False)
+    context = service.create_context(QUERY)
+
+    docs = await service.search(QUERY, top_k=2, search_mode="hybrid", context=context)
+
+    assert {doc.id for doc in docs} == {1, 2}
+    assert ("tokens", service.keyword_retriever.tokenizer.name) in context._tasks
+    assert service.vector_retriever.embedding.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_branches_sharing_a_context_reuse_embedding_and_sparse_vector():
+    """평가대상: 같은 context 를 받은 hybrid / vector / keyword 분기가 embedding 과 sparse 벡터를 재사용해야 함"""
+    service = _service()
+    context = service.create_context(QUERY)
+
+    await asyncio.gather(
+        *[service.search(QUERY, top_k=2, search_mode=mode, context=context) for mode in ["hybrid", "vector", "keyword"]]
+    )
+
+    store = service.vector_retriever.vector_store
+    assert service.vector_retriever.embedding.calls == 1
+    assert len(store.dense_vectors) == 2 and store.dense_vectors[0] is store.dense_vectors[1]
+    assert len(store.sparse_vectors) == 2 and store.sparse_vectors[0] is store.sparse_vectors[1]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_branch_does_not_cancel_shared_embedding():
+    """평가대상: 한 분기가 취소돼도 같은 embedding 을 기다리는 다른 분기는 결과를 받아야 함"""
+    embedding = CountingEmbedding()
+    context = RetrievalContext(QUERY, embedding=embedding)
+
+    first = asyncio.ensure_future(context.query_vector())
+    second = asyncio.ensure_future(context.query_vector())
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == [0.1, 0.2, 0.3]
+    assert embedding.calls == 1
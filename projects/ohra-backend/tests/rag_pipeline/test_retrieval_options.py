@@ -0,0 +1,137 @@
+"""요청 단위 검색 옵션(search_mode, top_k, filter) 검증 및 HybridSearchService 라우팅 테스트"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import pydantic
+import pytest
+
+from ohra.backend.rag.dtos.request import ChatCompletionRequest
+from ohra.backend.rag.retrieval.hybrid.retriever import HybridRetriever
+from ohra.backend.rag.retrieval.hybrid.service import HybridSearchService, build_search_service
+from ohra.backend.rag.retrieval.keyword.retriever import BM25Retriever
+from ohra.backend.rag.service.v1.settings import LangchainRAGAnalyzerConfig
+from ohra.backend.rag.service.v1.schema import RetrievedDocument
+
+
+@dataclass
+class RecordingRetriever:
+    """호출 인자를 기록하고 고정된 문서를 돌려주는 retriever 대역"""
+
+    name: str
+    ids: List[int]
+    calls: List[Dict[str, Any]] = field(default_factory=list)
+    embedding: Any = None
+
+    async def retrieve(self, query: str, top_k: int = 5, filter: Optional[Dict[str, Any]] = None, context=None):
+        self.calls.append({"query": query, "top_k": top_k, "filter": filter})
+        return [
+            RetrievedDocument(id=i, score=1.0 / (rank + 1), metadata={"source": self.name})
+            for rank, i in enumerate(self.ids)
+        ]
+
+
+class FixedEmbedding:
+    async def embed_text(self, text: str) -> List[float]:
+        return [0.1, 0.2, 0.3]
+
+
+@dataclass
+class RecordingVectorStore:
+    """Qdrant dense / sparse query 인자를 기록하는 대역"""
+
+    calls: List[Dict[str, Any]] = field(default_factory=list)
+
+    async def search(self, query_vector, top_k: int = 5, filter: Optional[Dict[str, Any]] = None, **kwargs):
+        self.calls.append({"using": "dense", "top_k": top_k, "filter": filter})
+        return [{"id": 9, "score": 0.9, "metadata": {"source": "dense"}}]
+
+    async def search_sparse(self, query_sparse_vector, top_k: int = 5, filter: Optional[Dict[str, Any]] = None):
+        self.calls.append({"using": "sparse", "top_k": top_k, "filter": filter})
+        return [{"id": 8, "score": 3.0, "metadata": {"source": "sparse"}}, {"id": 9, "score": 1.0, "metadata": {}}]
+
+
+def _service(with_server_hybrid: bool = False) -> HybridSearchService:
+    embedding = FixedEmbedding() if with_server_hybrid else None
+    return HybridSearchService(
+        vector_retriever=RecordingRetriever("vector", [1, 2, 3], embedding=embedding),
+        keyword_retriever=RecordingRetriever("keyword", [3, 4]),
+        hybrid_retriever=HybridRetriever(RecordingVectorStore(), embedding) if with_server_hybrid else None,
+    )
+
+
+def test_request_accepts_retrieval_options():
+    """평가대상: retrieval 옵션이 ChatCompletionRequest 로 파싱되어야 함"""
+    request = ChatCompletionRequest(
+        messages=[{"role": "user", "content": "배포 절차"}],
+        retrieval={"search_mode": "keyword", "top_k": 3, "filter": {"space_key": "DEV", "source_type": "confluence"}},
+    )
+
+    assert request.retrieval.search_mode == "keyword"
+    assert request.retrieval.top_k == 3
+    assert request.retrieval.filter == {"space_key": "DEV", "source_type": "confluence"}
+    assert ChatCompletionRequest(messages=[{"role": "user", "content": "배포"}]).retrieval is None
+
+
+@pytest.mark.parametrize(
+    "retrieval",
+    [
+        {"search_mode": "semantic"},
+        {"top_k": 0},
+        {"top_k": 500},
+        {"filter": {"title": "배포"}},
+    ],
+)
+def test_request_rejects_invalid_retrieval_options(retrieval):
+    """평가대상: 알 수 없는 모드, 범위를 벗어난 top_k, 인덱싱되지 않은 필터 필드는 거부해야 함"""
+    with pytest.raises(pydantic.ValidationError):
+        ChatCompletionRequest(messages=[{"role": "user", "content": "배포"}], retrieval=retrieval)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("search_mode", ["vector", "keyword"])
+async def test_single_mode_calls_only_that_retriever(search_mode):
+    """평가대상: vector / keyword 모드는 해당 retriever 하나만 호출하고 filter 와 top_k 를 그대로 넘겨야 함"""
+    service = _service()
+    docs = await service.search("배포", top_k=2, filter={"space_key": "DEV"}, search_mode=search_mode)
+
+    called = service.vector_retriever if search_mode == "vector" else service.keyword_retriever
+    skipped = service.keyword_retriever if search_mode == "vector" else service.vector_retriever
+    assert called.calls == [{"query": "배포", "top_k": 2, "filter": {"space_key": "DEV"}}]
+    assert not skipped.calls
+    assert {doc.metadata["source"] for doc in docs} == {search_mode}
+
+
+@pytest.mark.asyncio
+async def test_hybrid_mode_prefers_qdrant_dense_and_sparse():
+    """평가대상: hybrid_retriever 가 있으면 hybrid 모드는 Qdrant dense / sparse query 를 각각 보내 RRF 로 합쳐야 함"""
+    service = _service(with_server_hybrid=True)
+    docs = await service.search("배포", top_k=3, filter={"project_key": "OHRA"}, search_mode="hybrid")
+
+    assert [doc.id for doc in docs] == [9, 8]
+    assert sorted(service.hybrid_retriever.vector_store.calls, key=lambda call: call["using"]) == [
+        {"using": "dense", "top_k": 6, "filter": {"project_key": "OHRA"}},
+        {"using": "sparse", "top_k": 6, "filter": {"project_key": "OHRA"}},
+    ]
+    assert not service.vector_retriever.calls and not service.keyword_retriever.calls
+
+
+@pytest.mark.asyncio
+async def test_hybrid_mode_falls_back_to_client_side_rrf():
+    """평가대상: hybrid_retriever 가 없으면 vector/keyword 결과를 RRF 로 합쳐야 함"""
+    service = _service()
+    docs = await service.search("배포", top_k=3, search_mode="hybrid")
+
+    # 3 은 두 결과에 모두 있으므로 가장 높은 RRF 점수를 받는다
+    assert docs[0].id == 3
+    assert len(docs) == 3
+
+
+def test_bm25_keyword_retriever_is_used_in_hybrid_mode():
+    """평가대상: keyword_retriever 가 bm25 면 hybrid 모드도 Qdrant sparse query 대신 dense 와 BM25 결과를 합쳐야 함"""
+    config = LangchainRAGAnalyzerConfig(keyword_retriever="bm25", retrieval_cache_size=0)
+    service = build_search_service(config, FixedEmbedding(), RecordingVectorStore())
+
+    assert isinstance(service.keyword_retriever, BM25Retriever)
+    assert service.hybrid_retriever is None
+    assert build_search_service(LangchainRAGAnalyzerConfig(), FixedEmbedding(), RecordingVectorStore()).hybrid_retriever
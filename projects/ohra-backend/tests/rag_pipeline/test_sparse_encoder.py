@@ -0,0 +1,42 @@
+"""BM25 sparse encoder 의 문서 길이 정규화 기준(avg_doc_length) 보정 테스트"""
+
+from ohra.shared_kernel.infra.tokenizer import BM25SparseEncoder, get_tokenizer
+
+CHUNKS = [
+    "배포 프로세스는 GitHub Actions 에서 main 브랜치에 merge 되면 자동으로 시작됩니다. " * 20,
+    "알림톡 발송 실패 시 SMS 로 대체 발송하며 실패 로그는 Datadog 에서 확인할 수 있습니다. " * 15,
+    "데이터베이스 마이그레이션은 alembic 으로 관리하며 배포 전에 upgrade head 를 실행합니다. " * 25,
+]
+
+
+def test_calibrate_uses_average_token_count():
+    """평가대상: avg_doc_length 는 글자 수가 아니라 청크의 평균 토큰 수(유효숫자 두 자리)여야 함"""
+    tokenizer = get_tokenizer("ngram")
+    tokens = [len(tokenizer.tokenize(chunk)) for chunk in CHUNKS]
+
+    encoder = BM25SparseEncoder(tokenizer=tokenizer).calibrate(CHUNKS)
+
+    assert abs(encoder.avg_doc_length - sum(tokens) / len(tokens)) <= sum(tokens) / len(tokens) * 0.05
+    assert encoder.avg_doc_length != sum(len(chunk) for chunk in CHUNKS) / len(CHUNKS)
+
+
+def test_small_corpus_drift_keeps_version():
+    """평가대상: corpus 가 조금 바뀐 정도로는 encoder version 이 바뀌어 전체 재색인이 일어나지 않아야 함"""
+    encoder = BM25SparseEncoder()
+
+    before = encoder.calibrate(CHUNKS)
+    after = encoder.calibrate(CHUNKS + [CHUNKS[0][:-10]])
+
+    assert before.version == after.version
+    assert encoder.calibrate([]) is encoder
+
+
+def test_average_length_chunk_gets_plain_bm25_tf():
+    """평가대상: 평균 길이 청크는 길이 정규화 없이 tf*(k1+1)/(tf+k1) 가중치를 받아야 함"""
+    tokens = ["배포"] + ["기타"] * 99
+    encoder = BM25SparseEncoder(avg_doc_length=len(tokens))
+
+    weights = dict(zip(*encoder.encode_document_tokens(tokens).values()))
+
+    k1 = encoder.k1
+    assert min(weights.values()) == 1 * (k1 + 1) / (1 + k1)
@@ -0,0 +1,145 @@
+"""요청 단계별 소요 시간(Server-Timing) 측정 테스트 (로컬 fake endpoint 대상)"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from ohra.backend.rag.dtos.request import ChatCompletionRequest
+from ohra.backend.rag.retrieval.hybrid.retriever import HybridRetriever
+from ohra.backend.rag.retrieval.hybrid.service import HybridSearchService
+from ohra.backend.rag.retrieval.sparse.retriever import SparseRetriever
+from ohra.backend.rag.retrieval.vector.retriever import VectorRetriever
+from ohra.backend.rag.service.v1.pipeline import LangchainRAGAnalyzer
+from ohra.backend.rag.use_case.chat_use_case import ChatCompletionUseCase
+from ohra.shared_kernel.infra.sagemaker import SageMakerLLMAdapter
+from ohra.shared_kernel.infra.timing import StageTimings, current_timings, stage, start_timings
+from tests.utils.test_helpers import parse_server_timing
+
+EMBEDDING_SECONDS = 0.03
+SEARCH_SECONDS = 0.05
+DB_SECONDS = 0.02
+LLM_SECONDS = 0.1
+
+
+class SlowEmbedding:
+    async def embed_text(self, text: str) -> List[float]:
+        await asyncio.sleep(EMBEDDING_SECONDS)
+        return [0.1] * 8
+
+
+class SlowVectorStore:
+    @staticmethod
+    def _results(first_id: int) -> List[Dict[str, Any]]:
+        ids = range(first_id, first_id + 3)
+        return [{"id": i, "score": 1.0 / (i - first_id + 1), "metadata": {"content": f"문서 {i}"}} for i in ids]
+
+    async def search(self, query_vector, top_k: int = 5, filter: Optional[Dict[str, Any]] = None, **kwargs):
+        await asyncio.sleep(SEARCH_SECONDS)
+        return self._results(0)
+
+    async def search_sparse(self, query_sparse_vector, top_k: int = 5, filter: Optional[Dict[str, Any]] = None):
+        await asyncio.sleep(SEARCH_SECONDS)
+        return self._results(10)
+
+
+class SlowDatabase:
+    @asynccontextmanager
+    async def session(self):
+        class Session:
+            def add(self, model):
+                pass
+
+            async def commit(self):
+                await asyncio.sleep(DB_SECONDS)
+
+        yield Session()
+
+
+def test_stage_accumulates_and_formats_header():
+    """평가대상: 같은 단계는 합산하고 Server-Timing 헤더로 그대로 되읽을 수 있어야 함"""
+    timings = StageTimings()
+    timings.add("dense_search", 10.0)
+    timings.add("dense_search", 2.25)
+
+    parsed = parse_server_timing(timings.server_timing())
+
+    assert parsed["dense_search"] == round(12.25, 1)
+    assert set(parsed) == {"dense_search", "total"}
+
+
+@pytest.mark.asyncio
+async def test_stages_outside_request_are_ignored():
+    """평가대상: 측정을 시작하지 않은 context(배치 작업 등)에서는 기록하지 않아야 함"""
+    async def work():
+        with stage("embedding"):
+            await asyncio.sleep(0)
+        return current_timings()
+
+    assert await asyncio.create_task(work()) is None
+
+
+@pytest.mark.asyncio
+async def test_qdrant_hybrid_reports_dense_sparse_and_fusion():
+    """평가대상: Qdrant dense / sparse query 와 RRF 결합을 한 단계로 묶지 않고 각각 측정해야 함"""
+    retriever = HybridRetriever(vector_store=SlowVectorStore(), embedding=SlowEmbedding())
+
+    timings = start_timings()
+    docs = await retriever.retrieve("배포 절차", top_k=4)
+
+    assert len(docs) == 4
+    assert set(timings.stages) == {"embedding", "dense_search", "sparse_search", "fusion"}
+    ms = timings.stages
+    assert SEARCH_SECONDS * 1000 <= ms["dense_search"] < (SEARCH_SECONDS + EMBEDDING_SECONDS) * 1000
+    assert ms["sparse_search"] >= SEARCH_SECONDS * 1000
+    assert ms["fusion"] < SEARCH_SECONDS * 1000
+
+
+@pytest.mark.asyncio
+async def test_chat_request_reports_every_stage(endpoint):
+    """평가대상: 검색 / 프롬프트 / LLM / DB 저장 단계가 각각 측정되고 실제 소요 시간과 맞아야 함"""
+    store, embedding = SlowVectorStore(), SlowEmbedding()
+    llm = SageMakerLLMAdapter(endpoint_name="fake", endpoint_url=endpoint.url)
+    analyzer = LangchainRAGAnalyzer(
+        embedding=embedding,
+        vector_store=store,
+        config={"endpoint_name": "fake", "search_mode": "hybrid"},
+        search_service=HybridSearchService(
+            vector_retriever=VectorRetriever(vector_store=store, embedding=embedding),
+            keyword_retriever=SparseRetriever(vector_store=store),
+        ),
+        llm=llm,
+    )
+    use_case = ChatCompletionUseCase(analyzer=analyzer)
+    use_case.db = SlowDatabase()
+
+    timings = start_timings()
+    try:
+        request = ChatCompletionRequest(messages=[{"role": "user", "content": "배포 절차"}])
+        response = await use_case.execute("u1", request)
+    finally:
+        llm.shutdown()
+
+    header = parse_server_timing(timings.server_timing())
+    print(f"\n[timing] {timings.server_timing()}")
+    assert set(response.timings) == set(header) == {
+        "embedding",
+        "dense_search",
+        "sparse_search",
+        "fusion",
+        "prompt",
+        "queue",
+        "llm_ttfb",
+        "llm",
+        "db",
+        "total",
+    }
+    ms = response.timings
+    assert ms["embedding"] >= EMBEDDING_SECONDS * 1000
+    # dense 검색 시간에는 embedding 시간이 들어가지 않는다
+    assert SEARCH_SECONDS * 1000 <= ms["dense_search"] < (SEARCH_SECONDS + EMBEDDING_SECONDS) * 1000
+    assert ms["sparse_search"] >= SEARCH_SECONDS * 1000
+    assert LLM_SECONDS * 1000 <= ms["llm_ttfb"] <= ms["llm"]
+    assert ms["db"] >= DB_SECONDS * 1000
+    assert ms["total"] >= ms["embedding"] + ms["dense_search"] + ms["llm"] + ms["db"]
@@ -0,0 +1,177 @@
+"""SageMaker response stream → chat.completion.chunk 스트리밍 테스트 (time-to-first-token)"""
+
+import asyncio
+import json
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List
+
+import pytest
+
+from ohra.backend.rag.dtos.request import ChatCompletionRequest
+from ohra.backend.rag.rest.fastapi import _server_sent_events
+from ohra.backend.rag.use_case.chat_use_case import ChatCompletionUseCase
+from ohra.shared_kernel.infra.sagemaker import SageMakerLLMAdapter, stream_invocation
+from tests.utils.fakes import build_analyzer, chat_request
+
+TOKENS = ["배포는 ", "main ", "merge ", "후 ", "자동으로 ", "실행됩니다."]
+TOKEN_SECONDS = 0.05  # 토큰 하나 생성 시간
+
+
+def _sse_events(tokens: List[str]) -> List[bytes]:
+    chunk = {"id": "chatcmpl-1", "object": "chat.completion.chunk", "created": 1730000000, "model": "qwen"}
+    events = [{**chunk, "choices": [{"index": 0, "delta": {"role": "assistant", "content": ""}}]}]
+    events += [{**chunk, "choices": [{"index": 0, "delta": {"content": token}}]} for token in tokens]
+    events.append({**chunk, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+    events.append({**chunk, "choices": [], "usage": {"prompt_tokens": 1500, "completion_tokens": len(tokens)}})
+    return [f"data: {json.dumps(event, ensure_ascii=False)}\n\n".encode() for event in events] + [b"data: [DONE]\n\n"]
+
+
+class FakeEventStream:
+    """botocore EventStream 대역. ``close()`` 하면 다음 event 를 기다리던 read 가 끝난다."""
+
+    def __init__(self, client: "FakeStreamingClient"):
+        self.client = client
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        body = self.client.body
+        for start in range(0, len(body), 37):
+            if self.closed.wait(TOKEN_SECONDS * 37 / len(body) * len(TOKENS) * self.client.slowdown):
+                return
+            self.client.sent = start + 37
+            yield {"PayloadPart": {"Bytes": body[start : start + 37]}}
+
+    def close(self):
+        self.closed.set()
+
+
+class FakeStreamingClient:
+    """invoke_endpoint_with_response_stream 대역. SSE 바이트를 임의의 경계로 잘라 토큰 간격으로 보낸다."""
+
+    def __init__(self, tokens: List[str] = TOKENS, slowdown: float = 1.0):
+        self.body = b"".join(_sse_events(tokens))
+        self.payloads: List[Dict[str, Any]] = []
+        self.streams: List[FakeEventStream] = []
+        self.sent = 0
+        self.slowdown = slowdown
+
+    def invoke_endpoint_with_response_stream(self, EndpointName, ContentType, Body):
+        self.payloads.append(json.loads(Body))
+        self.streams.append(FakeEventStream(self))
+        return {"Body": self.streams[-1]}
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.added: List[Any] = []
+
+    @asynccontextmanager
+    async def session(self):
+        database = self
+
+        class Session:
+            def add(self, model):
+                database.added.append(model)
+
+            async def commit(self):
+                pass
+
+        yield Session()
+
+
+def _use_case(client: FakeStreamingClient) -> ChatCompletionUseCase:
+    llm = SageMakerLLMAdapter(endpoint_name="endpoint")
+    llm.client = client
+    use_case = ChatCompletionUseCase(analyzer=build_analyzer(llm=llm))
+    use_case.db = FakeDatabase()
+    return use_case
+
+
+def _request() -> ChatCompletionRequest:
+    return chat_request(stream=True, retrieval={"search_mode": "keyword"})
+
+
+@pytest.mark.asyncio
+async def test_stream_invocation_reassembles_events_across_payload_parts():
+    """평가대상: PayloadPart 경계와 무관하게 SSE data 를 순서대로 돌려주고 [DONE] 에서 끝나야 함"""
+    client = FakeStreamingClient()
+
+    events = [json.loads(data) async for data in stream_invocation(client, "endpoint", {"stream": True})]
+
+    contents = [c["delta"].get("content") for event in events for c in event["choices"]]
+    assert "".join(filter(None, contents)) == "".join(TOKENS)
+    assert events[-1]["usage"]["completion_tokens"] == len(TOKENS)
+
+
+@pytest.mark.asyncio
+async def test_first_token_arrives_before_generation_finishes():
+    """평가대상: 첫 토큰이 전체 생성 시간보다 훨씬 먼저 도착하고 assistant 메시지는 스트림이 끝난 뒤 저장되어야 함"""
+    client = FakeStreamingClient()
+    use_case = _use_case(client)
+
+    start = time.perf_counter()
+    first_token_at = None
+    chunks = []
+    async for chunk in use_case.stream(user_id="u1", request=_request()):
+        if first_token_at is None and any(choice.delta.content for choice in chunk.choices):
+            first_token_at = time.perf_counter() - start
+            assert not use_case.db.added
+        chunks.append(chunk)
+    total = time.perf_counter() - start
+
+    print(f"\n[stream] time-to-first-token {first_token_at * 1000:.0f}ms / total {total * 1000:.0f}ms")
+    assert first_token_at < total / 2
+    assert chunks[0].object == "chat.completion.chunk" and chunks[0].retrieval.search_mode == "keyword"
+    assert chunks[-1].usage["prompt_tokens"] == 1500
+    assert client.payloads[0]["stream"] is True
+    assert [message.content for message in use_case.db.added] == ["".join(TOKENS)]
+
+
+@pytest.mark.asyncio
+async def test_disconnected_stream_is_not_persisted():
+    """평가대상: 클라이언트가 중간에 끊으면 endpoint 스트림 소비를 멈추고 메시지를 저장하지 않아야 함"""
+    client = FakeStreamingClient(tokens=TOKENS * 20)
+    use_case = _use_case(client)
+
+    stream = use_case.stream(user_id="u1", request=_request())
+    await anext(stream)
+    await anext(stream)
+    await stream.aclose()
+    time.sleep(TOKEN_SECONDS * 2)
+
+    assert not use_case.db.added
+    assert client.sent < len(client.body)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_stream_closes_response_body():
+    """평가대상: 소비자가 취소되면 다음 event 를 기다리던 응답 Body 를 닫아 thread 와 연결이 바로 정리되어야 함"""
+    client = FakeStreamingClient(slowdown=100)
+    stream = stream_invocation(client, "endpoint", {"stream": True})
+
+    task = asyncio.ensure_future(anext(stream))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await stream.aclose()
+
+    assert client.streams[0].closed.is_set()
+    assert client.sent == 0
+
+
+@pytest.mark.asyncio
+async def test_abandoned_sse_response_closes_endpoint_stream():
+    """평가대상: SSE 응답 generator 가 중간에 닫히면 안쪽 chunk 스트림과 endpoint 응답 Body 도 바로 닫혀야 함"""
+    client = FakeStreamingClient(tokens=TOKENS * 20)
+    chunks = _use_case(client).stream(user_id="u1", request=_request())
+    events = _server_sent_events(await anext(chunks), chunks)
+
+    await anext(events)
+    await anext(events)
+    await events.aclose()
+
+    assert client.streams[0].closed.is_set()
+    assert chunks.ag_frame is None  # 안쪽 generator 도 종료됨
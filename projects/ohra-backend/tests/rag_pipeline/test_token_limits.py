@@ -1,3 +1,123 @@
 """RAG Pipeline 토큰 한계 테스트"""
 # Input/Output 토큰 한계 테스트는 evaluation/test_inference_performance.py에 포함됨
-# 추가적인 RAG 파이프라인 특화 테스트는 여기에 구현 가능
+# 여기서는 검색 문서를 토큰 budget 안에 채우는 ContextPacker 를 검증한다
+
+import json
+from typing import Any, Dict, Optional
+
+import pytest
+
+from ohra.backend.rag.service.v1.context import ContextPacker, EstimatedTokenCounter, load_token_counter
+from ohra.backend.rag.service.v1.schema import RetrievedDocument
+from ohra.backend.rag.service.v1.settings import LangchainRAGAnalyzerConfig
+from tests.utils.fakes import CapturingLLM, build_analyzer, chat_request
+
+
+class WordCounter:
+    """공백 단위로 토큰을 세는 결정적인 counter 대역"""
+
+    def count(self, text: str) -> int:
+        return len(text.split())
+
+
+def _doc(id: int, score: float, content: str) -> RetrievedDocument:
+    return RetrievedDocument(id=id, score=score, metadata={"title": f"문서{id}", "content": content})
+
+
+def _sentences(n: int, words: int = 10) -> str:
+    return " ".join(" ".join(["단어"] * (words - 1)) + f" 문장{i}." for i in range(n))
+
+
+def _packer(**kwargs) -> ContextPacker:
+    return ContextPacker(counter=WordCounter(), message_overhead=0, min_chunk_tokens=5, **kwargs)
+
+
+def test_budget_leaves_room_for_generation_and_prompt():
+    """평가대상: budget = min(컨텍스트 상한, max_model_len - max_tokens - 나머지 프롬프트)"""
+    packer = _packer(max_model_len=1000, max_context_tokens=600)
+
+    assert packer.budget(["시스템 프롬프트", "질문"], max_tokens=200) == 600
+    assert packer.budget(["시스템 프롬프트", "질문"], max_tokens=700) == 297
+    assert packer.budget(["긴 " * 2000], max_tokens=200) == 0
+
+
+def test_fills_greedily_by_score_and_skips_documents_that_do_not_fit():
+    """평가대상: 점수 순으로 채우고, 문서 태그조차 들어가지 않는 문서는 건너뛰고 뒤의 작은 문서로 채워야 함"""
+    packer = _packer(max_model_len=10_000, max_context_tokens=60)
+    documents = [
+        _doc(1, 0.5, _sentences(2)),
+        _doc(2, 0.9, _sentences(3)),
+        RetrievedDocument(id=3, score=0.7, metadata={"title": "긴 제목 " * 40, "content": _sentences(1)}),
+    ]
+
+    packed = packer.pack(documents, prompt=["질문"], max_tokens=100)
+
+    assert [doc.id for doc in packed.documents] == [2, 1]
+    assert packed.tokens <= packed.budget == 60
+
+
+def test_chunk_without_sentence_break_is_truncated_by_tokens():
+    """평가대상: 문장 경계가 없는 긴 청크는 버리지 않고 토큰 단위로 잘라 남은 budget 을 채워야 함"""
+    packer = _packer(max_model_len=10_000, max_context_tokens=1000, max_chunk_tokens=35)
+    document = _doc(1, 1.0, " ".join(f"단어{i}" for i in range(200)))  # 문장 경계가 없는 로그 / 표 덤프
+
+    packed = packer.pack([document], prompt=["질문"], max_tokens=100)
+
+    assert packed.documents[0].content == " ".join(f"단어{i}" for i in range(35))
+
+
+def test_oversize_chunk_is_trimmed_at_sentence_boundary():
+    """평가대상: 청크 상한을 넘는 문서는 문장 단위로 잘려야 하고 원본 metadata 는 유지되어야 함"""
+    packer = _packer(max_model_len=10_000, max_context_tokens=1000, max_chunk_tokens=35)
+    document = _doc(1, 1.0, _sentences(10))
+    document.metadata["hash"] = "h1"
+
+    packed = packer.pack([document], prompt=["질문"], max_tokens=100)
+
+    content = packed.documents[0].content
+    assert content == _sentences(3)
+    assert content.endswith("문장2.")
+    assert packed.documents[0].metadata["hash"] == "h1"
+    assert document.content == _sentences(10)
+
+
+def test_missing_tokenizer_falls_back_to_estimate(tmp_path):
+    """평가대상: tokenizer 를 읽을 수 없으면 요청을 막지 않고 보수적인 추정치로 세야 함"""
+    counter = load_token_counter(str(tmp_path / "missing" / "tokenizer.json"))
+
+    assert isinstance(counter, EstimatedTokenCounter)
+    assert counter.count("배포 절차") == 5
+    assert counter.count("deploy") == 2
+
+
+class ManyDocumentsRetriever:
+    embedding: Any = None
+
+    async def retrieve(self, query: str, top_k: int = 5, filter: Optional[Dict[str, Any]] = None, context=None):
+        return [_doc(i, 1.0 - i / 100, _sentences(50)) for i in range(top_k)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("max_tokens", [1000, None])
+async def test_prompt_fits_model_context_with_long_documents(max_tokens):
+    """평가대상: 긴 문서가 많이 검색돼도 프롬프트 + max_tokens 가 max_model_len 을 넘지 않아야 함
+    (max_tokens 가 null 이면 설정한 기본값을 남기고 vLLM 에도 같은 값을 넘겨야 함)"""
+    counter = EstimatedTokenCounter()
+    llm = CapturingLLM()
+    analyzer = build_analyzer(
+        ManyDocumentsRetriever(),
+        config=LangchainRAGAnalyzerConfig(default_max_tokens=1000),
+        context_packer=ContextPacker(counter=counter, max_model_len=4096, max_context_tokens=4096),
+        llm=llm,
+    )
+    request = chat_request(max_tokens=max_tokens, retrieval={"search_mode": "keyword", "top_k": 20})
+
+    response = await analyzer.ainvoke(request)
+
+    assert llm.payloads[0]["max_tokens"] == 1000
+    messages = llm.payloads[0]["messages"]
+    prompt_tokens = sum(counter.count(message["content"]) + 8 for message in messages)
+    assert prompt_tokens + 1000 <= 4096
+    assert 0 < response.retrieval.documents < 20
+    assert response.retrieval.context_tokens <= 4096 - 1000
+    assert json.dumps(messages, ensure_ascii=False).count("<document>") == response.retrieval.documents
@@ -0,0 +1,67 @@
+"""공용 n-gram 토크나이저 처리량 벤치마크 (pytest-benchmark)"""
+
+from collections import Counter
+from typing import List
+
+import pytest
+
+from ohra.shared_kernel.infra.tokenizer import NGramTokenizer, tokenize, tokenize_batch
+
+pytest.importorskip("pytest_benchmark")
+
+
+CHUNKS = [
+    "배포 프로세스는 GitHub Actions 에서 main 브랜치 merge 시 자동으로 실행됩니다. "
+    "staging 환경 검증 후 production 배포는 승인자가 수동으로 트리거합니다.",
+    "어뷰징 경고 알림톡 수신자 필터 기능: 관리자 콘솔에서 수신 대상 role 을 선택하면 "
+    "해당 role 을 가진 사용자에게만 KakaoTalk 알림톡이 발송됩니다.",
+    "AI 아메바는 사내 문서(Confluence, Jira)를 검색해 질문에 답변하는 RAG 기반 어시스턴트입니다. "
+    "Qdrant hybrid search 와 Qwen3 LLM 을 사용합니다.",
+    "API 명세 v2: POST /v1/chat/completions 는 OpenAI 호환 형식을 따르며 "
+    "messages, temperature, max_tokens 파라미터를 받습니다. 인증은 Bearer API key 를 사용합니다.",
+    "[OHRA-123] 검색 결과에 오래된 문서가 노출되는 문제 - version_key 비교 로직 수정 및 "
+    "재색인 스크립트 추가. 결정 사항: 매 시간 증분 동기화, 주 1회 전체 동기화.",
+] * 40
+
+
+def _legacy_tokenize(text: str) -> List[str]:
+    tokens = []
+    words = text.lower().split()
+
+    for word in words:
+        tokens.append(word)
+        if len(word) >= 2:
+            for i in range(len(word) - 1):
+                if i + 2 <= len(word):
+                    tokens.append(word[i : i + 2])
+                if i + 3 <= len(word):
+                    tokens.append(word[i : i + 3])
+
+    return tokens
+
+
+@pytest.mark.parametrize("text", CHUNKS[:5])
+def test_tokenize_matches_legacy_tokens(text):
+    """기존 per-character 구현과 동일한 토큰 multiset 을 생성하는지 확인"""
+    assert Counter(tokenize(text)) == Counter(_legacy_tokenize(text))
+
+
+def test_tokenize_batch_matches_single():
+    assert tokenize_batch(CHUNKS[:5]) == [tokenize(text) for text in CHUNKS[:5]]
+
+
+def test_benchmark_legacy_tokenizer(benchmark):
+    benchmark.group = "tokenizer"
+    benchmark(lambda: [_legacy_tokenize(text) for text in CHUNKS])
+
+
+def test_benchmark_ngram_tokenizer(benchmark):
+    benchmark.group = "tokenizer"
+    tokenizer = NGramTokenizer()
+    benchmark(lambda: [tokenizer.tokenize(text) for text in CHUNKS])
+
+
+def test_benchmark_ngram_tokenizer_batch(benchmark):
+    benchmark.group = "tokenizer"
+    tokenizer = NGramTokenizer()
+    benchmark(tokenizer.tokenize_batch, CHUNKS)
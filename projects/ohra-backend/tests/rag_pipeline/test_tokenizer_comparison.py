@@ -0,0 +1,113 @@
+"""n-gram vs 형태소 분석(kiwi) 토크나이저 비교 보고서: 색인 크기, 토큰화 속도, 검색 recall"""
+
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from ohra.shared_kernel.infra.bm25 import BM25Index
+from ohra.shared_kernel.infra.tokenizer import BM25SparseEncoder, get_tokenizer
+from tests.utils.test_helpers import print_test_header, print_test_summary, save_test_results
+
+pytest.importorskip("kiwipiepy")
+
+
+DOCUMENTS = [
+    "배포 프로세스는 GitHub Actions 에서 main 브랜치에 merge 되면 자동으로 시작됩니다.",
+    "staging 환경에서 QA 검증을 마친 뒤 production 배포는 승인자가 수동으로 트리거합니다.",
+    "어뷰징 경고 알림톡은 관리자 콘솔에서 수신자 필터를 설정한 사용자에게만 발송됩니다.",
+    "알림톡 발송 실패 시 SMS 로 대체 발송하며 실패 로그는 Datadog 에서 확인할 수 있습니다.",
+    "AI 아메바는 Confluence 와 Jira 문서를 검색해 사내 질문에 답변하는 어시스턴트입니다.",
+    "API 명세 v2 의 chat completions 엔드포인트는 OpenAI 호환 형식을 따릅니다.",
+    "API 인증은 Bearer 토큰 방식이며 키는 관리자 페이지에서 발급받을 수 있습니다.",
+    "Jira 이슈 OHRA-123: 오래된 문서가 검색되는 문제를 version_key 비교 로직으로 해결했습니다.",
+    "결정 사항: 문서 동기화는 매 시간 증분으로 수행하고 주 1회 전체 재색인합니다.",
+    "신규 입사자는 첫 주에 보안 교육과 개발 환경 설정 가이드를 완료해야 합니다.",
+    "휴가 신청은 그룹웨어에서 결재를 올리고 팀장 승인 후 캘린더에 등록합니다.",
+    "데이터베이스 마이그레이션은 alembic 으로 관리하며 배포 전에 upgrade head 를 실행합니다.",
+] * 20
+
+QUERIES = [
+    ("배포는 어떻게 진행되나요", {0, 1, 11}),
+    ("알림톡 수신자 필터", {2, 3}),
+    ("아메바가 뭐야", {4}),
+    ("API 인증 방법", {5, 6}),
+    ("동기화 주기 결정", {8}),
+    ("오래된 문서 검색 문제", {7}),
+    ("휴가 신청 절차", {10}),
+    ("마이그레이션 실행", {11}),
+]
+
+TOP_K = 3
+
+
+def _evaluate(tokenizer_name: str) -> dict:
+    tokenizer = get_tokenizer(tokenizer_name)
+    encoder = BM25SparseEncoder(tokenizer=tokenizer)
+
+    start = time.perf_counter()
+    tokenized = tokenizer.tokenize_batch(DOCUMENTS)
+    tokenize_seconds = time.perf_counter() - start
+
+    sparse_vectors = [encoder.encode_document_tokens(tokens) for tokens in tokenized]
+    postings = sum(len(vec["indices"]) for vec in sparse_vectors)
+    vocabulary = len({token for tokens in tokenized for token in tokens})
+
+    unique_docs = len(DOCUMENTS) // 20
+    bm25 = BM25Index()
+    for doc_id, tokens in enumerate(tokenized[:unique_docs]):
+        bm25.add(doc_id, tokens)
+    recalls = []
+    for query, relevant in QUERIES:
+        ranked = [doc_id for doc_id, _ in bm25.search(tokenizer.tokenize_query(query), top_k=TOP_K)]
+        recalls.append(len(relevant & set(ranked)) / len(relevant))
+
+    return {
+        "tokenizer": tokenizer_name,
+        "avg_tokens_per_doc": sum(len(tokens) for tokens in tokenized) / len(tokenized),
+        "vocabulary_size": vocabulary,
+        "sparse_postings": postings,
+        # Qdrant sparse vector: index(uint32) + value(float32)
+        "sparse_index_bytes": postings * 8,
+        "docs_per_second": len(DOCUMENTS) / tokenize_seconds if tokenize_seconds > 0 else 0,
+        f"recall@{TOP_K}": sum(recalls) / len(recalls),
+    }
+
+
+def test_tokenizer_comparison_report():
+    """n-gram 과 kiwi 형태소 분석 토크나이저 비교 보고서 생성"""
+    test_start = time.time()
+
+    test_info = {
+        "test_name": "토크나이저 비교 - n-gram vs kiwi",
+        "test_type": "rag_pipeline",
+        "is_evaluation_target": False,
+        "started_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+    print_test_header(
+        test_info["test_name"],
+        "색인 크기(sparse posting 수), 토큰화 속도, 검색 recall 을 비교합니다.",
+        is_evaluation_target=False,
+    )
+
+    results = [_evaluate("ngram"), _evaluate("kiwi")]
+    for result in results:
+        print(
+            f"  {result['tokenizer']:>5}: postings={result['sparse_postings']}, "
+            f"vocab={result['vocabulary_size']}, {result['docs_per_second']:.0f} docs/s, "
+            f"recall@{TOP_K}={result[f'recall@{TOP_K}']:.3f}"
+        )
+
+    test_info["completed_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    test_info["total_duration"] = time.time() - test_start
+    test_info["results"] = results
+
+    print_test_summary(test_info)
+
+    output_dir = Path(__file__).parent.parent / "results"
+    save_test_results("rag_pipeline_tokenizer_comparison", test_info, output_dir)
+
+    ngram, kiwi = results
+    assert kiwi["sparse_postings"] < ngram["sparse_postings"]
@@ -5,6 +5,8 @@ import aiohttp
 import time
 from typing import Dict, Any, Optional
 
+from tests.utils.test_helpers import parse_server_timing
+
 
 BASE_URL = os.getenv("OHRA_API_URL", "http://localhost:8000")
 
@@ -24,8 +26,9 @@ async def make_chat_request(
     temperature: float = 0.7,
     max_tokens: int = 2000,
     stream: bool = False,
+    retrieval: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
-    """채팅 완성 요청"""
+    """채팅 완성 요청 (retrieval: search_mode / top_k / filter / budget_ms / rerank 검색 옵션)"""
     url = f"{BASE_URL}/v1/chat/completions"
     headers = {
         "Authorization": f"Bearer {get_api_key()}",
@@ -43,6 +46,8 @@ async def make_chat_request(
 
     if conversation_id:
         payload["user"] = conversation_id
+    if retrieval:
+        payload["retrieval"] = retrieval
 
     start_time = time.time()
     try:
@@ -60,6 +65,8 @@ async def make_chat_request(
                 "response": result,
                 "response_text": response_text,
                 "usage": result.get("usage", {}),
+                # 서버가 측정한 단계별 소요 시간 (ms)
+                "timings": result.get("timings") or parse_server_timing(response.headers.get("Server-Timing")),
             }
     except Exception as e:
         elapsed = time.time() - start_time
@@ -0,0 +1,78 @@
+"""SageMaker runtime invoke_endpoint 을 흉내 내는 로컬 LLM endpoint (벤치마크용)"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+
+
+class FakeLLMEndpoint:
+    """``POST /endpoints/{name}/invocations`` 에 ``latency`` 초 뒤 chat completion 을 돌려주는 HTTP 서버.
+
+    boto3 client 의 ``endpoint_url`` 로 지정해 실제 connection pool 을 거치게 한다.
+    동시에 처리 중인 요청 수의 최댓값(``max_in_flight``)을 기록한다.
+    """
+
+    def __init__(self, latency: float = 0.2):
+        self.latency = latency
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "FakeLLMEndpoint":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _completion(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            self.requests += 1
+            number = self.requests
+        return {
+            "id": f"chatcmpl-{number}",
+            "created": int(time.time()),
+            "model": payload.get("model", "qwen"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": f"답변 {number}"}}],
+            "usage": {"prompt_tokens": 2000, "completion_tokens": 100, "total_tokens": 2100},
+        }
+
+    def _handler(self):
+        endpoint = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive 로 connection 재사용
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with endpoint._lock:
+                    endpoint.in_flight += 1
+                    endpoint.max_in_flight = max(endpoint.max_in_flight, endpoint.in_flight)
+                try:
+                    time.sleep(endpoint.latency)
+                    body = json.dumps(endpoint._completion(payload)).encode()
+                finally:
+                    with endpoint._lock:
+                        endpoint.in_flight -= 1
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,54 @@
+"""RAG pipeline 테스트가 함께 쓰는 retriever / LLM 대역과 analyzer, 요청 builder"""
+
+from typing import Any, Dict, List, Optional
+
+from ohra.backend.rag.dtos.request import ChatCompletionRequest
+from ohra.backend.rag.retrieval.hybrid.service import HybridSearchService
+from ohra.backend.rag.service.v1.pipeline import LangchainRAGAnalyzer
+from ohra.backend.rag.service.v1.schema import RetrievedDocument
+
+
+class FakeRetriever:
+    """``title`` / ``content`` 로 된 문서 하나를 돌려주고 호출 횟수를 세는 retriever 대역.
+
+    ``{query}`` 는 질의로 채우므로 질의마다 다른 문서가 필요하면 ``FakeRetriever("{query}", "{query} 문서")`` 로 쓴다.
+    """
+
+    embedding: Any = None
+
+    def __init__(self, title: str = "배포", content: str = "배포 문서"):
+        self.title = title
+        self.content = content
+        self.calls = 0
+
+    async def retrieve(self, query: str, top_k: int = 5, filter: Optional[Dict[str, Any]] = None, context=None):
+        self.calls += 1
+        metadata = {"title": self.title.format(query=query), "content": self.content.format(query=query)}
+        return [RetrievedDocument(id=1, score=1.0, metadata=metadata)]
+
+
+class CapturingLLM:
+    """보낸 payload 를 기록하고 고정된 답변을 돌려주는 LLM 대역"""
+
+    def __init__(self):
+        self.payloads: List[Dict[str, Any]] = []
+
+    async def invoke(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        self.payloads.append(payload)
+        choice = {"index": 0, "message": {"role": "assistant", "content": "답변"}}
+        return {"id": "chatcmpl-1", "created": 1730000000, "model": "qwen", "choices": [choice]}
+
+
+def build_analyzer(retriever: Any = None, **kwargs: Any) -> LangchainRAGAnalyzer:
+    """``retriever`` 하나를 vector / keyword 양쪽에 쓰는 analyzer. 나머지 인자는 그대로 넘긴다."""
+    retriever = retriever or FakeRetriever()
+    kwargs.setdefault("embedding", None)
+    kwargs.setdefault("vector_store", None)
+    return LangchainRAGAnalyzer(
+        search_service=HybridSearchService(vector_retriever=retriever, keyword_retriever=retriever), **kwargs
+    )
+
+
+def chat_request(content: str = "배포 절차", **kwargs: Any) -> ChatCompletionRequest:
+    """사용자 질문 하나로 된 요청"""
+    return ChatCompletionRequest(messages=[{"role": "user", "content": content}], **kwargs)
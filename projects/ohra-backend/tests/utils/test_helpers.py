@@ -1,6 +1,6 @@
 import json
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime
 
 
@@ -52,6 +52,18 @@ def print_test_summary(test_info: Dict[str, Any]):
     print("=" * 80 + "\n")
 
 
+def parse_server_timing(header: Optional[str]) -> Dict[str, float]:
+    """``Server-Timing`` 헤더 → {단계: ms} (예: ``embedding;dur=12.3, llm;dur=850.0``)"""
+    timings = {}
+    for metric in (header or "").split(","):
+        name, _, params = metric.strip().partition(";")
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if name and key == "dur":
+                timings[name] = float(value)
+    return timings
+
+
 def print_progress(current: int, total: int, message: str = ""):
     """진행 상황 출력"""
     print(f"[{current}/{total}] {message}")
@@ -21,10 +21,15 @@ class AtlassianSettings(BaseModel):
 class WorkerSyncSettings(BaseModel):
     sync_interval_hours: int = Field(default=1)
     embedding_batch_size: int = Field(default=5)
+    sparse_k1: float = Field(default=1.2)
+    sparse_b: float = Field(default=0.75)
+    sparse_avg_doc_length: float = Field(default=0.0)  # 청크 평균 토큰 수, 0 이면 처음 표본으로 계산한 값을 고정
+    index_dir: str = Field(default="")  # BM25 snapshot 게시 경로 (비어 있으면 게시하지 않음)
 
 
 class WorkerSettings(BaseSettings):
     db_url: str = "sqlite+aiosqlite:///./projects/ohra-backend/data/database.db"
+    index_dir: str = ""
 
     atlassian_email: str = ""
     atlassian_base_url: str = ""
@@ -37,9 +42,13 @@ class WorkerSettings(BaseSettings):
     qdrant_host: str = "localhost"
     qdrant_port: int = 6333
     qdrant_collection_name: str = "ohra_documents"
+    qdrant_sparse_tokenizer: str = "ngram"
 
     worker_sync_interval_hours: int = 1
     worker_embedding_batch_size: int = 5
+    worker_sparse_k1: float = 1.2
+    worker_sparse_b: float = 0.75
+    worker_sparse_avg_doc_length: float = 0.0
 
     @property
     def atlassian(self) -> AtlassianSettings:
@@ -63,6 +72,7 @@ class WorkerSettings(BaseSettings):
             host=self.qdrant_host,
             port=self.qdrant_port,
             collection_name=self.qdrant_collection_name,
+            sparse_tokenizer=self.qdrant_sparse_tokenizer,
         )
 
     @property
@@ -70,6 +80,10 @@ class WorkerSettings(BaseSettings):
         return WorkerSyncSettings(
             sync_interval_hours=self.worker_sync_interval_hours,
             embedding_batch_size=self.worker_embedding_batch_size,
+            sparse_k1=self.worker_sparse_k1,
+            sparse_b=self.worker_sparse_b,
+            sparse_avg_doc_length=self.worker_sparse_avg_doc_length,
+            index_dir=self.index_dir,
         )
 
     model_config = SettingsConfigDict(env_prefix="OHRA_", case_sensitive=False, env_file=".env", extra="allow")
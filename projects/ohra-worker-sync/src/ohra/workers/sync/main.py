@@ -1,7 +1,12 @@
 import asyncio
 import argparse
 from datetime import datetime, timedelta, timezone
+from ohra.shared_kernel.infra.qdrant import QdrantAdapter
+from ohra.shared_kernel.infra.tokenizer import get_tokenizer
+from ohra.workers.settings import WorkerSettings
 from ohra.workers.sync.scripts import confluence, jira
+from ohra.workers.sync.utils.keyword_index import publish_keyword_index
+from ohra.workers.sync.utils.sync_generation import publish_sync_generation
 
 
 async def sync_job(source: str, last_sync_time: datetime):
@@ -13,6 +18,35 @@ async def sync_job(source: str, last_sync_time: datetime):
         await confluence.main(last_sync_time=last_sync_time)
         await jira.main(last_sync_time=last_sync_time)
 
+    settings = WorkerSettings()
+    vector_store = QdrantAdapter(
+        host=settings.qdrant.host, port=settings.qdrant.port, collection_name=settings.qdrant.collection_name
+    )
+    await publish_index(settings, vector_store)
+    # BM25 snapshot 을 게시한 뒤에 올려서 새 generation 의 cache 항목이 새 snapshot 의 결과만 담게 한다
+    await publish_generation(settings, vector_store)
+
+
+async def publish_index(settings: WorkerSettings, vector_store: QdrantAdapter):
+    if not settings.worker.index_dir:
+        return
+
+    try:
+        generation = await publish_keyword_index(
+            vector_store, get_tokenizer(settings.qdrant.sparse_tokenizer), settings.worker.index_dir
+        )
+        print(f"[Worker] BM25 snapshot generation {generation} published to {settings.worker.index_dir}", flush=True)
+    except Exception as e:
+        print(f"[Worker] ERROR publishing BM25 snapshot: {e}", flush=True)
+
+
+async def publish_generation(settings: WorkerSettings, vector_store: QdrantAdapter):
+    try:
+        generation = await publish_sync_generation(vector_store)
+        print(f"[Worker] Sync generation {generation} published to {settings.qdrant.collection_name}", flush=True)
+    except Exception as e:
+        print(f"[Worker] ERROR publishing sync generation: {e}", flush=True)
+
 
 async def main():
     parser = argparse.ArgumentParser(description="OHRA document sync worker")
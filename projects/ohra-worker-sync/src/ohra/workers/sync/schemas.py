@@ -11,8 +11,10 @@ class VectorPayload(BaseModel):
     url: Optional[str] = None
     author: Optional[str] = None
     last_modified_at: Optional[str] = None
+    indexed_at: Optional[str] = None  # worker 가 색인한 시각 (backend keyword 인덱스 change feed 용)
     hash: str
     version_key: Optional[str] = None
+    sparse_encoding: Optional[str] = None
 
     # platform specific fields
     page_id: Optional[str] = None  # Confluence
@@ -1,13 +1,60 @@
+from dataclasses import replace
 from functools import wraps
-from typing import Callable, Optional
+from typing import Any, Callable, Dict, Optional
 from datetime import datetime
 import gc
 from ohra.workers.settings import WorkerSettings
 from ohra.shared_kernel.infra.sagemaker import SageMakerEmbeddingAdapter
 from ohra.shared_kernel.infra.qdrant import QdrantAdapter
+from ohra.shared_kernel.infra.tokenizer import BM25SparseEncoder, get_tokenizer
 from ohra.workers.sync.utils.transform import transform_batch
 from ohra.workers.sync.utils.load import load_batch
 
+CALIBRATION_SAMPLE = 1000  # avg_doc_length 계산에 쓰는 색인된 청크 수
+# 처음 계산한 avg_doc_length 를 tokenizer 별로 고정해 두는 collection metadata key
+AVG_DOC_LENGTH_KEY = "sparse_avg_doc_length:{tokenizer}"
+
+
+async def build_sparse_encoder(settings: WorkerSettings, vector_store: QdrantAdapter) -> BM25SparseEncoder:
+    """avg_doc_length 는 설정값, collection 에 고정된 값, 색인된 청크 표본 순으로 정한다.
+
+    실행마다 다시 계산하면 ``version`` 이 바뀌어 문서마다 정규화 기준이 섞이고 전체를 다시 색인하게 되므로,
+    표본으로 처음 계산한 값을 collection metadata 에 남겨 이후 실행에서 그대로 쓴다.
+    """
+    sparse_encoder = BM25SparseEncoder(
+        tokenizer=get_tokenizer(settings.qdrant.sparse_tokenizer),
+        k1=settings.worker.sparse_k1,
+        b=settings.worker.sparse_b,
+    )
+    if settings.worker.sparse_avg_doc_length > 0:
+        return replace(sparse_encoder, avg_doc_length=settings.worker.sparse_avg_doc_length)
+
+    key = AVG_DOC_LENGTH_KEY.format(tokenizer=sparse_encoder.tokenizer.name)
+    pinned = (await vector_store.get_collection_metadata()).get(key)
+    if pinned:
+        return replace(sparse_encoder, avg_doc_length=float(pinned))
+
+    # 색인된 청크가 없으면 기본값으로 색인하고, 청크가 생긴 뒤 실행에서 한 번 계산해 고정한다
+    sample = await vector_store.get_by_filter({}, limit=CALIBRATION_SAMPLE)
+    if not sample:
+        return sparse_encoder
+    sparse_encoder = sparse_encoder.calibrate(point["metadata"].get("content", "") for point in sample)
+    await vector_store.update_collection_metadata({key: sparse_encoder.avg_doc_length})
+    return sparse_encoder
+
+
+async def reencode_sparse(
+    vector_store: QdrantAdapter, sparse_encoder: BM25SparseEncoder, filter: Dict[str, Any]
+) -> int:
+    """내용이 그대로인 문서의 청크는 embedding 을 다시 만들지 않고 sparse 벡터만 새 encoding 으로 바꾼다."""
+    chunks = await vector_store.get_all_by_filter(filter, with_payload=["content"])
+    sparse_vectors = sparse_encoder.encode_documents(chunk["metadata"].get("content", "") for chunk in chunks)
+    await vector_store.update_sparse_vectors(
+        [{"id": chunk["id"], "sparse_vector": vector} for chunk, vector in zip(chunks, sparse_vectors)],
+        payload={"sparse_encoding": sparse_encoder.version},
+    )
+    return len(chunks)
+
 
 def sync_script(
     source_type: str,
@@ -83,11 +130,15 @@ def sync_script(
             )
             print("[Worker] Collection ready", flush=True)
 
+            sparse_encoder = await build_sparse_encoder(settings, vector_store)
+            print(f"[Worker] Sparse encoding: {sparse_encoder.version}", flush=True)
+
             doc_batch = []
             chunk_buffer = []
             documents_synced = 0
             vectors_upserted = 0
             skipped = 0
+            reencoded = 0
 
             print("[Worker] Starting document extraction...", flush=True)
             extract_gen = extract_func(last_sync_time=last_sync_time, **config)
@@ -107,8 +158,15 @@ def sync_script(
                             {"source_document_id": doc_id, "source_type": source_type}, limit=1
                         )
                         if existing:
-                            existing_version = existing[0].get("metadata", {}).get("version_key")
-                            if existing_version == version_key:
+                            existing_meta = existing[0].get("metadata", {})
+                            if existing_meta.get("version_key") == version_key:
+                                if existing_meta.get("sparse_encoding") != sparse_encoder.version:
+                                    await reencode_sparse(
+                                        vector_store,
+                                        sparse_encoder,
+                                        {"source_document_id": doc_id, "source_type": source_type},
+                                    )
+                                    reencoded += 1
                                 skipped += 1
                                 if skipped % 10 == 0:
                                     print(f"[Worker] Skipped {skipped} documents (unchanged)", flush=True)
@@ -126,6 +184,7 @@ def sync_script(
                             embedding=embedding,
                             chunk_size=chunk_size,
                             chunk_overlap=chunk_overlap,
+                            sparse_encoder=sparse_encoder,
                         )
                         chunk_buffer.extend(vectors)
                         doc_batch.clear()
@@ -144,6 +203,7 @@ def sync_script(
                         embedding=embedding,
                         chunk_size=chunk_size,
                         chunk_overlap=chunk_overlap,
+                        sparse_encoder=sparse_encoder,
                     )
                     chunk_buffer.extend(vectors)
                     documents_synced += len(doc_batch)
@@ -167,7 +227,8 @@ def sync_script(
                 gc.collect()
 
             print(
-                f"[Worker] async_wrapper completed - synced: {documents_synced}, skipped: {skipped}, vectors: {vectors_upserted}",
+                f"[Worker] async_wrapper completed - synced: {documents_synced}, skipped: {skipped}, "
+                f"sparse re-encoded: {reencoded}, vectors: {vectors_upserted}",
                 flush=True,
             )
             return documents_synced, skipped, vectors_upserted
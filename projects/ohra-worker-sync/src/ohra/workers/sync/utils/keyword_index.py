@@ -0,0 +1,22 @@
+from datetime import datetime, timezone
+
+from ohra.shared_kernel.infra.bm25 import KEYWORD_FILTER_FIELDS, BM25Index, SnapshotLock, publish_snapshot
+from ohra.shared_kernel.infra.qdrant import QdrantAdapter
+from ohra.shared_kernel.infra.tokenizer import Tokenizer
+
+
+async def publish_keyword_index(vector_store: QdrantAdapter, tokenizer: Tokenizer, index_dir: str) -> int:
+    # scroll 시작 시각을 snapshot 의 indexed_at 으로 기록해 backend 가 그 이후 변경분만 change feed 로 따라잡게 한다
+    started_at = datetime.now(timezone.utc)
+    docs = await vector_store.get_all_by_filter(
+        filter={}, batch_size=1000, with_payload=["content", *KEYWORD_FILTER_FIELDS]
+    )
+
+    index = BM25Index(fields=KEYWORD_FILTER_FIELDS)
+    contents = [doc["metadata"].get("content", "") for doc in docs]
+    for doc, tokens in zip(docs, tokenizer.tokenize_batch(contents)):
+        index.add(doc["id"], tokens, doc["metadata"])
+
+    # backend 도 snapshot 이 없으면 같은 디렉터리에 직접 게시하므로 lock 을 잡고 게시한다
+    async with SnapshotLock(index_dir):
+        return publish_snapshot(index_dir, index, tokenizer=tokenizer.name, indexed_at=started_at.isoformat())
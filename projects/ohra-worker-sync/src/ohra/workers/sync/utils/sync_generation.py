@@ -0,0 +1,9 @@
+from ohra.shared_kernel.infra.qdrant import SYNC_GENERATION_KEY, QdrantAdapter
+
+
+async def publish_sync_generation(vector_store: QdrantAdapter) -> int:
+    # sync worker 는 한 번에 하나만 실행되므로 읽고 올려 쓰는 것으로 충분하다
+    metadata = await vector_store.get_collection_metadata()
+    generation = int(metadata.get(SYNC_GENERATION_KEY) or 0) + 1
+    await vector_store.update_collection_metadata({SYNC_GENERATION_KEY: generation})
+    return generation
@@ -1,54 +1,21 @@
 import hashlib
-from typing import List, Dict, Any
-from collections import Counter
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from ohra.shared_kernel.infra.sagemaker import SageMakerEmbeddingAdapter
+from ohra.shared_kernel.infra.tokenizer import BM25SparseEncoder
 from ohra.workers.sync.schemas import VectorPayload
 
 
-def _tokenize_korean_for_sparse(text: str) -> List[str]:
-    tokens = []
-    words = text.lower().split()
-
-    for word in words:
-        tokens.append(word)
-        if len(word) >= 2:
-            for i in range(len(word) - 1):
-                if i + 2 <= len(word):
-                    tokens.append(word[i : i + 2])
-                if i + 3 <= len(word):
-                    tokens.append(word[i : i + 3])
-
-    return tokens
-
-
-def _calculate_sparse_vector(text: str) -> Dict[str, List]:
-    tokens = _tokenize_korean_for_sparse(text)
-    if not tokens:
-        return {"indices": [], "values": []}
-
-    token_counts = Counter(tokens)
-    total_tokens = len(tokens)
-
-    indices = []
-    values = []
-
-    for token, count in token_counts.items():
-        token_id = hash(token) % (2**31)
-        score = count / total_tokens
-        indices.append(token_id)
-        values.append(float(score))
-
-    return {"indices": indices, "values": values}
-
-
 async def transform_batch(
     source_type: str,
     documents: List[Dict[str, Any]],
     embedding: SageMakerEmbeddingAdapter,
     chunk_size: int = 1500,
     chunk_overlap: int = 300,
+    sparse_encoder: Optional[BM25SparseEncoder] = None,
 ) -> List[Dict[str, Any]]:
+    sparse_encoder = sparse_encoder or BM25SparseEncoder()
     splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
 
     chunks = []
@@ -77,9 +44,11 @@ async def transform_batch(
         texts.append(content)
 
     embeddings = await embedding.embed_batch(texts)
+    sparse_vectors = sparse_encoder.encode_documents(item["chunk"]["content"] for item in chunks)
+    indexed_at = datetime.now(timezone.utc).isoformat()
 
     vectors = []
-    for item, emb in zip(chunks, embeddings):
+    for item, emb, sparse_vector in zip(chunks, embeddings, sparse_vectors):
         content = item["chunk"]["content"]
         content_hash = hashlib.sha256(content.encode()).hexdigest()
 
@@ -87,8 +56,8 @@ async def transform_batch(
         vector_id = int(hashlib.md5(chunk_id_str.encode()).hexdigest()[:15], 16)
 
         payload = _build_payload(item["doc"], item["chunk"], source_type, content_hash)
-
-        sparse_vector = _calculate_sparse_vector(content)
+        payload.sparse_encoding = sparse_encoder.version
+        payload.indexed_at = indexed_at
 
         vectors.append(
             {